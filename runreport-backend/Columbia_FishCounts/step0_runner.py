@@ -12,6 +12,9 @@ Runs the Columbia_FishCounts ETL pipeline with a gating check:
         Step 5: add_id_and_convert_numeric()
 
 Writes the cleaned DataFrame to runreport-backend/0_db/local.db.
+Each run is recorded step by step in pipeline_runs /
+pipeline_run_steps (common/telemetry.py); `--report` shows the slowest
+steps against the previous run.
 """
 
 import sys
@@ -47,6 +50,7 @@ from step5_id import add_id_and_convert_numeric
 
 # SQLite manager (already built earlier)
 from common.sqlite_manager import SQLiteManager
+from common import telemetry
 
 
 # ------------------------------------------------------------
@@ -65,29 +69,40 @@ def df_hash(df: pd.DataFrame) -> str:
 # ------------------------------------------------------------
 # MAIN PIPELINE FUNCTION
 # ------------------------------------------------------------
-def run_columbia_pipeline():
+def run_transform_step(recorder, num, label, func, df):
+    """Run one DataFrame step under the run recorder (rows in → out)."""
+    with recorder.step(num, label) as rec:
+        rec.rows_in = len(df)
+        df = func(df)
+        rec.rows_out = len(df)
+    return df
+
+
+def run_columbia_pipeline(recorder):
     print("\n🚀 Running Columbia_FishCounts ETL Pipeline...\n")
 
     # Step 1 — download + raw CSVs
     print("👉 Step 1: Fetching raw FPC data...")
-    df_raw = fetch_columbia_daily()
+    with recorder.step(1, "Step 1: Fetch raw FPC data") as rec:
+        df_raw = fetch_columbia_daily()
+        rec.rows_out = len(df_raw)
     print(f"   ✔ Retrieved {len(df_raw):,} raw rows")
 
     # Step 2 — Species_Plot
     print("👉 Step 2: Adding Species_Plot...")
-    df = add_species_plot(df_raw)
+    df = run_transform_step(recorder, 2, "Step 2: Species_Plot", add_species_plot, df_raw)
 
     # Step 3 — river column
     print("👉 Step 3: Mapping dam_code → river...")
-    df = add_river_column(df)
+    df = run_transform_step(recorder, 3, "Step 3: dam_code → river", add_river_column, df)
 
     # Step 4 — reorganize
     print("👉 Step 4: Reorganizing columns...")
-    df = reorganize_daily_data(df)
+    df = run_transform_step(recorder, 4, "Step 4: Reorganize columns", reorganize_daily_data, df)
 
     # Step 5 — add ID, enforce numeric types
     print("👉 Step 5: Adding ID + converting numeric columns...")
-    df = add_id_and_convert_numeric(df)
+    df = run_transform_step(recorder, 5, "Step 5: ID + numeric columns", add_id_and_convert_numeric, df)
 
     # Gating: compare final transformed data to existing table
     db = SQLiteManager("local.db")
@@ -132,7 +147,19 @@ def write_to_local_db(df: pd.DataFrame, table_name="Columbia_FishCounts"):
 # MAIN ENTRY POINT
 # ------------------------------------------------------------
 if __name__ == "__main__":
-    final_df = run_columbia_pipeline()
+    if "--report" in sys.argv[1:]:
+        sys.exit(telemetry.report("columbia"))
+
+    recorder = telemetry.RunRecorder("columbia")
+    try:
+        final_df = run_columbia_pipeline(recorder)
+        if final_df is not None:
+            with recorder.step(6, "Write Columbia_FishCounts") as rec:
+                rec.rows_out = len(final_df)
+                write_to_local_db(final_df)
+    except Exception:
+        recorder.finish("failed")
+        raise
+    recorder.finish("ok" if final_df is not None else "skipped")
     if final_df is not None:
-        write_to_local_db(final_df)
         print("🏁 ETL job finished successfully.")
@@ -0,0 +1,300 @@
+"""
+bench_corpus.py
+------------------------------------------------------------
+Synthetic EscapementRawLines corpus for offline profiling.
+
+    python bench_corpus.py OUT.db [--scale N] [--years N] [--seed N]
+
+Writes the raw-line cache tables step 4 reads (raw_cache.py:
+Escapement_RawLineCache / Escapement_RawReportCache) into OUT.db, laid
+out like the WDFW weekly PDFs after text extraction:
+
+    WDFW Hatchery Escapement Report                     page header
+    CAUTION: Data are preliminary and subject to change
+    Facility Stock-Origin Adult Total Jack Total ...
+    Fall Chinook                                        species header
+    SOOS CREEK HATCHERY Green River- H 1,234 56 - ... 10/04/24 Trap closed
+    ICY CR HATCHERY 812 - 4 ... 09/27/24                stock on the
+    Icy Creek- W                                        next line
+    PALMER HATCHERY Green River- H 2,002 ... 11/15/24   estimate row +
+    Final in-season estimate                            FISE line
+    Page 1
+
+One report per week over the last --years years. Every identity
+(facility × species × stock × origin) has a season per year; its
+counts are cumulative season-to-date, rows repeat unchanged for a few
+weeks after the season ends (duplicates for step 29) and some end with
+a "Final in-season estimate". Facilities come from lookup_maps.basin_map
+and species headers from lookup_maps.species_headers, so the rows
+survive parsing and the basin filters like real ones.
+
+--scale N multiplies the identities per facility (N stock variants),
+i.e. lines per report, rows per table and series to segment all grow
+N×, while dates, reports and facilities stay the same. The same seed
+always gives the same corpus.
+"""
+
+import argparse
+import hashlib
+import random
+import sqlite3
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+for path in (PROJECT_ROOT, CURRENT_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from lookup_maps import basin_map, family_map, species_headers
+import raw_cache
+
+YEARS = 11          # step 64 keeps current year - 10 onwards
+SPECIES_PER_FACILITY = (1, 4)
+LINES_PER_PAGE = 45
+AFTER_SEASON_WEEKS = 6   # finished rows keep appearing this long
+
+PAGE_HEADER = [
+    "WDFW Hatchery Escapement Report",
+    "CAUTION: Data are preliminary and subject to change",
+    "Facility Stock-Origin Adult Total Jack Total Total Eggtake On Hand Adults On Hand Jacks "
+    "Lethal Spawned Live Spawned Released Nonviable Surplus Mortality Date Comments",
+]
+COMMENTS = ["", "", "", "", "Trap closed", "see note H", "Estimate 12"]
+
+# Family → (first season month, season length in weeks)
+SEASONS = {
+    "Chinook": (8, 14),
+    "Coho": (9, 16),
+    "Chum": (11, 8),
+    "Pink": (8, 10),
+    "Sockeye": (7, 10),
+    "Steelhead": (12, 18),
+    "Kokanee": (9, 10),
+    "Cutthroat": (10, 12),
+}
+DEFAULT_SEASON = (5, 12)
+
+STOCK_NAMES = [
+    "Green River", "Soos Creek", "Priest Rapids", "Skamania Hatchery Stock", "Cowlitz Type N",
+    "Hood Canal", "Skokomish", "Elochoman", "Kalama", "Washougal", "Lewis Late", "Chehalis",
+    "Nooksack", "Samish", "Skagit Summer", "Puyallup", "Deschutes", "Minter Creek",
+]
+# Extra stock variants for --scale; single H/W/U/M/C words would be read as origin letters.
+VARIANT_WORDS = ["Upper", "Lower", "North", "South", "East", "West", "Early", "Late", "Fork", "Lake"]
+ORIGINS = "HHHWWUMC"
+
+
+def facilities() -> list[str]:
+    """basin_map keys that parse as a hatchery name (≥2 upper-case words)."""
+    names = []
+    for name in basin_map:
+        words = name.split()
+        if len(words) >= 2 and all(w.isupper() or not w.isalpha() for w in words):
+            names.append(name)
+    return sorted(set(names))
+
+
+def variant_name(base: str, k: int) -> str:
+    if k == 0:
+        return base
+    first, second = divmod(k - 1, len(VARIANT_WORDS))
+    words = [VARIANT_WORDS[second]] + ([VARIANT_WORDS[first % len(VARIANT_WORDS)]] if first else [])
+    return f"{' '.join(words)} {base}"
+
+
+def fmt_count(rnd: random.Random, value: int) -> str:
+    if value == 0:
+        return "-"
+    return f"{value:,}" if rnd.random() < 0.85 else str(value)
+
+
+# ------------------------------------------------------------
+# Identities and their seasons
+# ------------------------------------------------------------
+def build_identities(rnd: random.Random, scale: int) -> dict[str, list[dict]]:
+    """species header → identities listed under it."""
+    by_species: dict[str, list[dict]] = {}
+    for facility in facilities():
+        for species in rnd.sample(species_headers, rnd.randint(*SPECIES_PER_FACILITY)):
+            family = family_map.get(species.lower(), "")
+            month, weeks = SEASONS.get(family, DEFAULT_SEASON)
+            base = rnd.choice(STOCK_NAMES)
+            for k in range(scale):
+                by_species.setdefault(species, []).append({
+                    "facility": facility,
+                    "stock": variant_name(base, k),
+                    "origin": rnd.choice(ORIGINS),
+                    "month": month,
+                    "start_offset": rnd.randrange(0, 21),
+                    "weeks": max(3, weeks + rnd.randrange(-3, 4)),
+                    "size": rnd.choice([40, 300, 1500, 6000]),
+                    "estimate": rnd.random() < 0.3,
+                    "wrap": rnd.random() < 0.1,
+                })
+    return {sp: by_species[sp] for sp in species_headers if sp in by_species}
+
+
+def season_bounds(ident: dict, year: int) -> tuple[date, date]:
+    start = date(year, ident["month"], 1) + timedelta(days=ident["start_offset"])
+    return start, start + timedelta(weeks=ident["weeks"])
+
+
+def row_for(ident: dict, report_day: date, rnd: random.Random) -> tuple[date, list[int], bool] | None:
+    """(trap date, 11 counts, finished) for an identity on a report date, or None if not listed."""
+    for year in (report_day.year, report_day.year - 1):
+        start, end = season_bounds(ident, year)
+        if start <= report_day <= end + timedelta(weeks=AFTER_SEASON_WEEKS):
+            break
+    else:
+        return None
+
+    finished = report_day > end
+    trap_day = end if finished else max(start, report_day - timedelta(days=rnd.randrange(0, 5)))
+    # Cumulative, deterministic per (identity, season, day): same day → same row.
+    progress = (trap_day - start).days / max(1, (end - start).days)
+    seeded = random.Random(f"{ident['facility']}|{ident['stock']}|{start}")
+    total = int(ident["size"] * seeded.uniform(0.5, 1.5) * min(1.0, progress) ** 1.5)
+    jacks = int(total * seeded.uniform(0, 0.15))
+    eggs = int(total * seeded.uniform(500, 2500)) if seeded.random() < 0.3 else 0
+    on_hand = int(total * seeded.uniform(0, 0.4))
+    counts = [
+        total, jacks, eggs, on_hand, int(jacks * 0.3),
+        int(total * 0.2), int(total * 0.1), int(total * 0.3),
+        int(total * 0.02), int(total * 0.15), int(total * 0.01),
+    ]
+    return trap_day, counts, finished
+
+
+# ------------------------------------------------------------
+# Reports
+# ------------------------------------------------------------
+def report_days(years: int, today: date) -> list[date]:
+    day = date(today.year - years + 1, 1, 1)
+    day += timedelta(days=(4 - day.weekday()) % 7)  # Fridays
+    days = []
+    while day <= today:
+        days.append(day)
+        day += timedelta(weeks=1)
+    return days
+
+
+def pdf_name(day: date, rnd: random.Random) -> str:
+    style = rnd.randrange(3)
+    if style == 0:
+        return f"{day:%m%d%y}.pdf"
+    if style == 1:
+        return f"{day.month}-{day.day:02d}-{day.year}.pdf"
+    return f"WA_EscapementReport_{day:%m-%d-%Y}.pdf"
+
+
+def report_lines(day: date, by_species: dict[str, list[dict]], rnd: random.Random) -> list[tuple[int, str]]:
+    """(page_num, text_line) for one weekly report."""
+    lines: list[tuple[int, str]] = []
+    page, on_page = 1, 0
+
+    def add(text: str):
+        nonlocal page, on_page
+        if on_page == 0:
+            lines.extend((page, h) for h in PAGE_HEADER)
+        lines.append((page, text))
+        on_page += 1
+        if on_page >= LINES_PER_PAGE:
+            lines.append((page, f"Page {page}"))
+            page, on_page = page + 1, 0
+
+    for species, idents in by_species.items():
+        rows = [(ident, row_for(ident, day, rnd)) for ident in idents]
+        rows = [(ident, row) for ident, row in rows if row is not None]
+        if not rows:
+            continue
+        add(species.upper() + " " if rnd.random() < 0.05 else species)
+        for ident, (trap_day, counts, finished) in rows:
+            numbers = " ".join(fmt_count(rnd, c) for c in counts)
+            stamp = f"{trap_day:%m/%d/%y}" if rnd.random() < 0.9 else f"{trap_day.month}/{trap_day.day}/{trap_day.year}"
+            comment = "Trap closed" if finished else rnd.choice(COMMENTS)
+            stock = f"{ident['stock']}- {ident['origin']}"
+            facility = ident["facility"]
+            if ident["wrap"]:
+                add(f"{facility} {numbers} {stamp}")
+                add(stock)
+            else:
+                add(f"{facility} {stock} {numbers} {stamp} {comment}".strip())
+            if finished and ident["estimate"]:
+                estimate = " ".join(fmt_count(rnd, int(c * 1.05)) for c in counts)
+                add(f"{facility} {stock} {estimate} {stamp}")
+                add("Final in-season estimate")
+    if on_page:
+        lines.append((page, f"Page {page}"))
+    return lines
+
+
+# ------------------------------------------------------------
+# Write
+# ------------------------------------------------------------
+def write_corpus(db_path: Path, scale: int = 1, years: int = YEARS, seed: int = 7,
+                 today: date | None = None) -> dict:
+    """Generate the corpus into db_path's raw-line cache; returns its size."""
+    today = today or date.today()
+    rnd = random.Random(seed)
+    by_species = build_identities(rnd, scale)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        for table in (raw_cache.LINES_TABLE, raw_cache.REPORTS_TABLE):
+            conn.execute(f"DROP TABLE IF EXISTS {table}")
+        raw_cache.ensure_cache_tables(conn)
+
+        line_id = 0
+        total_lines = 0
+        for report_id, day in enumerate(report_days(years, today), start=1):
+            name = pdf_name(day, rnd)
+            lines = report_lines(day, by_species, rnd)
+            rows = []
+            for order, (page, text) in enumerate(lines, start=1):
+                line_id += 1
+                rows.append((line_id, report_id, order, name, page, text))
+            conn.executemany(f"INSERT INTO {raw_cache.LINES_TABLE} VALUES (?, ?, ?, ?, ?, ?)", rows)
+            digest = hashlib.sha256(f"{seed}|{scale}|{name}|{len(rows)}".encode()).hexdigest()
+            conn.execute(
+                f"INSERT INTO {raw_cache.REPORTS_TABLE} VALUES (?, ?, ?, ?)",
+                (report_id, digest, len(rows), today.isoformat()),
+            )
+            total_lines += len(rows)
+        conn.commit()
+    finally:
+        conn.close()
+
+    return {
+        "reports": report_id,
+        "lines": total_lines,
+        "identities": sum(len(v) for v in by_species.values()),
+    }
+
+
+def report_hashes(db_path: Path) -> dict[int, str]:
+    """report_id → hash, as step 4 gets them from EscapementReports."""
+    conn = sqlite3.connect(db_path)
+    try:
+        return dict(conn.execute(f"SELECT report_id, hash FROM {raw_cache.REPORTS_TABLE}").fetchall())
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic EscapementRawLines corpus.")
+    parser.add_argument("db", type=Path)
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--years", type=int, default=YEARS)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    size = write_corpus(args.db, args.scale, args.years, args.seed)
+    print(f"✅ {args.db}: {size['reports']:,} reports, {size['lines']:,} lines, "
+          f"{size['identities']:,} identities (scale {args.scale}×)")
+
+
+if __name__ == "__main__":
+    main()
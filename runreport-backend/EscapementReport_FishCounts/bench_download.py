@@ -0,0 +1,231 @@
+"""
+bench_download.py
+------------------------------------------------------------
+Runs step2_download_pdfs.download_all() against an in-process HTTP
+stand-in for the WDFW site, so the downloader can be checked and
+timed without the network or Supabase.
+
+    python bench_download.py --selftest
+    python bench_download.py [--files 40] [--latency 0.1] [--workers 1 6]
+
+The server (http.server on 127.0.0.1, threaded) serves --files random
+PDFs with an ETag / Last-Modified, answers If-None-Match with 304, and
+has two special paths:
+    /flaky.pdf      503 on its first two requests, then 200
+    /missing.pdf    404 (must not be retried)
+
+--selftest downloads everything twice and exits 1 on any failed check:
+    1st run   every hash equals the SHA-256 of the served bytes, the
+              flaky PDF arrives after exactly 2 retries, the missing
+              one fails after a single request, no .part files remain
+    2nd run   with the validators saved by the 1st run (round trip
+              through Escapement_DownloadValidators), every PDF is
+              answered with 304 and keeps its hash
+
+Without --selftest it times one cold run per --workers value.
+
+temp_pdfs and local.db go to a throwaway directory (RUNREPORT_DB_DIR);
+the real 0_db/local.db and temp_pdfs are never written to.
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+for path in (PROJECT_ROOT, CURRENT_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+FLAKY_FAILURES = 2
+LAST_MODIFIED = "Mon, 01 Jan 2024 00:00:00 GMT"
+
+
+# ------------------------------------------------------------
+# Stand-in server
+# ------------------------------------------------------------
+class StandInServer:
+    """Threaded HTTP server serving random PDFs; counts requests per path."""
+
+    def __init__(self, files: int, latency: float, seed: int = 7):
+        rnd = random.Random(seed)
+        self.bodies = {f"/report{i:03d}.pdf": rnd.randbytes(150_000 + i * 997) for i in range(files)}
+        self.bodies["/flaky.pdf"] = rnd.randbytes(50_000)
+        self.latency = latency
+        self.flaky_left = FLAKY_FAILURES
+        self.hits: dict[str, int] = {}
+        self.not_modified = 0
+        self.lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with server.lock:
+                    server.hits[self.path] = server.hits.get(self.path, 0) + 1
+                    fail = self.path == "/flaky.pdf" and server.flaky_left > 0
+                    if fail:
+                        server.flaky_left -= 1
+                if self.path == "/missing.pdf" or self.path not in server.bodies:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                if fail:
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+
+                body = server.bodies[self.path]
+                etag = f'"{hashlib.md5(body).hexdigest()}"'
+                if self.headers.get("If-None-Match") == etag:
+                    with server.lock:
+                        server.not_modified += 1
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+
+                time.sleep(server.latency)
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", LAST_MODIFIED)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base = f"http://127.0.0.1:{self.httpd.server_port}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def url(self, path: str) -> str:
+        return self.base + path
+
+    def reset_counts(self):
+        with self.lock:
+            self.hits.clear()
+            self.not_modified = 0
+
+
+def load_step2(workdir: Path):
+    """Import step 2 with its local.db and temp_pdfs inside workdir."""
+    os.environ["RUNREPORT_DB_DIR"] = str(workdir)
+    import step2_download_pdfs as step2
+
+    step2.TMP_DIR = workdir / "temp_pdfs"
+    shutil.rmtree(step2.TMP_DIR, ignore_errors=True)
+    step2.TMP_DIR.mkdir(parents=True)
+    step2.BACKOFF_SECONDS = 0.05
+    return step2
+
+
+# ------------------------------------------------------------
+# Self-test
+# ------------------------------------------------------------
+def selftest(step2, server: StandInServer, workers: int) -> list[str]:
+    """Run the checks; returns the failed ones."""
+    failures: list[str] = []
+
+    def check(ok: bool, message: str):
+        print(f"   {'✅' if ok else '❌'} {message}")
+        if not ok:
+            failures.append(message)
+
+    pdfs = [p for p in server.bodies if p != "/flaky.pdf"]
+    urls = [server.url(p) for p in pdfs] + [server.url("/flaky.pdf"), server.url("/missing.pdf")]
+    expected = {server.url(p): hashlib.sha256(body).hexdigest() for p, body in server.bodies.items()}
+
+    print(f"\n1️⃣ Cold run: {len(urls)} URLs, {workers} workers")
+    results, errors = step2.download_all(urls, workers=workers)
+    by_url = {r["url"]: r for r in results}
+    check(set(by_url) == set(expected), f"{len(expected)} PDFs downloaded")
+    check(all(by_url[u]["hash"] == h for u, h in expected.items() if u in by_url),
+          "hashes match the served bytes")
+    check(all(step2.sha256_file(by_url[u]["path"]) == h for u, h in expected.items() if u in by_url),
+          "files on disk match the served bytes")
+    check(server.hits.get("/flaky.pdf") == FLAKY_FAILURES + 1,
+          f"503 retried: /flaky.pdf requested {server.hits.get('/flaky.pdf')}× (expected {FLAKY_FAILURES + 1})")
+    missing = errors.get(server.url("/missing.pdf"))
+    check(getattr(getattr(missing, "response", None), "status_code", None) == 404,
+          "404 reported as an error")
+    check(server.hits.get("/missing.pdf") == 1,
+          f"404 not retried: /missing.pdf requested {server.hits.get('/missing.pdf')}×")
+    check(list(errors) == [server.url("/missing.pdf")], "no other errors")
+    check(not list(step2.TMP_DIR.glob("*.part")), "no .part files left behind")
+
+    step2.save_validators(results)
+    server.reset_counts()
+
+    print("\n2️⃣ Warm run with the saved validators")
+    results2, errors2 = step2.download_all(urls, workers=workers, validators=step2.load_validators())
+    by_url2 = {r["url"]: r for r in results2}
+    check(all(r["status"] == "not_modified" for r in results2) and len(results2) == len(expected),
+          f"every PDF answered 304 ({server.not_modified} of {len(expected)})")
+    check(all(by_url2[u]["hash"] == h for u, h in expected.items() if u in by_url2),
+          "304 keeps the stored hashes")
+    check(list(errors2) == [server.url("/missing.pdf")], "only the missing PDF fails again")
+    return failures
+
+
+# ------------------------------------------------------------
+# Timing
+# ------------------------------------------------------------
+def time_runs(step2, server: StandInServer, worker_counts: list[int]):
+    urls = [server.url(p) for p in server.bodies if p != "/flaky.pdf"]
+    mb = sum(len(b) for p, b in server.bodies.items() if p != "/flaky.pdf") / 1024 / 1024
+    print(f"\n⏱️ {len(urls)} PDFs ({mb:.1f} MB), {server.latency * 1000:.0f} ms server latency")
+    for workers in worker_counts:
+        for path in step2.TMP_DIR.glob("*"):
+            path.unlink()
+        started = time.perf_counter()
+        results, errors = step2.download_all(urls, workers=workers)
+        elapsed = time.perf_counter() - started
+        print(f"   {workers:>2} worker(s): {elapsed:6.2f}s  "
+              f"({len(results) / elapsed:,.1f} PDFs/s, {len(errors)} errors)")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check / time the step 2 downloader against a local HTTP server.")
+    parser.add_argument("--selftest", action="store_true", help="Run the checks and exit 1 on failure.")
+    parser.add_argument("--files", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds the server waits before each 200.")
+    parser.add_argument("--workers", type=int, nargs="+", default=None)
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="escapement_download_"))
+    try:
+        step2 = load_step2(workdir)
+        with StandInServer(args.files, args.latency) as server:
+            if args.selftest:
+                failures = selftest(step2, server, (args.workers or [step2.MAX_WORKERS])[0])
+                if failures:
+                    print(f"\n❌ {len(failures)} check(s) failed.")
+                    return 1
+                print("\n🎉 Downloader self-test passed.")
+                return 0
+            time_runs(step2, server, args.workers or [1, step2.MAX_WORKERS])
+            return 0
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,154 @@
+"""
+bench_duplicates.py
+------------------------------------------------------------
+Checks step 29's sorted-sweep duplicate collapse against the per-row
+loop it replaced, and times both.
+
+    python bench_duplicates.py [--db PATH] [--scale N] [--shift-days D] [--repeat N]
+
+Reads Escapement_PlotPipeline from local.db (any point after step 28).
+--scale N (default 10) stacks N copies of the table; copy k keeps its
+identity and count payload but moves every date by k × D days
+(--shift-days, default 150), so each payload recurs every D days —
+some repeats fall inside the 365-day window, some outside, and long
+chains exercise the searchsorted fallback. --shift-days 0 renames the
+facility of every copy instead (no new duplicates).
+
+The two outputs must match exactly (pandas assert_frame_equal); any
+difference is an error.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+for path in (PROJECT_ROOT, CURRENT_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from common.sqlite_manager import connect
+import pipeline_schema
+from step29_duplicates_delete import COUNT_COLS, KEY_COLS, transform
+
+DB_PATH = PROJECT_ROOT / "0_db" / "local.db"
+TABLE = "Escapement_PlotPipeline"
+
+
+# ------------------------------------------------------------
+# Previous implementation (per-row loop with .loc lookups); its
+# YYYY-MM-DD string dates / float counts are re-typed at the end
+# so the output compares against the typed transform()
+# ------------------------------------------------------------
+def legacy_transform(df: pd.DataFrame) -> pd.DataFrame:
+    df["date_iso"] = df["date_iso"].astype(str).str.slice(0, 10)
+    df["date_dt"] = pd.to_datetime(df["date_iso"], errors="coerce")
+
+    for c in COUNT_COLS:
+        if c in df.columns:
+            df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0)
+
+    df = (
+        df.sort_values(KEY_COLS + ["date_dt"], kind="mergesort")
+          .reset_index(drop=True)
+    )
+
+    keep_mask = [False] * len(df)
+
+    for _, g in df.groupby(KEY_COLS, dropna=False, observed=True):
+        last_kept_date = None
+
+        for idx in g.index:
+            curr_date = df.loc[idx, "date_dt"]
+
+            if pd.isna(curr_date):
+                keep_mask[idx] = True
+                continue
+
+            if last_kept_date is None:
+                keep_mask[idx] = True
+                last_kept_date = curr_date
+            else:
+                if (curr_date - last_kept_date).days > 365:
+                    keep_mask[idx] = True
+                    last_kept_date = curr_date
+
+    df_final = df[keep_mask].reset_index(drop=True)
+    df_final = df_final.drop(columns=["date_dt"])
+    df_final["date_iso"] = df_final["date_iso"].astype(str).str.slice(0, 10)
+    df_final[COUNT_COLS] = df_final[COUNT_COLS].astype("int64")
+    return pipeline_schema.apply_schema(df_final)
+
+
+# ------------------------------------------------------------
+# Benchmark
+# ------------------------------------------------------------
+def load_frame(db_path: Path, scale: int, shift_days: int) -> pd.DataFrame:
+    conn = connect(db_path)
+    try:
+        df = pipeline_schema.load(conn, TABLE)
+    finally:
+        conn.close()
+
+    missing = [col for col in KEY_COLS + ["date_iso"] if col not in df.columns]
+    if missing:
+        raise ValueError(f"❌ {TABLE} is missing {missing} — run the pipeline through step 28 first.")
+
+    if scale > 1:
+        copies = []
+        for k in range(scale):
+            part = df.copy()
+            if shift_days:
+                part["date_iso"] = df["date_iso"] + pd.Timedelta(days=k * shift_days)
+            else:
+                part["facility"] = part["facility"].astype(str) + f" #{k}"
+            copies.append(part)
+        df = pipeline_schema.apply_schema(pd.concat(copies, ignore_index=True))
+    return df
+
+
+def best_of(fn, df, repeat):
+    best, out = None, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        out = fn(df.copy())
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare and time step 29's duplicate collapse.")
+    parser.add_argument("--db", type=Path, default=DB_PATH)
+    parser.add_argument("--scale", type=int, default=10)
+    parser.add_argument("--shift-days", type=int, default=150)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = load_frame(args.db, args.scale, args.shift_days)
+    print(f"✅ Loaded {len(df):,} rows (×{args.scale}, shift {args.shift_days} days)")
+
+    t_old, old = best_of(legacy_transform, df, args.repeat)
+    t_new, new = best_of(transform, df, args.repeat)
+
+    try:
+        pd.testing.assert_frame_equal(old, new)
+        status = "identical"
+    except AssertionError as e:
+        status = f"❌ DIFFERENT: {str(e).splitlines()[0]}"
+
+    print(
+        f"\n📊 loop {t_old:.2f}s   sweep {t_new:.3f}s   ×{t_old / t_new:.1f}   "
+        f"{len(df) - len(new):,} rows removed   {status}"
+    )
+    if status != "identical":
+        sys.exit(1)
+    print("✅ Sweep output identical to the per-row loop.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+bench_scale.py
+------------------------------------------------------------
+Runs steps 4–78 on synthetic corpora (bench_corpus.py) of growing size
+against a throwaway local.db and reports per-step throughput, so steps
+whose cost grows faster than their input show up without live WDFW
+PDFs or Supabase.
+
+    python bench_scale.py [--scales 1 10 100] [--years N] [--seed N]
+                          [--scripts] [--workdir DIR] [--keep]
+
+For each scale:
+    1. bench_corpus writes the raw-line cache into WORKDIR/<N>x/local.db
+    2. RUNREPORT_DB_DIR points every connection (common/sqlite_manager)
+       at that directory — 0_db/local.db is never touched
+    3. step 4 runs offline (the Supabase report list is replaced by the
+       corpus' report hashes), then step0_runner.run_pipeline(5, 78)
+       with discovery, the step cache and snapshots off
+    4. per-step wall time, peak RSS and rows come back from the run's
+       pipeline_run_steps (common/telemetry.py)
+
+Step output goes to WORKDIR/<N>x/run.log. The summary lists every step
+with its seconds per scale, rows/s at the largest scale and the growth
+exponent between the two largest scales: step time ∝ corpus sizeᵏ
+(raw lines), so k ≈ 1 is linear and k ≥ 1.3 is flagged as a hot spot.
+A full 1/10/100× run takes well over an hour; --scales 1 10 is a
+quicker first look.
+
+Step 90 (Supabase export) is not part of the benchmark.
+"""
+
+import argparse
+import contextlib
+import math
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+for path in (PROJECT_ROOT, CURRENT_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from common import telemetry
+import bench_corpus
+
+FIRST_STEP = 5       # step 4 runs offline below
+LAST_STEP = 78
+HOT_SPOT_EXPONENT = 1.3
+
+
+# ------------------------------------------------------------
+# One scale
+# ------------------------------------------------------------
+def run_step4_offline(db_path: Path, recorder: telemetry.RunRecorder):
+    """Step 4 without Supabase: the corpus' reports stand in for EscapementReports."""
+    with recorder.step(4, "Step 4: Duplicate DB table (offline)") as rec:
+        import step4_duplicate_db as step4
+
+        hashes = bench_corpus.report_hashes(db_path)
+        conn = step4.get_conn()
+        try:
+            step4.ensure_plotpipeline_table(conn, recreate=True)
+            step4.sync_pipeline(conn, hashes)
+        finally:
+            conn.close()
+        rec.rows_in = sum(r[0] for r in _query(db_path, "SELECT line_count FROM Escapement_RawReportCache"))
+        rec.rows_out = _query(db_path, "SELECT COUNT(*) FROM Escapement_PlotPipeline")[0][0]
+
+
+def _query(db_path: Path, sql: str, params=()) -> list[tuple]:
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+
+def run_scale(scale: int, workdir: Path, args) -> dict:
+    scale_dir = workdir / f"{scale}x"
+    shutil.rmtree(scale_dir, ignore_errors=True)
+    scale_dir.mkdir(parents=True)
+    db_path = scale_dir / "local.db"
+
+    started = time.perf_counter()
+    size = bench_corpus.write_corpus(db_path, scale, args.years, args.seed)
+    print(f"\n🧪 {scale}×: {size['reports']:,} reports, {size['lines']:,} raw lines, "
+          f"{size['identities']:,} identities ({time.perf_counter() - started:.1f}s to generate)")
+
+    os.environ["RUNREPORT_DB_DIR"] = str(scale_dir)
+    import step0_runner as runner
+    import snapshots
+
+    runner.FIRST_STEP_NAME = runner.LAST_STEP_NAME = None
+    runner.SNAPSHOT_STEPS = set()
+    runner.SIGNAL_PATH = scale_dir / ".escapement_new_pdfs"
+    snapshots.SNAPSHOT_DIR = scale_dir / "snapshots"
+
+    log_path = scale_dir / "run.log"
+    started = time.perf_counter()
+    with open(log_path, "w") as log, contextlib.redirect_stdout(log):
+        recorder = telemetry.RunRecorder("bench", runner.DB_PATH, argv=[f"scale={scale}"])
+        try:
+            run_step4_offline(db_path, recorder)
+        except Exception:
+            recorder.finish("failed")
+            raise
+        recorder.finish("ok")
+        runner.run_pipeline(
+            start=FIRST_STEP,
+            end=LAST_STEP,
+            skip_discovery=True,
+            use_frames=not args.scripts,
+            use_cache=False,
+        )
+    elapsed = time.perf_counter() - started
+    print(f"   steps 4–{LAST_STEP} in {telemetry._fmt_seconds(elapsed)} (log: {log_path})")
+
+    steps = {}
+    cols = ["label", "wall_s", "peak_rss_mb", "rows_in", "rows_out"]
+    for run_id, in _query(db_path, "SELECT run_id FROM pipeline_runs ORDER BY started_at, run_id"):
+        for row in _query(db_path, f"SELECT {', '.join(cols)} FROM pipeline_run_steps "
+                                   "WHERE run_id = ? ORDER BY seq", (run_id,)):
+            steps[row[0]] = dict(zip(cols, row))
+    return {"scale": scale, "size": size, "total_s": elapsed, "steps": steps}
+
+
+# ------------------------------------------------------------
+# Summary
+# ------------------------------------------------------------
+def growth_exponent(t0: float, t1: float, n0: int, n1: int) -> float | None:
+    """k in time ∝ sizeᵏ between two runs; None when the times are too small to tell."""
+    if not t0 or not t1 or t0 < 0.01 or n1 <= n0:
+        return None
+    return math.log(t1 / t0) / math.log(n1 / n0)
+
+
+def print_summary(results: list[dict]):
+    scales = [r["scale"] for r in results]
+    largest = results[-1]
+    print("\n📊 Per-step time by scale")
+    header = f"{'step':<52}" + "".join(f"{f'{s}×':>10}" for s in scales)
+    header += f" {'rows in @' + str(scales[-1]) + '×':>14} {'rows/s':>11} {'rss MB':>8} {'k':>5}"
+    print(header)
+
+    hot = []
+    for label, big in largest["steps"].items():
+        line = f"{label[:52]:<52}"
+        for r in results:
+            s = r["steps"].get(label)
+            line += f"{telemetry._fmt_seconds(s['wall_s']) if s else '—':>10}"
+        rows = big["rows_in"]
+        rate = f"{rows / big['wall_s']:,.0f}" if rows and big["wall_s"] else "—"
+        k = None
+        small = results[-2]["steps"].get(label) if len(results) > 1 else None
+        if small:
+            k = growth_exponent(small["wall_s"], big["wall_s"],
+                                results[-2]["size"]["lines"], largest["size"]["lines"])
+        flag = ""
+        if k is not None and k >= HOT_SPOT_EXPONENT:
+            flag = " 🔥"
+            hot.append((label, k))
+        rss = big["peak_rss_mb"] if big["peak_rss_mb"] is not None else "—"
+        line += f" {telemetry._fmt_int(rows):>14} {rate:>11} {rss:>8} {f'{k:.2f}' if k is not None else '—':>5}{flag}"
+        print(line)
+
+    totals = "".join(f"{telemetry._fmt_seconds(r['total_s']):>10}" for r in results)
+    print(f"{'total':<52}{totals}")
+    if hot:
+        print(f"\n🔥 Super-linear (k ≥ {HOT_SPOT_EXPONENT}): " + ", ".join(f"{label} (k={k:.2f})" for label, k in hot))
+    elif len(results) > 1:
+        print(f"\n✅ No step grows faster than size^{HOT_SPOT_EXPONENT}.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time steps 4–78 on synthetic corpora of growing size.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--years", type=int, default=bench_corpus.YEARS)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--scripts", action="store_true", help="Run every step as a script (no frame hand-off).")
+    parser.add_argument("--workdir", type=Path, help="Where the throwaway databases go (default: a temp dir).")
+    parser.add_argument("--keep", action="store_true", help="Keep the databases and logs afterwards.")
+    args = parser.parse_args()
+
+    workdir = args.workdir or Path(tempfile.mkdtemp(prefix="escapement_bench_"))
+    workdir.mkdir(parents=True, exist_ok=True)
+    print(f"🗂️ Throwaway databases → {workdir}")
+
+    results = []
+    try:
+        for scale in sorted(set(args.scales)):
+            results.append(run_scale(scale, workdir, args))
+    finally:
+        if results:
+            print_summary(results)
+        if not args.keep and args.workdir is None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+bench_segmentation.py
+------------------------------------------------------------
+Checks segmentation.segment() against the groupby().apply()
+implementation steps 33–40 and 51 used before, and times both.
+
+    python bench_segmentation.py [--db PATH] [--scale N] [--repeat N]
+
+Reads Escapement_PlotPipeline from local.db — run the pipeline through
+step 32 (or later) first. --scale N stacks N copies of the table under
+renamed facilities to see how both versions grow with row count.
+
+For each configuration the two outputs must match
+exactly (pandas assert_frame_equal); any difference is an error.
+"""
+
+import argparse
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import pandas as pd
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+for path in (PROJECT_ROOT, CURRENT_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from common.sqlite_manager import connect
+from segmentation import GROUP_COLS, column_names, segment
+
+DB_PATH = PROJECT_ROOT / "0_db" / "local.db"
+TABLE = "Escapement_PlotPipeline"
+
+FAMILIES = ["Steelhead", "Chinook", "Coho", "Chum", "Pink", "Sockeye"]
+
+# caller → segment() keyword arguments
+CONFIGS = {
+    "Step 33 rules 1-2": dict(suffix=""),
+    "Step 33 rules 3-4": dict(suffix="", skip_last_run=True),
+    "Step 51": dict(
+        suffix="_f",
+        sort_cols=GROUP_COLS + ["date_iso", "index"],
+        families=FAMILIES,
+        reset_at_year_start=True,
+        x_count_by_year=True,
+    ),
+}
+
+
+# ------------------------------------------------------------
+# Previous implementation (per-identity Python callbacks)
+# ------------------------------------------------------------
+def legacy_segment(df, suffix="", group_cols=GROUP_COLS, sort_cols=None, skip_last_run=False,
+                   families=None, reset_at_year_start=False, x_count_by_year=False):
+    c = column_names(suffix)
+    sort_cols = sort_cols or group_cols + ["date_iso"]
+    df = df.sort_values(sort_cols).reset_index(drop=True)
+
+    df[c["day_diff"]] = df.groupby(group_cols)["date_iso"].diff().dt.days.fillna(7).astype(int)
+    df[c["adult_diff"]] = df.groupby(group_cols)["Adult_Total"].diff()
+    first_in_group = df.groupby(group_cols).cumcount() == 0
+    df.loc[first_in_group, c["adult_diff"]] = df.loc[first_in_group, "Adult_Total"]
+    df[c["adult_diff"]] = df[c["adult_diff"]].fillna(df["Adult_Total"])
+
+    trigger = (df[c["adult_diff"]] < 0) | (df[c["day_diff"]] > 90)
+    trigger = trigger & ~first_in_group
+    df[c["by_adult"]] = trigger.groupby([df[col] for col in group_cols]).cumsum() + 1
+
+    if reset_at_year_start:
+        boundary = df.groupby(group_cols)[c["by_adult"]].diff().fillna(0) != 0
+        df.loc[boundary, c["day_diff"]] = 7
+        df.loc[boundary, c["adult_diff"]] = df.loc[boundary, "Adult_Total"]
+
+    lengths = df.groupby(group_cols + [c["by_adult"]]).size().reset_index(name=c["by_adult_length"])
+    df = df.merge(lengths, on=group_cols + [c["by_adult"]], how="left")
+
+    def detect(g):
+        g = g.reset_index(drop=True)
+        if families is not None and str(g.loc[0, "Family"]).strip().title() not in families:
+            return g
+        if str(g.loc[0, "Stock"]).strip().upper() not in ["H", "W", "U"]:
+            return g
+        short_idx = set()
+        runs = g[[c["by_adult"], c["by_adult_length"]]].drop_duplicates().reset_index(drop=True)
+        for i, r in runs.iterrows():
+            if r[c["by_adult_length"]] > 15:
+                for j in range(i + 1, min(len(runs), i + 5)):
+                    sub = g[g[c["by_adult"]] == runs.loc[j, c["by_adult"]]]
+                    if (sub[c["day_diff"]] > 250).any():
+                        break
+                    if runs.loc[j, c["by_adult_length"]] < 5:
+                        if skip_last_run and j == len(runs) - 1:
+                            continue
+                        short_idx.update(sub.index)
+                    else:
+                        break
+        g.loc[g.index.isin(short_idx), c["by_short"]] = "X"
+        return g
+
+    df[c["by_short"]] = ""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", FutureWarning)
+        df = df.groupby(group_cols, group_keys=False).apply(detect).reset_index(drop=True)
+
+    mask = df[c["by_short"]] == "X"
+    bounds = group_cols + ([c["by_adult"]] if x_count_by_year else [])
+    boundary = df[bounds].ne(df[bounds].shift()).any(axis=1)
+    run_id = (mask.ne(mask.shift()) | boundary).cumsum()
+    run_len = df.groupby(run_id)[c["by_short"]].transform("size")
+    df[c["x_count"]] = run_len.where(mask, 0).astype(int)
+    return df
+
+
+# ------------------------------------------------------------
+# Benchmark
+# ------------------------------------------------------------
+def load_frame(db_path: Path, scale: int) -> pd.DataFrame:
+    conn = connect(db_path)
+    try:
+        df = pd.read_sql_query(f"SELECT * FROM {TABLE};", conn)
+    finally:
+        conn.close()
+
+    missing = [col for col in GROUP_COLS + ["Family", "date_iso", "Adult_Total"] if col not in df.columns]
+    if missing:
+        raise ValueError(f"❌ {TABLE} is missing {missing} — run the pipeline through step 32 first.")
+
+    keep = GROUP_COLS + ["Family", "date_iso", "Adult_Total"]
+    df = df[keep].copy()
+    if scale > 1:
+        copies = []
+        for k in range(scale):
+            part = df.copy()
+            part["facility"] = part["facility"].astype(str) + f" #{k}"
+            copies.append(part)
+        df = pd.concat(copies, ignore_index=True)
+
+    df["date_iso"] = pd.to_datetime(df["date_iso"], errors="coerce")
+    df["Adult_Total"] = pd.to_numeric(df["Adult_Total"], errors="coerce").fillna(0)
+    return df.reset_index()
+
+
+def best_of(fn, df, kwargs, repeat):
+    best, out = None, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        out = fn(df.copy(), **kwargs)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare and time the segmentation kernel.")
+    parser.add_argument("--db", type=Path, default=DB_PATH)
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = load_frame(args.db, args.scale)
+    print(f"✅ Loaded {len(df):,} rows ({df.groupby(GROUP_COLS).ngroups:,} identities)")
+
+    failed = 0
+    total_old = total_new = 0.0
+    for label, kwargs in CONFIGS.items():
+        t_old, old = best_of(legacy_segment, df, kwargs, args.repeat)
+        t_new, new = best_of(segment, df, kwargs, args.repeat)
+        total_old += t_old
+        total_new += t_new
+
+        try:
+            pd.testing.assert_frame_equal(old, new)
+            status = "identical"
+        except AssertionError as e:
+            failed += 1
+            status = f"❌ DIFFERENT: {str(e).splitlines()[0]}"
+
+        flagged = (new[column_names(kwargs["suffix"])["by_short"]] == "X").sum()
+        print(
+            f"   {label:<18} apply {t_old * 1000:8.1f} ms   kernel {t_new * 1000:7.1f} ms   "
+            f"×{t_old / t_new:5.1f}   {flagged:,} X rows   {status}"
+        )
+
+    print(f"\n📊 Total: apply {total_old:.2f}s, kernel {total_new:.3f}s (×{total_old / total_new:.1f})")
+    if failed:
+        print(f"❌ {failed} configuration(s) differ.")
+        sys.exit(1)
+    print("✅ Kernel output identical for all steps.")
+
+
+if __name__ == "__main__":
+    main()
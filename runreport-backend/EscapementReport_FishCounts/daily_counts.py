@@ -0,0 +1,283 @@
+"""
+daily_counts.py
+------------------------------------------------------------
+Per-day expansion of Escapement_PlotPipeline rows and the long daily
+totals table built from it (steps 74–77).
+
+Each row covers the day_diff_plot days that end on its date_iso
+(fishperday fish on each of them). expand_days() lists those days in
+long form, one row per (source row, day):
+
+    row_id       position of the source row in the frame
+    day_offset   0 = date_iso, 1 = the day before, ...
+    date         the calendar day (datetime64)
+    day_index    position of its MM-DD in the leap-year CALENDAR
+                 (common/weekly.py: 0 = 01-01, 365 = 12-31)
+    MM-DD        the calendar day as MM-DD
+
+This replaces the old Day1..DayN text columns (one column per day of
+the longest gap). The rows are built with np.repeat and date
+arithmetic, so nothing runs per row or per day in Python.
+
+The daily totals (EscapementReports_dailycounts) are kept long and
+sparse as well:
+
+    metric_type | MM-DD | basinfamily | value
+
+keyed by (metric_type, MM-DD, basinfamily), with a row only where fish
+were counted. The list of basinfamilies (EscapementReports_basinfamilies,
+written by step 75) keeps series without any fish in the later tables.
+
+Per-year totals (step 76)
+    The metrics are derived from persisted calendar-year totals,
+
+        EscapementReports_yearlycounts   year | MM-DD | basinfamily | value
+        EscapementReports_yearsources    year | fingerprint | rows
+
+    current_year is the current year's totals, previous_year last
+    year's, and 10_year the sum of every stored year before the current
+    one / TEN_YEAR_DIVISOR (step 64 keeps the last 10 years of reports;
+    their days can reach one year further back).
+
+    A year's fingerprint hashes the source rows that have days in that
+    year. sync_year_totals() recomputes only the years whose fingerprint
+    changed and deletes years no row reaches any more, so a new weekly
+    PDF rebuilds the current year alone and a year rollover only shifts
+    which stored years feed which metric. ESCAPEMENT_FULL_REBUILD=1
+    (report_store.py) drops the stored years and rebuilds them all.
+"""
+
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from common.weekly import CALENDAR, day_index
+from report_store import FULL_REBUILD, table_exists
+
+
+def expand_days(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per day covered by each row of df (see module doc).
+
+    Expects date_iso as datetime64 and day_diff_plot as int. Rows
+    without a date or with day_diff_plot <= 0 cover no days.
+    """
+    end = df["date_iso"].to_numpy(dtype="datetime64[D]")
+    lengths = df["day_diff_plot"].to_numpy(dtype=np.int64)
+    lengths = np.where(np.isnat(end) | (lengths < 0), 0, lengths)
+
+    row_id = np.repeat(np.arange(len(df)), lengths)
+    first = np.cumsum(lengths) - lengths
+    day_offset = np.arange(len(row_id)) - np.repeat(first, lengths)
+    dates = end[row_id] - day_offset.astype("timedelta64[D]")
+
+    idx = day_index(dates)
+    return pd.DataFrame({
+        "row_id": row_id,
+        "day_offset": day_offset,
+        "date": dates.astype("datetime64[ns]"),
+        "day_index": idx,
+        "MM-DD": CALENDAR[idx],
+    })
+
+
+# ------------------------------------------------------------
+# Daily totals (steps 75–77)
+# ------------------------------------------------------------
+DAILY_TABLE = "EscapementReports_dailycounts"
+BASINFAMILY_TABLE = "EscapementReports_basinfamilies"
+
+METRIC_TYPES = ["current_year", "previous_year", "10_year"]
+TEN_YEAR_DIVISOR = 10
+
+
+def create_daily_table(conn):
+    """(Re)create DAILY_TABLE in long form, keyed by (metric_type, MM-DD, basinfamily)."""
+    with conn:
+        conn.execute(f"DROP TABLE IF EXISTS {DAILY_TABLE};")
+        conn.execute(f"""
+            CREATE TABLE {DAILY_TABLE} (
+                metric_type TEXT NOT NULL,
+                "MM-DD" TEXT NOT NULL,
+                basinfamily TEXT NOT NULL,
+                value REAL NOT NULL,
+                PRIMARY KEY (metric_type, "MM-DD", basinfamily)
+            );
+        """)
+
+
+def counted_rows(source: pd.DataFrame, basinfamilies: list[str]) -> pd.DataFrame:
+    """
+    Source rows that add fish to a daily total: fishperday set and not 0,
+    basinfamily in the list. Expects fishperday numeric, date_iso
+    datetime64, day_diff_plot int.
+    """
+    return source[
+        source["fishperday"].notna()
+        & (source["fishperday"] != 0)
+        & source["basinfamily"].isin(basinfamilies)
+    ].reset_index(drop=True)
+
+
+# ------------------------------------------------------------
+# Per-year totals (step 76)
+# ------------------------------------------------------------
+YEARLY_TABLE = "EscapementReports_yearlycounts"
+YEAR_SOURCES_TABLE = "EscapementReports_yearsources"
+
+FINGERPRINT_COLS = ["basinfamily", "date_iso", "day_diff_plot", "fishperday"]
+
+
+def row_years(counted: pd.DataFrame) -> pd.DataFrame:
+    """
+    (row_id, year) for every calendar year a counted row has days in,
+    from its first and last day — no per-day expansion.
+    """
+    end = counted["date_iso"].to_numpy(dtype="datetime64[D]")
+    lengths = counted["day_diff_plot"].to_numpy(dtype=np.int64)
+    covers = ~np.isnat(end) & (lengths > 0)
+
+    row_id = np.flatnonzero(covers)
+    last = end[row_id]
+    first = last - (lengths[row_id] - 1).astype("timedelta64[D]")
+    first_year = first.astype("datetime64[Y]").astype(np.int64) + 1970
+    last_year = last.astype("datetime64[Y]").astype(np.int64) + 1970
+
+    spans = last_year - first_year + 1
+    repeated = np.repeat(np.arange(len(row_id)), spans)
+    step = np.arange(len(repeated)) - np.repeat(np.cumsum(spans) - spans, spans)
+    return pd.DataFrame({
+        "row_id": row_id[repeated],
+        "year": first_year[repeated] + step,
+    })
+
+
+def year_fingerprints(counted: pd.DataFrame, years_of_rows: pd.DataFrame) -> pd.DataFrame:
+    """
+    year, fingerprint, rows — one row per year with source days. The
+    fingerprint is a SHA-256 over the sorted row hashes of the rows
+    reaching that year, so it ignores row order and ids.
+    """
+    row_hash = pd.util.hash_pandas_object(counted[FINGERPRINT_COLS], index=False).to_numpy()
+    pairs = pd.DataFrame({
+        "year": years_of_rows["year"].to_numpy(),
+        "hash": row_hash[years_of_rows["row_id"].to_numpy()],
+    }).sort_values(["year", "hash"], kind="stable")
+
+    records = [
+        (int(year), hashlib.sha256(group["hash"].to_numpy().tobytes()).hexdigest(), len(group))
+        for year, group in pairs.groupby("year", sort=True)
+    ]
+    return pd.DataFrame(records, columns=["year", "fingerprint", "rows"])
+
+
+def year_totals(counted: pd.DataFrame, years_of_rows: pd.DataFrame, years: list[int]) -> pd.DataFrame:
+    """
+    year, MM-DD, basinfamily, value — summed fishperday of every day in
+    `years`, expanding only the rows that reach those years.
+    """
+    columns = ["year", "MM-DD", "basinfamily", "value"]
+    wanted = years_of_rows.loc[years_of_rows["year"].isin(years), "row_id"].unique()
+    if len(wanted) == 0:
+        return pd.DataFrame(columns=columns)
+    rows = counted.iloc[np.sort(wanted)].reset_index(drop=True)
+
+    # Ordered by day offset first, so the float sums add up in the same
+    # order as the old Day1..DayN melt did
+    days = expand_days(rows).sort_values(["day_offset", "row_id"], kind="stable")
+    days["year"] = days["date"].dt.year
+    days = days[days["year"].isin(years)]
+
+    long_df = pd.DataFrame({
+        "year": days["year"].to_numpy(),
+        "MM-DD": days["MM-DD"].to_numpy(),
+        "basinfamily": rows["basinfamily"].to_numpy()[days["row_id"].to_numpy()],
+        "value": rows["fishperday"].to_numpy()[days["row_id"].to_numpy()],
+    })
+    return long_df.groupby(["year", "MM-DD", "basinfamily"], as_index=False)["value"].sum()[columns]
+
+
+def create_year_tables(conn):
+    """Create the per-year tables if missing (dropped first on a full rebuild)."""
+    with conn:
+        if FULL_REBUILD:
+            conn.execute(f"DROP TABLE IF EXISTS {YEARLY_TABLE};")
+            conn.execute(f"DROP TABLE IF EXISTS {YEAR_SOURCES_TABLE};")
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {YEARLY_TABLE} (
+                year INTEGER NOT NULL,
+                "MM-DD" TEXT NOT NULL,
+                basinfamily TEXT NOT NULL,
+                value REAL NOT NULL,
+                PRIMARY KEY (year, "MM-DD", basinfamily)
+            );
+        """)
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {YEAR_SOURCES_TABLE} (
+                year INTEGER PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                rows INTEGER NOT NULL
+            );
+        """)
+
+
+def sync_year_totals(conn, counted: pd.DataFrame) -> dict:
+    """
+    Bring YEARLY_TABLE in line with `counted`: recompute the years whose
+    fingerprint changed (or are new), delete years no row reaches any
+    more, leave the rest untouched. Returns the changed / removed /
+    kept year lists.
+    """
+    create_year_tables(conn)
+    years_of_rows = row_years(counted)
+    current = year_fingerprints(counted, years_of_rows)
+
+    stored = dict(conn.execute(f"SELECT year, fingerprint FROM {YEAR_SOURCES_TABLE}").fetchall())
+    changed = [
+        int(year) for year, fingerprint in zip(current["year"], current["fingerprint"])
+        if stored.get(int(year)) != fingerprint
+    ]
+    removed = sorted(set(stored) - set(current["year"].astype(int)))
+    kept = sorted(set(stored) - set(changed) - set(removed))
+
+    totals = year_totals(counted, years_of_rows, changed)
+    with conn:
+        for year in changed + removed:
+            conn.execute(f"DELETE FROM {YEARLY_TABLE} WHERE year = ?", (year,))
+            conn.execute(f"DELETE FROM {YEAR_SOURCES_TABLE} WHERE year = ?", (year,))
+        totals.to_sql(YEARLY_TABLE, conn, if_exists="append", index=False)
+        current[current["year"].isin(changed)].to_sql(YEAR_SOURCES_TABLE, conn, if_exists="append", index=False)
+
+    return {"changed": changed, "removed": removed, "kept": kept}
+
+
+def load_year_totals(conn) -> pd.DataFrame:
+    """Every stored year total, in year order."""
+    if not table_exists(conn, YEARLY_TABLE):
+        return pd.DataFrame(columns=["year", "MM-DD", "basinfamily", "value"])
+    return pd.read_sql_query(
+        f'SELECT year, "MM-DD", basinfamily, value FROM {YEARLY_TABLE} ORDER BY year, "MM-DD", basinfamily;',
+        conn,
+    )
+
+
+def metric_totals(yearly: pd.DataFrame, current_year: int) -> pd.DataFrame:
+    """
+    Sparse daily totals (metric_type, MM-DD, basinfamily, value) from
+    the per-year totals: current_year = this year, previous_year = last
+    year, 10_year = every earlier year summed / TEN_YEAR_DIVISOR.
+    """
+    keys = ["MM-DD", "basinfamily"]
+    year = yearly["year"].astype(int)
+
+    current = yearly.loc[year == current_year, keys + ["value"]].assign(metric_type="current_year")
+    previous = yearly.loc[year == current_year - 1, keys + ["value"]].assign(metric_type="previous_year")
+    ten_year = yearly[year < current_year].groupby(keys, as_index=False)["value"].sum()
+    ten_year["value"] = ten_year["value"] / TEN_YEAR_DIVISOR
+    ten_year["metric_type"] = "10_year"
+
+    totals = pd.concat([current, previous, ten_year], ignore_index=True)
+    return totals[["metric_type", "MM-DD", "basinfamily", "value"]].sort_values(
+        ["metric_type", "MM-DD", "basinfamily"]
+    ).reset_index(drop=True)
@@ -0,0 +1,172 @@
+"""
+pdf_text.py
+------------------------------------------------------------
+Text extraction backends for step 3.
+
+Backends (ESCAPEMENT_PDF_BACKEND, default "pdfplumber"):
+
+    pdfplumber   page.extract_text() — what step 3 has always used
+    pypdfium2    PDFium text page    — several times faster
+
+Both return one string per page; `pdf_lines()` turns those into the
+rows step 3 uploads to EscapementRawLines, with the same rules as
+before (empty pages skipped, lines stripped, line_order counts every
+line of the report).
+
+Switching backends changes the raw lines every later step parses, so
+check first:
+
+    python pdf_text.py --check temp_pdfs/*.pdf
+
+prints, per PDF, whether the two backends give the same lines
+(compared after collapsing whitespace) and the first differences.
+"""
+
+import os
+import re
+import sys
+from pathlib import Path
+
+BACKEND = os.environ.get("ESCAPEMENT_PDF_BACKEND", "pdfplumber").strip().lower()
+
+# Pages per process-pool task; bigger PDFs are split into page ranges.
+PAGES_PER_TASK = 8
+
+_WS_RE = re.compile(r"\s+")
+
+
+# ------------------------------------------------------------
+# Backends
+# ------------------------------------------------------------
+def _pages_pdfplumber(pdf_path: Path, first: int, last: int) -> list[tuple[int, str]]:
+    import pdfplumber
+
+    with pdfplumber.open(pdf_path) as pdf:
+        return [
+            (page_num, pdf.pages[page_num - 1].extract_text() or "")
+            for page_num in range(first, last + 1)
+        ]
+
+
+def _pages_pypdfium2(pdf_path: Path, first: int, last: int) -> list[tuple[int, str]]:
+    import pypdfium2 as pdfium
+
+    pages = []
+    doc = pdfium.PdfDocument(pdf_path)
+    try:
+        for page_num in range(first, last + 1):
+            page = doc[page_num - 1]
+            textpage = page.get_textpage()
+            try:
+                text = textpage.get_text_bounded()
+            finally:
+                textpage.close()
+                page.close()
+            pages.append((page_num, text.replace("\r\n", "\n").replace("\r", "\n")))
+    finally:
+        doc.close()
+    return pages
+
+
+BACKENDS = {
+    "pdfplumber": _pages_pdfplumber,
+    "pypdfium2": _pages_pypdfium2,
+}
+
+
+def page_count(pdf_path: Path) -> int:
+    import pypdfium2 as pdfium
+
+    doc = pdfium.PdfDocument(pdf_path)
+    try:
+        return len(doc)
+    finally:
+        doc.close()
+
+
+def extract_pages(pdf_path: Path, first: int = 1, last: int | None = None,
+                  backend: str | None = None) -> list[tuple[int, str]]:
+    """(page_num, text) for pages first..last (1-based, inclusive)."""
+    backend = backend or BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"❌ Unknown PDF backend '{backend}' (expected one of {', '.join(BACKENDS)})")
+    if last is None:
+        last = page_count(pdf_path)
+    return BACKENDS[backend](Path(pdf_path), first, last)
+
+
+def page_tasks(pdf_path: Path) -> list[tuple[int, int]]:
+    """Split a PDF into (first, last) page ranges for the process pool."""
+    total = page_count(pdf_path)
+    return [
+        (first, min(first + PAGES_PER_TASK - 1, total))
+        for first in range(1, total + 1, PAGES_PER_TASK)
+    ]
+
+
+# ------------------------------------------------------------
+# Pages → EscapementRawLines rows
+# ------------------------------------------------------------
+def pdf_lines(pages: list[tuple[int, str]], report_id: int, pdf_name: str) -> list[tuple]:
+    """
+    (report_id, line_order, pdf_name, page_num, text_line) in line_order.
+    `pages` may arrive in any order (pool results); they are sorted here.
+    """
+    rows = []
+    line_order = 0
+    for page_num, text in sorted(pages):
+        if not text:
+            continue
+        for line in text.splitlines():
+            line_order += 1
+            rows.append((report_id, line_order, pdf_name, page_num, line.strip()))
+    return rows
+
+
+# ------------------------------------------------------------
+# Equivalence check
+# ------------------------------------------------------------
+def _normalized(pages: list[tuple[int, str]]) -> list[tuple[int, str]]:
+    return [
+        (row[3], _WS_RE.sub(" ", row[4]).strip())
+        for row in pdf_lines(pages, 0, "")
+    ]
+
+
+def compare_backends(pdf_path: Path, a: str = "pdfplumber", b: str = "pypdfium2",
+                     limit: int = 5) -> list[str]:
+    """Differences between two backends' lines (empty list = equivalent)."""
+    lines_a = _normalized(extract_pages(pdf_path, backend=a))
+    lines_b = _normalized(extract_pages(pdf_path, backend=b))
+
+    diffs = []
+    if len(lines_a) != len(lines_b):
+        diffs.append(f"line count {a}={len(lines_a)} {b}={len(lines_b)}")
+    for i, (la, lb) in enumerate(zip(lines_a, lines_b), start=1):
+        if la != lb:
+            diffs.append(f"line {i}: {a}={la!r} {b}={lb!r}")
+            if len(diffs) >= limit:
+                break
+    return diffs
+
+
+def check_files(paths: list[str]) -> bool:
+    same = 0
+    for path in paths:
+        diffs = compare_backends(Path(path))
+        if diffs:
+            print(f"❌ {Path(path).name}")
+            for d in diffs:
+                print(f"   • {d}")
+        else:
+            same += 1
+            print(f"✅ {Path(path).name}")
+    print(f"\n📊 {same}/{len(paths)} PDFs give identical lines on both backends.")
+    return same == len(paths)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--check":
+        sys.exit(0 if check_files(sys.argv[2:]) else 1)
+    print("Usage: python pdf_text.py --check file.pdf [file.pdf ...]")
+    sys.exit(2)
@@ -0,0 +1,107 @@
+"""
+pipeline_schema.py
+------------------------------------------------------------
+Declared column types for the Escapement_PlotPipeline working table.
+
+The table used to be TEXT throughout (the old steps 7–24 added every
+column with ALTER TABLE ... ADD COLUMN ... TEXT, counts as str(int)),
+so nearly every step repeated pd.to_numeric / pd.to_datetime and the
+same rename_map on the same columns. The types are declared here once:
+
+    COUNT_COLS                         INTEGER  int64 (float64 while
+                                                blanks remain, NaN = blank)
+    DATE_COLS      date_iso, pdf_date  DATE     datetime64[ns] in memory,
+                                                'YYYY-MM-DD' in SQLite
+    CATEGORY_COLS  facility, basin,    TEXT     pandas category
+                   species, Family,
+                   Stock
+
+load() reads the table with these dtypes and save() writes it back
+with the declared SQL types. The runner's FrameStore uses both, so a
+frame step's transform(df) receives typed columns and does not coerce
+them again; script-mode main() functions load/save the same way.
+
+Columns not listed keep whatever pandas reads from SQLite.
+"""
+
+import pandas as pd
+
+TABLE = "Escapement_PlotPipeline"
+
+COUNT_COLS = [
+    "Adult_Total",
+    "Jack_Total",
+    "Total_Eggtake",
+    "On_Hand_Adults",
+    "On_Hand_Jacks",
+    "Lethal_Spawned",
+    "Live_Spawned",
+    "Released",
+    "Live_Shipped",
+    "Mortality",
+    "Surplus",
+]
+
+DATE_COLS = ["date_iso", "pdf_date"]
+
+CATEGORY_COLS = ["facility", "basin", "species", "Family", "Stock"]
+
+# Space-delimited count names from older tables → underscore schema
+LEGACY_NAMES = {
+    "Adult Total": "Adult_Total",
+    "Jack Total": "Jack_Total",
+    "Total Eggtake": "Total_Eggtake",
+    "On Hand Adults": "On_Hand_Adults",
+    "On Hand Jacks": "On_Hand_Jacks",
+    "Lethal Spawned": "Lethal_Spawned",
+    "Live Spawned": "Live_Spawned",
+    "Live Shipped": "Live_Shipped",
+}
+
+SQL_TYPES = {
+    **{col: "INTEGER" for col in COUNT_COLS},
+    **{col: "DATE" for col in DATE_COLS},
+    **{col: "TEXT" for col in CATEGORY_COLS},
+}
+
+DATE_FORMAT = "%Y-%m-%d"
+
+
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Rename legacy count names and give every declared column its dtype.
+    Columns that already have it are left alone, so this is cheap on a
+    frame that came from load().
+    """
+    df = df.rename(columns=LEGACY_NAMES)
+
+    for col in COUNT_COLS:
+        if col in df.columns and not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+
+    for col in DATE_COLS:
+        if col in df.columns and not pd.api.types.is_datetime64_dtype(df[col]):
+            df[col] = pd.to_datetime(df[col], errors="coerce", format="ISO8601")
+
+    for col in CATEGORY_COLS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("category")
+
+    return df
+
+
+def load(conn, table: str = TABLE) -> pd.DataFrame:
+    """Read `table` with the declared dtypes."""
+    return apply_schema(pd.read_sql_query(f"SELECT * FROM {table};", conn))
+
+
+def save(df: pd.DataFrame, conn, table: str = TABLE):
+    """Replace `table` with df: dates as 'YYYY-MM-DD' (NULL for NaT), declared SQL types."""
+    dates = {
+        col: df[col].dt.strftime(DATE_FORMAT)
+        for col in DATE_COLS
+        if col in df.columns and pd.api.types.is_datetime64_dtype(df[col])
+    }
+    out = df.assign(**dates) if dates else df
+    dtype = {col: sql for col, sql in SQL_TYPES.items() if col in out.columns}
+    out.to_sql(table, conn, if_exists="replace", index=False, dtype=dtype)
@@ -0,0 +1,200 @@
+"""
+raw_cache.py
+------------------------------------------------------------
+Local copy of Supabase EscapementRawLines, keyed by PDF hash.
+
+Tables (local.db):
+
+Escapement_RawReportCache     one row per cached report
+    report_id   EscapementReports.id
+    hash        EscapementReports.hash the cached lines belong to
+    line_count  raw lines cached for the report
+    synced_at
+
+Escapement_RawLineCache       raw lines exactly as in EscapementRawLines
+    id, report_id, line_order, pdf_name, page_num, text_line
+
+A report's cached lines stay valid as long as its hash in
+EscapementReports is unchanged. `sync_raw_cache()` only downloads
+reports that are missing locally or whose hash changed, pages with
+keyset pagination (id > last_id) instead of offsets, and lands the
+whole download in one transaction. When nothing changed, step 4 makes
+one EscapementReports query and copies the rest from local.db.
+"""
+
+from datetime import datetime, timezone
+
+LINES_TABLE = "Escapement_RawLineCache"
+REPORTS_TABLE = "Escapement_RawReportCache"
+
+RAW_COLS = ("id", "report_id", "line_order", "pdf_name", "page_num", "text_line")
+
+PAGE_SIZE = 1000
+REPORT_CHUNK = 100   # report_ids per IN (...) filter
+
+
+# ------------------------------------------------------------
+# Schema
+# ------------------------------------------------------------
+def ensure_cache_tables(conn):
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {LINES_TABLE} (
+            id INTEGER PRIMARY KEY,
+            report_id INTEGER,
+            line_order INTEGER,
+            pdf_name TEXT,
+            page_num INTEGER,
+            text_line TEXT
+        );
+    """)
+    conn.execute(f"""
+        CREATE INDEX IF NOT EXISTS idx_rawlinecache_order
+        ON {LINES_TABLE} (report_id, line_order, id);
+    """)
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {REPORTS_TABLE} (
+            report_id INTEGER PRIMARY KEY,
+            hash TEXT,
+            line_count INTEGER,
+            synced_at TEXT
+        );
+    """)
+
+
+def cached_hashes(conn) -> dict[int, str | None]:
+    rows = conn.execute(f"SELECT report_id, hash FROM {REPORTS_TABLE}").fetchall()
+    return {r[0]: r[1] for r in rows}
+
+
+# ------------------------------------------------------------
+# Supabase download
+# ------------------------------------------------------------
+def _fetch_lines_after(client, report_ids: list[int], last_id: int) -> list[dict]:
+    response = (
+        client.table("EscapementRawLines")
+        .select(",".join(RAW_COLS))
+        .in_("report_id", report_ids)
+        .gt("id", last_id)
+        .order("id")
+        .limit(PAGE_SIZE)
+        .execute()
+    )
+    if getattr(response, "error", None):
+        raise RuntimeError(f"Supabase query failed: {response.error}")
+    return response.data or []
+
+
+def download_lines(client, report_ids: list[int]) -> list[tuple]:
+    """All raw lines for the given reports, via id > last_id pages."""
+    lines = []
+    ordered = sorted(report_ids)
+    for i in range(0, len(ordered), REPORT_CHUNK):
+        chunk = ordered[i:i + REPORT_CHUNK]
+        last_id = 0
+        while True:
+            rows = _fetch_lines_after(client, chunk, last_id)
+            if not rows:
+                break
+            lines.extend(tuple(row.get(col) for col in RAW_COLS) for row in rows)
+            last_id = rows[-1]["id"]
+            if len(rows) < PAGE_SIZE:
+                break
+    return lines
+
+
+# ------------------------------------------------------------
+# Sync
+# ------------------------------------------------------------
+def sync_raw_cache(conn, client, hashes: dict[int, str | None]) -> dict:
+    """
+    Bring the cache in line with EscapementReports (`hashes`:
+    report_id → hash). Downloads happen first; the cache is only
+    touched afterwards, in a single transaction.
+    """
+    ensure_cache_tables(conn)
+    conn.commit()
+
+    cached = cached_hashes(conn)
+    missing = sorted(
+        rid for rid, file_hash in hashes.items()
+        if rid not in cached or cached[rid] != file_hash
+    )
+    removed = sorted(set(cached) - set(hashes))
+
+    lines = download_lines(client, missing) if missing else []
+
+    if missing or removed:
+        counts: dict[int, int] = {}
+        for line in lines:
+            counts[line[1]] = counts.get(line[1], 0) + 1
+        now = datetime.now(timezone.utc).isoformat()
+        stale = missing + removed
+
+        with conn:
+            conn.execute("BEGIN")
+            for i in range(0, len(stale), 500):
+                chunk = stale[i:i + 500]
+                marks = ", ".join("?" for _ in chunk)
+                conn.execute(f"DELETE FROM {LINES_TABLE} WHERE report_id IN ({marks})", chunk)
+                conn.execute(f"DELETE FROM {REPORTS_TABLE} WHERE report_id IN ({marks})", chunk)
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {LINES_TABLE} ({', '.join(RAW_COLS)}) VALUES (?, ?, ?, ?, ?, ?)",
+                lines,
+            )
+            conn.executemany(
+                f"INSERT INTO {REPORTS_TABLE} (report_id, hash, line_count, synced_at) VALUES (?, ?, ?, ?)",
+                [(rid, hashes[rid], counts.get(rid, 0), now) for rid in missing],
+            )
+
+    return {
+        "up_to_date": len(hashes) - len(missing),
+        "downloaded_reports": len(missing),
+        "downloaded_lines": len(lines),
+        "removed": len(removed),
+    }
+
+
+# ------------------------------------------------------------
+# Cache → working table
+# ------------------------------------------------------------
+def copy_to_table(conn, table: str, report_ids: list[int] | None = None, first_id: int | None = None) -> int:
+    """
+    Copy cached lines into `table` in (report_id, line_order, id) order.
+
+    report_ids=None copies every cached report. With first_id, ids are
+    numbered from first_id in that same order; otherwise the table's
+    AUTOINCREMENT assigns them.
+    """
+    where = ""
+    params: list = []
+    if report_ids is not None:
+        if not report_ids:
+            return 0
+        conn.execute("DROP TABLE IF EXISTS temp.copy_reports")
+        conn.execute("CREATE TEMP TABLE copy_reports (report_id INTEGER PRIMARY KEY)")
+        conn.executemany("INSERT INTO temp.copy_reports VALUES (?)", [(rid,) for rid in report_ids])
+        where = "WHERE report_id IN (SELECT report_id FROM temp.copy_reports)"
+
+    if first_id is None:
+        sql = f"""
+            INSERT INTO {table} (report_id, line_order, pdf_name, page_num, text_line)
+            SELECT report_id, line_order, pdf_name, page_num, text_line
+            FROM {LINES_TABLE}
+            {where}
+            ORDER BY report_id, line_order, id
+        """
+    else:
+        sql = f"""
+            INSERT INTO {table} (id, report_id, line_order, pdf_name, page_num, text_line)
+            SELECT ? - 1 + ROW_NUMBER() OVER (ORDER BY report_id, line_order, id),
+                   report_id, line_order, pdf_name, page_num, text_line
+            FROM {LINES_TABLE}
+            {where}
+            ORDER BY report_id, line_order, id
+        """
+        params = [first_id]
+
+    copied = conn.execute(sql, params).rowcount
+    if report_ids is not None:
+        conn.execute("DROP TABLE temp.copy_reports")
+    return copied
@@ -0,0 +1,236 @@
+"""
+report_store.py
+------------------------------------------------------------
+Per-report parsed-line store for incremental Escapement runs.
+
+Tables (local.db):
+
+Escapement_ParsedReports      one row per report seen by step 4
+    report_id   EscapementReports.id
+    hash        EscapementReports.hash (PDF SHA-256 from step 2)
+    first_id    Escapement_PlotPipeline id range handed out by step 4
+    last_id
+    line_count  parsed lines kept for the report (after steps 5–7)
+    parsed_at   NULL while the report is still pending
+
+Escapement_ParsedLines        every parsed line of every registered report
+    same columns as Escapement_PlotPipeline after step 7
+
+Flow:
+    step 4  copies raw lines ONLY for reports that are new or whose hash
+            changed, registers them as pending and gives their lines ids
+            after everything already stored
+    steps 5–7 run over those lines only
+    step 8  moves the pending lines into Escapement_ParsedLines and
+            rebuilds Escapement_PlotPipeline from the whole store, so the
+            cross-report steps still see the full archive
+
+Set ESCAPEMENT_FULL_REBUILD=1 to drop the store and reparse everything.
+"""
+
+import os
+from datetime import datetime, timezone
+
+WORK_TABLE = "Escapement_PlotPipeline"
+LINES_TABLE = "Escapement_ParsedLines"
+REPORTS_TABLE = "Escapement_ParsedReports"
+
+FULL_REBUILD = os.environ.get("ESCAPEMENT_FULL_REBUILD", "").strip() not in ("", "0")
+
+
+# ------------------------------------------------------------
+# Schema helpers
+# ------------------------------------------------------------
+def table_exists(conn, table: str) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone()
+    return row is not None
+
+
+def table_columns(conn, table: str) -> list[str]:
+    return [r[1] for r in conn.execute(f"PRAGMA table_info({table})").fetchall()]
+
+
+def ensure_reports_table(conn):
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {REPORTS_TABLE} (
+            report_id INTEGER PRIMARY KEY,
+            hash TEXT,
+            first_id INTEGER,
+            last_id INTEGER,
+            line_count INTEGER,
+            parsed_at TEXT
+        );
+    """)
+
+
+def reset_store(conn):
+    """Forget every stored report (next step 4 copies the full archive)."""
+    conn.execute(f"DROP TABLE IF EXISTS {LINES_TABLE};")
+    conn.execute(f"DROP TABLE IF EXISTS {REPORTS_TABLE};")
+    ensure_reports_table(conn)
+
+
+def is_incremental(conn) -> bool:
+    """Incremental only when a previous run left a populated store behind."""
+    if FULL_REBUILD:
+        return False
+    if not (table_exists(conn, LINES_TABLE) and table_exists(conn, REPORTS_TABLE)):
+        return False
+    row = conn.execute(
+        f"SELECT COUNT(*) FROM {REPORTS_TABLE} WHERE parsed_at IS NOT NULL"
+    ).fetchone()
+    return row[0] > 0
+
+
+# ------------------------------------------------------------
+# Registry (step 4)
+# ------------------------------------------------------------
+def stored_hashes(conn) -> dict[int, str | None]:
+    """report_id → hash for reports whose lines are already in the store."""
+    rows = conn.execute(
+        f"SELECT report_id, hash FROM {REPORTS_TABLE} WHERE parsed_at IS NOT NULL"
+    ).fetchall()
+    return {r[0]: r[1] for r in rows}
+
+
+def next_line_id(conn) -> int:
+    """First free Escapement_PlotPipeline id after everything handed out so far."""
+    high = conn.execute(f"SELECT MAX(last_id) FROM {REPORTS_TABLE}").fetchone()[0] or 0
+    if table_exists(conn, LINES_TABLE):
+        stored = conn.execute(f"SELECT MAX(id) FROM {LINES_TABLE}").fetchone()[0] or 0
+        high = max(high, stored)
+    return high + 1
+
+
+def register_pending(conn, reports: dict[int, str | None]):
+    """
+    Record the reports copied into the working table by step 4.
+    Their id ranges are read back from the working table.
+    """
+    ranges = {
+        r[0]: (r[1], r[2])
+        for r in conn.execute(f"""
+            SELECT report_id, MIN(id), MAX(id)
+            FROM {WORK_TABLE}
+            GROUP BY report_id
+        """).fetchall()
+    }
+    conn.executemany(
+        f"""
+        INSERT OR REPLACE INTO {REPORTS_TABLE}
+            (report_id, hash, first_id, last_id, line_count, parsed_at)
+        VALUES (?, ?, ?, ?, NULL, NULL)
+        """,
+        [
+            (report_id, file_hash, *ranges.get(report_id, (None, None)))
+            for report_id, file_hash in reports.items()
+        ],
+    )
+
+
+def forget_reports(conn, report_ids: list[int]):
+    """Drop reports (and their stored lines) that vanished upstream."""
+    for i in range(0, len(report_ids), 500):
+        chunk = report_ids[i:i + 500]
+        marks = ", ".join("?" for _ in chunk)
+        conn.execute(f"DELETE FROM {LINES_TABLE} WHERE report_id IN ({marks})", chunk)
+        conn.execute(f"DELETE FROM {REPORTS_TABLE} WHERE report_id IN ({marks})", chunk)
+
+
+def pending_report_ids(conn) -> list[int]:
+    if not table_exists(conn, REPORTS_TABLE):
+        return []
+    rows = conn.execute(
+        f"SELECT report_id FROM {REPORTS_TABLE} WHERE parsed_at IS NULL ORDER BY report_id"
+    ).fetchall()
+    return [r[0] for r in rows]
+
+
+# ------------------------------------------------------------
+# Row context (step 7)
+# ------------------------------------------------------------
+def context_row(conn, before_id: int) -> dict | None:
+    """
+    Last stored line before this run's first line.
+
+    Step 7 carries species / stock-wrap state across report boundaries,
+    so an incremental run starts from the same state a full pass would.
+    """
+    if not table_exists(conn, LINES_TABLE) or before_id is None:
+        return None
+    pending = pending_report_ids(conn)
+    marks = ", ".join("?" for _ in pending) or "NULL"
+    cur = conn.execute(
+        f"""
+        SELECT * FROM {LINES_TABLE}
+        WHERE id < ? AND report_id NOT IN ({marks})
+        ORDER BY id DESC
+        LIMIT 1
+        """,
+        (before_id, *pending),
+    )
+    row = cur.fetchone()
+    if row is None:
+        return None
+    return dict(zip([d[0] for d in cur.description], row))
+
+
+# ------------------------------------------------------------
+# Merge (step 8)
+# ------------------------------------------------------------
+def merge_pending(conn) -> dict:
+    """
+    Move the working table's lines into the store, then rebuild the
+    working table from the whole store. Runs in one transaction.
+    """
+    ensure_reports_table(conn)
+    pending = pending_report_ids(conn)
+    work_cols = table_columns(conn, WORK_TABLE)
+
+    if table_exists(conn, LINES_TABLE) and table_columns(conn, LINES_TABLE) != work_cols:
+        raise RuntimeError(
+            f"❌ {LINES_TABLE} columns differ from {WORK_TABLE} (parser output changed). "
+            "Rerun from step 4 with ESCAPEMENT_FULL_REBUILD=1."
+        )
+
+    cols = ", ".join(work_cols)
+    now = datetime.now(timezone.utc).isoformat()
+
+    with conn:
+        conn.execute("BEGIN")
+        if not table_exists(conn, LINES_TABLE):
+            schema = conn.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (WORK_TABLE,)
+            ).fetchone()[0]
+            conn.execute(schema.replace(WORK_TABLE, LINES_TABLE, 1))
+
+        # Older copies of re-downloaded reports (hash changed)
+        for i in range(0, len(pending), 500):
+            chunk = pending[i:i + 500]
+            marks = ", ".join("?" for _ in chunk)
+            conn.execute(f"DELETE FROM {LINES_TABLE} WHERE report_id IN ({marks})", chunk)
+
+        added = conn.execute(f"""
+            INSERT OR REPLACE INTO {LINES_TABLE} ({cols})
+            SELECT {cols} FROM {WORK_TABLE}
+        """).rowcount
+
+        conn.execute(f"""
+            UPDATE {REPORTS_TABLE}
+            SET parsed_at = ?,
+                line_count = (
+                    SELECT COUNT(*) FROM {LINES_TABLE} l
+                    WHERE l.report_id = {REPORTS_TABLE}.report_id
+                )
+            WHERE parsed_at IS NULL
+        """, (now,))
+
+        conn.execute(f"DELETE FROM {WORK_TABLE}")
+        total = conn.execute(f"""
+            INSERT INTO {WORK_TABLE} ({cols})
+            SELECT {cols} FROM {LINES_TABLE} ORDER BY id
+        """).rowcount
+
+    return {"reports": len(pending), "added": added, "total": total}
@@ -0,0 +1,204 @@
+"""
+segmentation.py
+------------------------------------------------------------
+Biological-year segmentation shared by step 33 (every pass) and step 51.
+
+For every identity (facility, species, Stock, Stock_BO) sorted by date:
+
+    day_diff{s}          days since the previous row (7 for the first row)
+    adult_diff{s}        Adult_Total change (Adult_Total for the first row)
+    by_adult{s}          biological year: +1 when Adult_Total drops or
+                         the gap is > 90 days
+    by_adult{s}_length   rows in that biological year
+    by_short{s}          "X" on short spillover runs: runs of < 5 rows
+                         following a run of > 15 rows (up to 4 runs ahead,
+                         stopping at a run with a > 250 day gap), H/W/U
+                         stocks only
+    x_count{s}           length of the contiguous "X" block a row is in
+
+{s} is the caller's column suffix ("" in step 33, "_f" in step 51).
+
+Everything is computed with NumPy over the sorted frame: identity and
+run boundaries are boolean masks, run lengths come from np.bincount and
+the spillover look-ahead is a "last blocking run" scan, so no Python
+code runs per identity or per run.
+
+    python bench_segmentation.py
+
+checks the result against the old groupby().apply() implementation
+and times both.
+"""
+
+import numpy as np
+import pandas as pd
+
+GROUP_COLS = ["facility", "species", "Stock", "Stock_BO"]
+SPILL_STOCKS = ("H", "W", "U")
+
+LONG_RUN = 15       # a run longer than this can spill over ...
+SHORT_RUN = 5       # ... into following runs shorter than this
+LOOKAHEAD = 4       # runs checked after a long run
+GAP_DAYS = 250      # a gap this long ends the look-ahead
+NEW_YEAR_DAYS = 90  # a gap this long starts a new biological year
+
+_NS_PER_DAY = 86_400_000_000_000
+
+
+def column_names(suffix: str) -> dict[str, str]:
+    return {
+        "day_diff": f"day_diff{suffix}",
+        "adult_diff": f"adult_diff{suffix}",
+        "by_adult": f"by_adult{suffix}",
+        "by_adult_length": f"by_adult{suffix}_length",
+        "by_short": f"by_short{suffix}",
+        "x_count": f"x_count{suffix}",
+    }
+
+
+def _starts(codes: np.ndarray) -> np.ndarray:
+    """True where a new block of equal codes begins."""
+    starts = np.ones(len(codes), dtype=bool)
+    starts[1:] = codes[1:] != codes[:-1]
+    return starts
+
+
+def _block_lengths(starts: np.ndarray) -> np.ndarray:
+    """Per-row length of the block it belongs to."""
+    block = np.cumsum(starts) - 1
+    return np.bincount(block)[block]
+
+
+def _day_diff(dates: pd.Series, group_start: np.ndarray) -> np.ndarray:
+    ns = dates.to_numpy(dtype="datetime64[ns]").view(np.int64)
+    nat = np.isnat(dates.to_numpy(dtype="datetime64[ns]"))
+    diff = np.full(len(ns), 7, dtype=np.int64)
+    if len(ns) > 1:
+        valid = ~(nat[1:] | nat[:-1] | group_start[1:])
+        diff[1:][valid] = (ns[1:][valid] - ns[:-1][valid]) // _NS_PER_DAY
+    return diff
+
+
+def segment(
+    df: pd.DataFrame,
+    suffix: str = "",
+    group_cols: list[str] = GROUP_COLS,
+    sort_cols: list[str] | None = None,
+    skip_last_run: bool = False,
+    families: list[str] | None = None,
+    reset_at_year_start: bool = False,
+    x_count_by_year: bool = False,
+) -> pd.DataFrame:
+    """
+    Sort `df` and add the six segmentation columns (see module doc).
+
+    Expects date_iso as datetime64 and Adult_Total numeric.
+
+    skip_last_run        never flag an identity's last run (step 33
+                         rules 3 and 4)
+    families             only flag identities whose first row's Family
+                         is in this list (step 51)
+    reset_at_year_start  day_diff = 7 / adult_diff = Adult_Total on the
+                         first row of each biological year (step 51)
+    x_count_by_year      X blocks also end at a biological-year change
+                         (step 51)
+
+    Rows with a missing identity value are dropped, as the old
+    groupby().apply() did.
+    """
+    cols = column_names(suffix)
+    sort_cols = sort_cols or group_cols + ["date_iso"]
+
+    df = df.sort_values(sort_cols).reset_index(drop=True)
+    keyed = df[group_cols].notna().all(axis=1)
+    dropped = not keyed.all()
+    df = df[keyed].reset_index(drop=True)
+    n = len(df)
+
+    gid = df.groupby(group_cols, sort=False, observed=True).ngroup().to_numpy()
+    group_start = _starts(gid)
+
+    # ------------------------------------------------------------
+    # day_diff / adult_diff / by_adult
+    # ------------------------------------------------------------
+    day_diff = _day_diff(df["date_iso"], group_start)
+
+    adults = df["Adult_Total"].to_numpy(dtype=np.float64)
+    adult_diff = adults.copy()
+    if n > 1:
+        adult_diff[1:] = np.where(group_start[1:], adults[1:], adults[1:] - adults[:-1])
+
+    trigger = ((adult_diff < 0) | (day_diff > NEW_YEAR_DAYS)) & ~group_start
+    csum = np.cumsum(trigger)
+    by_adult = csum - csum[np.flatnonzero(group_start)][np.cumsum(group_start) - 1] + 1
+
+    run_start = group_start | trigger
+    if reset_at_year_start:
+        day_diff[trigger] = 7
+        adult_diff[trigger] = adults[trigger]
+
+    # ------------------------------------------------------------
+    # by_adult_length
+    # ------------------------------------------------------------
+    run_id = np.cumsum(run_start) - 1
+    run_len = np.bincount(run_id, minlength=run_id[-1] + 1 if n else 0)
+    by_adult_length = run_len[run_id] if n else np.zeros(0, dtype=np.int64)
+
+    # ------------------------------------------------------------
+    # by_short — spillover runs
+    # ------------------------------------------------------------
+    by_short = np.full(n, "", dtype=object)
+    if n:
+        n_runs = len(run_len)
+        run_first_row = np.flatnonzero(run_start)
+        run_group = gid[run_first_row]
+        run_gap = np.bincount(run_id, weights=(day_diff > GAP_DAYS)).astype(bool)
+
+        first_rows = df.loc[group_start, :]
+        eligible = first_rows["Stock"].astype(str).str.strip().str.upper().isin(SPILL_STOCKS).to_numpy()
+        if families is not None:
+            eligible &= first_rows["Family"].astype(str).str.strip().str.title().isin(families).to_numpy()
+        run_eligible = eligible[np.cumsum(group_start)[run_first_row] - 1]
+
+        # A short run is flagged when the nearest earlier run that is not
+        # a gap-free short run is a long run of the same identity, at most
+        # LOOKAHEAD runs back.
+        passable = ~run_gap & (run_len < SHORT_RUN)
+        idx = np.arange(n_runs)
+        blocker = np.maximum.accumulate(np.where(passable, -1, idx))
+        safe = np.maximum(blocker, 0)
+        flagged = (
+            passable
+            & run_eligible
+            & (blocker >= 0)
+            & (run_group[safe] == run_group)
+            & (idx - blocker <= LOOKAHEAD)
+            & (run_len[safe] > LONG_RUN)
+        )
+        if skip_last_run:
+            last_run = np.ones(n_runs, dtype=bool)
+            last_run[:-1] = run_group[1:] != run_group[:-1]
+            flagged &= ~last_run
+
+        by_short[flagged[run_id]] = "X"
+
+    # ------------------------------------------------------------
+    # x_count — contiguous X blocks
+    # ------------------------------------------------------------
+    is_x = by_short == "X"
+    block_start = (run_start if x_count_by_year else group_start).copy()
+    if n > 1:
+        block_start[1:] |= is_x[1:] != is_x[:-1]
+    x_count = np.where(is_x, _block_lengths(block_start), 0) if n else np.zeros(0, dtype=np.int64)
+
+    df[cols["day_diff"]] = day_diff
+    df[cols["adult_diff"]] = adult_diff
+    # The old groupby cumsum / merge left NaN on unkeyed rows, so these
+    # came out as float whenever any were present.
+    if dropped:
+        by_adult = by_adult.astype(float)
+        by_adult_length = by_adult_length.astype(float)
+    df[cols["by_adult"]] = by_adult
+    df[cols["by_adult_length"]] = by_adult_length
+    df[cols["by_short"]] = by_short
+    df[cols["x_count"]] = x_count.astype(int)
+    return df
@@ -0,0 +1,168 @@
+"""
+snapshots.py
+------------------------------------------------------------
+Resume snapshots for the Escapement runner.
+
+After the steps in step0_runner.SNAPSHOT_STEPS (and any --snapshot N)
+the runner copies the Escapement working tables out of local.db into
+0_db/snapshots/after_stepNN.db (next to local.db, so RUNREPORT_DB_DIR
+moves them too). `--resume-from N` puts the tables of the latest
+snapshot taken before step N back and runs from the step after it —
+so a crash in step 76 no longer means rerunning from step 2, and
+tables a failed step had already half-rewritten (steps 25/26 delete
+in place) are replaced as a whole.
+
+Only tables that a later step still reads or writes are copied: a
+snapshot after step M holds every WORKING_TABLES entry last used after
+M, so restoring it gives the later steps exactly the inputs they had.
+Tables shared with the other pipelines (ManualRuleResults,
+EscapementReports, Columbia/Flows tables) are never touched.
+
+Pruning:
+    - taking the snapshot after step M deletes every snapshot after a
+      later step (they describe an older run)
+    - snapshots older than ESCAPEMENT_SNAPSHOT_MAX_AGE_DAYS (default 7)
+      are deleted at the start of every run
+"""
+
+import os
+import sqlite3
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from common.sqlite_manager import connect, resolve_db_path
+from daily_counts import BASINFAMILY_TABLE, DAILY_TABLE, YEAR_SOURCES_TABLE, YEARLY_TABLE
+from step_cache import PLOT_TABLE, WEEKLY_TABLE, copy_table
+import pipeline_schema
+import raw_cache
+import report_store
+
+SNAPSHOT_DIR = resolve_db_path("local.db").parent / "snapshots"
+MAX_AGE_DAYS = float(os.environ.get("ESCAPEMENT_SNAPSHOT_MAX_AGE_DAYS", 7))
+META_TABLE = "_snapshot"
+
+# Working table → last step that reads or writes it.
+WORKING_TABLES = {
+    raw_cache.LINES_TABLE: 4,
+    raw_cache.REPORTS_TABLE: 4,
+    report_store.LINES_TABLE: 8,
+    report_store.REPORTS_TABLE: 8,
+    pipeline_schema.TABLE: 90,
+    BASINFAMILY_TABLE: 77,
+    DAILY_TABLE: 77,
+    YEARLY_TABLE: 76,
+    YEAR_SOURCES_TABLE: 76,
+    WEEKLY_TABLE: 78,
+    PLOT_TABLE: 90,
+}
+
+
+def snapshot_path(step: int) -> Path:
+    return SNAPSHOT_DIR / f"after_step{step:02d}.db"
+
+
+def tables_after(step: int) -> list[str]:
+    """Working tables a step after `step` still reads or writes."""
+    return [table for table, last in WORKING_TABLES.items() if last > step]
+
+
+def available() -> dict[int, Path]:
+    """Step number → snapshot file, in step order."""
+    if not SNAPSHOT_DIR.exists():
+        return {}
+    found = {}
+    for path in SNAPSHOT_DIR.glob("after_step*.db"):
+        step = path.stem.removeprefix("after_step")
+        if step.isdigit():
+            found[int(step)] = path
+    return dict(sorted(found.items()))
+
+
+def describe(step: int) -> str:
+    # Snapshot files are standalone copies, not the shared local.db: plain sqlite3.
+    conn = sqlite3.connect(snapshot_path(step))
+    try:
+        label, created_at = conn.execute(f"SELECT label, created_at FROM {META_TABLE}").fetchone()
+        tables = conn.execute(f"SELECT COUNT(*) FROM {META_TABLE}_tables").fetchone()[0]
+    finally:
+        conn.close()
+    return f"after {label} — {created_at}, {tables} tables"
+
+
+# ------------------------------------------------------------
+# Take / restore
+# ------------------------------------------------------------
+def take(step: int, label: str, db_path: Path) -> Path:
+    """Copy the working tables later steps still use into after_stepNN.db."""
+    started = time.perf_counter()
+    SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+    target = snapshot_path(step)
+    partial = target.with_suffix(".partial")
+    partial.unlink(missing_ok=True)
+
+    # The snapshot file is written once and never shared, so it skips
+    # sqlite_manager's WAL / shared pragmas; local.db is only ATTACHed.
+    conn = sqlite3.connect(partial)
+    try:
+        conn.execute("ATTACH DATABASE ? AS src", (str(resolve_db_path(db_path)),))
+        with conn:
+            conn.execute(f"CREATE TABLE {META_TABLE} (step INTEGER, label TEXT, created_at TEXT)")
+            conn.execute(f"CREATE TABLE {META_TABLE}_tables (name TEXT PRIMARY KEY, rows INTEGER)")
+            conn.execute(
+                f"INSERT INTO {META_TABLE} VALUES (?, ?, ?)",
+                (step, label, datetime.now(timezone.utc).isoformat(timespec="seconds")),
+            )
+            for table in tables_after(step):
+                rows = copy_table(conn, "src", table)
+                if rows is not None:
+                    conn.execute(f"INSERT INTO {META_TABLE}_tables VALUES (?, ?)", (table, rows))
+        conn.execute("DETACH DATABASE src")
+    finally:
+        conn.close()
+    partial.replace(target)  # a crash mid-copy never leaves a usable-looking snapshot
+
+    stale = [s for s in available() if s > step]
+    for later in stale:
+        snapshot_path(later).unlink(missing_ok=True)
+
+    size_mb = target.stat().st_size / 1024 / 1024
+    note = f", pruned later snapshot(s) {stale}" if stale else ""
+    print(f"📸 Snapshot after Step {step} → {target.name} ({size_mb:.1f} MB, {time.perf_counter() - started:.2f}s{note})")
+    return target
+
+
+def restore(step: int, db_path: Path) -> list[str]:
+    """Put the snapshot's tables back into db_path; tables absent from it are dropped."""
+    source = snapshot_path(step)
+    if not source.exists():
+        raise FileNotFoundError(f"❌ No snapshot after Step {step}: {source}")
+    conn = connect(db_path)
+    try:
+        conn.execute("ATTACH DATABASE ? AS snap", (str(source),))
+        with conn:
+            # copy_table drops main.<table> first; absent from the snapshot = absent at that step
+            restored = [t for t in tables_after(step) if copy_table(conn, "snap", t) is not None]
+        conn.execute("DETACH DATABASE snap")
+    finally:
+        conn.close()
+    return restored
+
+
+def latest_before(step: int) -> int | None:
+    """Newest snapshot a run starting at `step` can resume from."""
+    earlier = [s for s in available() if s < step]
+    return earlier[-1] if earlier else None
+
+
+def prune(max_age_days: float = MAX_AGE_DAYS) -> list[int]:
+    """Delete snapshots older than max_age_days; returns their step numbers."""
+    cutoff = time.time() - max_age_days * 86400
+    removed = []
+    for step, path in available().items():
+        if path.stat().st_mtime < cutoff:
+            path.unlink(missing_ok=True)
+            removed.append(step)
+    if removed:
+        print(f"🧹 Pruned snapshots older than {max_age_days:g} days: after Step(s) {removed}")
+    return removed
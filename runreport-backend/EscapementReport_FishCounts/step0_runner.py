@@ -7,16 +7,37 @@ Behavior:
     1) Run Step 1 to discover new PDF URLs.
     2) If no new PDFs are found, stop.
     3) If new PDFs are found, run Steps 2–49 in order.
+
+Steps listed in FRAME_STEPS expose `transform(df) -> df` and are run
+in-process: consecutive frame steps hand the working DataFrame to each
+other in memory, and SQLite is only written at checkpoints. Frames are
+loaded and saved with the declared column types (pipeline_schema.py).
+
+Steps declared in step_cache.STEP_IO are memoized: when a step's input
+tables, its code and lookup_maps.py are unchanged since an earlier run,
+its stored output is restored instead of running it again.
+
+After the steps in SNAPSHOT_STEPS the working tables are snapshotted
+(snapshots.py); `--resume-from N` restores the latest snapshot taken
+before step N and continues from there.
+
+Every run is recorded step by step (wall/CPU time, peak RSS, rows,
+storage I/O, HTTP calls) in pipeline_runs / pipeline_run_steps
+(common/telemetry.py); `--report` shows the slowest steps and the
+change against the previous run.
 """
 
 from pathlib import Path
 import sys
 import runpy
 import argparse
+import importlib
 import re
 import time
 from datetime import datetime, timezone
 
+import pandas as pd
+
 # ------------------------------------------------------------
 # Quick debug controls
 # ------------------------------------------------------------
@@ -26,14 +47,31 @@ FIRST_STEP_NAME = "step2_download_pdfs.py"  # <-- paste START filename here, or
 LAST_STEP_NAME = "step90_export_supabase.py"   # <-- paste END filename here, or leave None
 # Toggle Step 1 discovery: set to False to skip the new-PDF check.
 ENABLE_STEP1_DISCOVERY = True
+# Toggle in-memory hand-off between frame steps (False = run every step as a script).
+ENABLE_FRAME_HANDOFF = True
+# Frame steps after which the working table is written back to SQLite.
+# The frame is also written before any script step and at the end of the run.
+CHECKPOINT_STEPS = {32, 53}
+# Steps after which the working tables are snapshotted for --resume-from (see snapshots.py).
+SNAPSHOT_STEPS = {8, 33, 53, 65, 75}
+# Toggle step memoization (skip steps whose inputs and code are unchanged; see step_cache.py).
+ENABLE_STEP_CACHE = True
 
 # Ensure imports resolve when run from anywhere
 CURRENT_DIR = Path(__file__).resolve().parent
 sys.path.append(str(CURRENT_DIR))
-
+if str(CURRENT_DIR.parent) not in sys.path:
+    sys.path.append(str(CURRENT_DIR.parent))
+
+from common import telemetry
+from common.sqlite_manager import connect
+import pipeline_schema
+import snapshots
+import step_cache
 from step1_available_pdfs import main as step1_discover
 
 SIGNAL_PATH = CURRENT_DIR.parent / ".escapement_new_pdfs"
+DB_PATH = CURRENT_DIR.parent / "0_db" / "local.db"
 
 
 STEP_FILES = [
@@ -42,24 +80,8 @@ STEP_FILES = [
     ("Step 4: Duplicate DB table", "step4_duplicate_db.py"),
     ("Step 5: Rename PDF names in table", "step5_pdf_name_rename.py"),
     ("Step 6: Remove FISE rows", "step6_removeFISE.py"),
-    ("Step 7: Extract date", "step7_date_extract.py"),
-    ("Step 8: Stock presence", "step8_stockpresence.py"),
-    ("Step 9: Stock presence lower", "step9_stockpresence_lower.py"),
-    ("Step 10: Hatchery name", "step10_hatchery_name.py"),
-    ("Step 11: Text line 2", "step11_textline2.py"),
-    ("Step 12: Text line 3", "step12_textline3.py"),
-    ("Step 13: Count data", "step13_count_data.py"),
-    ("Step 14: Text line 4", "step14_textline4.py"),
-    ("Step 15: Text line 5", "step15_textline5.py"),
-    ("Step 16: Text line 6", "step16_textline6.py"),
-    ("Step 17: Stock BO", "step17_StockBO.py"),
-    ("Step 18: Facility", "step18_facility.py"),
-    ("Step 19: Species", "step19_species.py"),
-    ("Step 20: Family", "step20_family.py"),
-    ("Step 21: Date ISO", "step21_date_iso.py"),
-    ("Step 22: Stock", "step22_stock.py"),
-    ("Step 23: Counts", "step23_counts.py"),
-    ("Step 24: Basin", "step24_basin.py"),
+    ("Step 7: Parse lines (date → basin)", "step7_parse_lines.py"),
+    ("Step 8: Merge parsed reports into store", "step8_merge_reports.py"),
     ("Step 25: Delete blank dates", "step25_dateblank_delete.py"),
     ("Step 26: Delete blank hatchery", "step26_hatcheryblank_delete.py"),
     ("Step 27: Column reorg", "step27_columnreorg.py"),
@@ -68,14 +90,7 @@ STEP_FILES = [
     ("Step 30: Row reorder", "step30_row_reorder.py"),
     ("Step 31: Remove same date_iso/Adult_Total (earliest pdf_date)", "step31_date_AT_same_remove.py"),
     ("Step 32: Remove same date_iso keep largest Adult_Total", "step32_datesame_ATdiff_remove.py"),
-    ("Step 33: Iteration 1", "step33_iteration1.py"),
-    ("Step 34: Cleanup 1", "step34_cleanup1.py"),
-    ("Step 35: Iteration 2", "step35_iteration2.py"),
-    ("Step 36: Cleanup 2", "step36_cleanup2.py"),
-    ("Step 37: Iteration 3", "step37_iteration3.py"),
-    ("Step 38: Cleanup 3", "step38_cleanup3.py"),
-    ("Step 39: Iteration 4", "step39_iteration4.py"),
-    ("Step 40: Cleanup 4", "step40_cleanup4.py"),
+    ("Step 33: Iterate segmentation + cleanup until stable", "step33_iterate_cleanup.py"),
     ("Step 50: Manual deletions", "step50_manualdeletions.py"),
     ("Step 51: Iteration F", "step51_iteration_f.py"),
     ("Step 52: Iteration plot", "step52_Iteration_plot.py"),
@@ -90,22 +105,40 @@ STEP_FILES = [
     ("Step 71: basinfamily identifier", "step71_locationmarking.py"),
     ("Step 72: year from date_iso", "step72_year.py"),
     ("Step 73: remove specific basinfamily entries", "step73_remove_basinfamily.py"),
-    ("Step 74: day expansion (Day1..DayN)", "step74_count_days.py"),
-    ("Step 75: basinfamily daily template", "step75_tablegen.py"),
-    ("Step 76: fill basinfamily daily counts", "step76_tablefill.py"),
+    ("Step 74: day expansion inputs (date_iso/day_diff_plot)", "step74_count_days.py"),
+    ("Step 75: basinfamily list + long daily table", "step75_tablegen.py"),
+    ("Step 76: fill long basinfamily daily counts", "step76_tablefill.py"),
     ("Step 77: weekly aggregation", "step77_weekly.py"),
-    ("Step 78: weekly reorg to plot data", "step78_weekly_reorg.py"),
-    ("Step 79: weekly reorg wide", "step79_weekly_reorg2.py"),
-    ("Step 80: river extraction", "step80_river.py"),
-    ("Step 81: species extraction", "step81_species.py"),
-    ("Step 82: Pink correction (10_year)", "step82_Pink_correction.py"),
-    ("Step 85: Snohomish aggregation", "step85_Snohomish.py"),
-    ("Step 86: final reorg + id", "step86_reorg.py"),
-    ("Step 87: wraparound 01-01 rows", "step87_wraparound.py"),
-    ("Step 88: hang current year line", "step88_hangingcurrent.py"),
+    ("Step 78: plot data build (weekly → EscapementReport_PlotData)", "step78_plot_data.py"),
     ("Step 90: export plot data to supabase", "step90_export_supabase.py"),
 ]
 
+# Steps that can run in-process: filename → working table passed to transform(df).
+FRAME_STEPS = {
+    "step27_columnreorg.py": "Escapement_PlotPipeline",
+    "step28_pdf_date.py": "Escapement_PlotPipeline",
+    "step29_duplicates_delete.py": "Escapement_PlotPipeline",
+    "step30_row_reorder.py": "Escapement_PlotPipeline",
+    "step31_date_AT_same_remove.py": "Escapement_PlotPipeline",
+    "step32_datesame_ATdiff_remove.py": "Escapement_PlotPipeline",
+    "step33_iterate_cleanup.py": "Escapement_PlotPipeline",
+    "step50_manualdeletions.py": "Escapement_PlotPipeline",
+    "step51_iteration_f.py": "Escapement_PlotPipeline",
+    "step52_Iteration_plot.py": "Escapement_PlotPipeline",
+    "step53_column_reorg.py": "Escapement_PlotPipeline",
+    "step60_remove_Columbia.py": "Escapement_PlotPipeline",
+    "step61_remove_Snake.py": "Escapement_PlotPipeline",
+    "step62_remove_MC.py": "Escapement_PlotPipeline",
+    "step63_remove_AD0.py": "Escapement_PlotPipeline",
+    "step64_remove_old.py": "Escapement_PlotPipeline",
+    "step65_remove_Speelyai.py": "Escapement_PlotPipeline",
+    "step70_fishperday.py": "Escapement_PlotPipeline",
+    "step71_locationmarking.py": "Escapement_PlotPipeline",
+    "step72_year.py": "Escapement_PlotPipeline",
+    "step73_remove_basinfamily.py": "Escapement_PlotPipeline",
+    "step74_count_days.py": "Escapement_PlotPipeline",
+}
+
 
 def extract_step_number(label: str) -> int:
     match = re.search(r"Step\s+(\d+)", label)
@@ -124,20 +157,168 @@ def resolve_step_name_to_number(name: str) -> int:
     raise ValueError(f"Step name not found: {name}")
 
 
-def run_step(label: str, filename: str):
+def print_cache_hit(label: str, record: dict):
+    ts = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+    print(f"{ts} ⏭️  {label} SKIPPED — inputs and code unchanged, output restored ({step_cache.describe(record)})")
+    print()
+
+
+def row_tables(num: int, filename: str) -> tuple[str | None, str | None]:
+    """(input, output) table whose row counts are recorded for a script step."""
+    io = step_cache.STEP_IO.get(filename)
+    if io:
+        return next(iter(io["inputs"])), io["outputs"][0]
+    if 4 <= num <= 74:
+        return pipeline_schema.TABLE, pipeline_schema.TABLE
+    return None, None
+
+
+def count_rows(table: str | None) -> int | None:
+    if table is None:
+        return None
+    conn = connect(DB_PATH)
+    try:
+        exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone()
+        return conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0] if exists else None
+    finally:
+        conn.close()
+
+
+def run_step(
+    label: str, filename: str, known: dict[str, str] | None = None, rec: telemetry.StepRecord | None = None
+):
     path = CURRENT_DIR / filename
     if not path.exists():
         raise FileNotFoundError(f"Step file missing: {path}")
+    in_table, out_table = row_tables(extract_step_number(label), filename)
+    if rec is not None:
+        rec.rows_in = count_rows(in_table)
+    key = None
+    if known is not None and step_cache.is_cacheable(filename):
+        key = step_cache.script_key(filename, DB_PATH, known)
+        record = step_cache.lookup(filename, key)
+        if record is not None:
+            step_cache.restore_tables(filename, key, DB_PATH, record, known)
+            print_cache_hit(label, record)
+            if rec is not None:
+                rec.status = "cached"
+                rec.rows_out = count_rows(out_table)
+            return
     start_ts = datetime.now(timezone.utc)
     start_perf = time.perf_counter()
     print(f"{start_ts.isoformat().replace('+00:00', 'Z')} ▶ {label} START")
     runpy.run_path(str(path), run_name="__main__")
+    if key is not None:
+        step_cache.store_tables(filename, key, DB_PATH, known)
+    elif known is not None:
+        known.clear()  # undeclared outputs
+    if rec is not None:
+        rec.rows_out = count_rows(out_table)
     elapsed = time.perf_counter() - start_perf
     end_ts = datetime.now(timezone.utc)
     print(f"{end_ts.isoformat().replace('+00:00', 'Z')} ✅ {label} END ({elapsed:.2f}s)")
     print()
 
 
+# ------------------------------------------------------------
+# In-memory frame hand-off
+# ------------------------------------------------------------
+class FrameStore:
+    """Working tables held in memory between consecutive frame steps."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self.frames: dict[str, pd.DataFrame] = {}
+        self.dirty: set[str] = set()
+        self.last_step: int | None = None
+        self.last_checkpoint: int | None = None
+
+    def load(self, table: str) -> pd.DataFrame:
+        if table not in self.frames:
+            conn = connect(self.db_path)
+            try:
+                self.frames[table] = pipeline_schema.load(conn, table)
+            finally:
+                conn.close()
+            print(f"📥 Loaded {len(self.frames[table]):,} rows from {table} into memory")
+        return self.frames[table]
+
+    def store(self, table: str, df: pd.DataFrame, step_num: int):
+        self.frames[table] = df
+        self.dirty.add(table)
+        self.last_step = step_num
+
+    def flush(self, reason: str) -> list[str]:
+        """Write every modified frame back to SQLite; returns the tables written."""
+        if not self.dirty:
+            return []
+        written = sorted(self.dirty)
+        conn = connect(self.db_path)
+        try:
+            with conn:
+                for table in written:
+                    df = self.frames[table]
+                    pipeline_schema.save(df, conn, table)
+                    print(f"💾 Checkpoint ({reason}) → {table}: {len(df):,} rows")
+        finally:
+            conn.close()
+        self.dirty.clear()
+        self.last_checkpoint = self.last_step
+        return written
+
+    def release(self) -> list[str]:
+        """Drop cached frames so the next frame step re-reads SQLite; returns the tables dropped."""
+        released = list(self.frames)
+        self.frames.clear()
+        return released
+
+
+def run_frame_step(
+    label: str,
+    filename: str,
+    table: str,
+    store: FrameStore,
+    step_num: int,
+    known: dict[str, str] | None = None,
+    rec: telemetry.StepRecord | None = None,
+):
+    if rec is None:
+        rec = telemetry.StepRecord(step_num, label)
+    key = None
+    if known is not None and step_cache.is_cacheable(filename):
+        key = step_cache.frame_key(filename, table, lambda: store.load(table), known)
+        record = step_cache.lookup(filename, key)
+        if record is not None:
+            rec.rows_in = len(store.frames[table]) if table in store.frames else None
+            df_out = step_cache.restore_frame(filename, key, table, record, known)
+            store.store(table, df_out, step_num)
+            print_cache_hit(label, record)
+            rec.status, rec.rows_out = "cached", len(df_out)
+            return
+    start_ts = datetime.now(timezone.utc)
+    start_perf = time.perf_counter()
+    print(f"{start_ts.isoformat().replace('+00:00', 'Z')} ▶ {label} START (in-memory)")
+    module = importlib.import_module(Path(filename).stem)
+    transform = getattr(module, "transform", None)
+    if transform is None:
+        raise AttributeError(f"❌ {filename} is registered in FRAME_STEPS but defines no transform(df).")
+    df_in = store.load(table)
+    rec.rows_in = len(df_in)
+    df_out = transform(df_in)
+    if not isinstance(df_out, pd.DataFrame):
+        raise TypeError(f"❌ {filename}.transform() must return a DataFrame, got {type(df_out).__name__}.")
+    store.store(table, df_out, step_num)
+    rec.rows_out = len(df_out)
+    if key is not None:
+        step_cache.store_frame(filename, key, table, df_out, known)
+    elif known is not None:
+        step_cache.forget(known, [table])
+    elapsed = time.perf_counter() - start_perf
+    end_ts = datetime.now(timezone.utc)
+    print(f"{end_ts.isoformat().replace('+00:00', 'Z')} ✅ {label} END ({elapsed:.2f}s, {len(df_out):,} rows)")
+    print()
+
+
 def filter_steps(start: int | None, end: int | None):
     """Return (num, label, filename) filtered to the requested range."""
     filtered = []
@@ -151,18 +332,44 @@ def filter_steps(start: int | None, end: int | None):
     return filtered
 
 
-def run_pipeline(start: int | None = None, end: int | None = None, skip_discovery: bool = False, force_run: bool = False):
+def run_pipeline(
+    start: int | None = None,
+    end: int | None = None,
+    skip_discovery: bool = False,
+    force_run: bool = False,
+    use_frames: bool | None = None,
+    checkpoints: set[int] | None = None,
+    use_cache: bool | None = None,
+    resume_from: int | None = None,
+    snapshot_steps: set[int] | None = None,
+):
     print("\n🚀 EscapementReport_FishCounts runner starting...\n")
 
     min_step = min(extract_step_number(label) for label, _ in STEP_FILES)
     max_step = max(extract_step_number(label) for label, _ in STEP_FILES)
 
     # Override start/end with filename-based controls if provided.
-    if FIRST_STEP_NAME:
+    if FIRST_STEP_NAME and resume_from is None:
         start = resolve_step_name_to_number(FIRST_STEP_NAME)
     if LAST_STEP_NAME:
         end = resolve_step_name_to_number(LAST_STEP_NAME)
 
+    snapshots.prune()
+    if resume_from is not None:
+        base = snapshots.latest_before(resume_from)
+        if base is None:
+            have = ", ".join(f"after Step {s}" for s in snapshots.available()) or "none"
+            raise ValueError(f"❌ No snapshot taken before Step {resume_from} (available: {have}).")
+        restored = snapshots.restore(base, DB_PATH)
+        later = [num for num, _, _ in filter_steps(base + 1, None)]
+        if not later:
+            raise ValueError(f"❌ Nothing to resume — Step {base} is the last step.")
+        start = later[0]
+        skip_discovery = True
+        note = "" if start == resume_from else f" (latest snapshot before Step {resume_from})"
+        print(f"⏪ Restored {len(restored)} table(s) from the snapshot {snapshots.describe(base)}{note}")
+        print(f"   Resuming at Step {start}.\n")
+
     start = start or min_step
     end = end or max_step
 
@@ -172,13 +379,20 @@ def run_pipeline(start: int | None = None, end: int | None = None, skip_discover
     if start < min_step or end > max_step:
         raise ValueError(f"Step range must be between {min_step} and {max_step}. Requested: {start}–{end}.")
 
+    recorder = telemetry.RunRecorder("escapement", DB_PATH)
     urls_to_process = None
     discovery_enabled = ENABLE_STEP1_DISCOVERY and not skip_discovery
     if discovery_enabled:
         start_ts = datetime.now(timezone.utc)
         start_perf = time.perf_counter()
         print(f"{start_ts.isoformat().replace('+00:00', 'Z')} ▶ Step 1: Discovering escapement PDF URLs START")
-        urls_to_process = step1_discover()  # Returns list of URLs with processed=0
+        try:
+            with recorder.step(1, "Step 1: Discovering escapement PDF URLs") as rec:
+                urls_to_process = step1_discover()  # Returns list of URLs with processed=0
+                rec.rows_out = len(urls_to_process)
+        except Exception:
+            recorder.finish("failed")
+            raise
         elapsed = time.perf_counter() - start_perf
         end_ts = datetime.now(timezone.utc)
         print(f"{end_ts.isoformat().replace('+00:00', 'Z')} ✅ Step 1: Discovering escapement PDF URLs END ({elapsed:.2f}s)")
@@ -186,6 +400,7 @@ def run_pipeline(start: int | None = None, end: int | None = None, skip_discover
 
         if not urls_to_process and not force_run:
             print(f"✔ No new PDFs found — skipping Steps {start}–{end}.\n")
+            recorder.finish("skipped")
             return
     else:
         SIGNAL_PATH.write_text("unknown")
@@ -198,9 +413,57 @@ def run_pipeline(start: int | None = None, end: int | None = None, skip_discover
     else:
         print(f"🛠️  Debug run — running Steps {start}–{end} without discovery.\n")
 
-    for _, label, filename in selected_steps:
-        run_step(label, filename)
-
+    if use_frames is None:
+        use_frames = ENABLE_FRAME_HANDOFF
+    checkpoints = CHECKPOINT_STEPS | (checkpoints or set())
+    snapshot_steps = SNAPSHOT_STEPS | (snapshot_steps or set())
+    store = FrameStore(DB_PATH) if use_frames else None
+    if use_cache is None:
+        use_cache = ENABLE_STEP_CACHE
+    # Input digests for step_cache, kept while the tables are unchanged (None = cache off).
+    known = {} if use_cache else None
+
+    def flush(reason: str):
+        written = store.flush(reason)
+        if known is not None:
+            step_cache.forget(known, written, "sqlite")
+
+    try:
+        for num, label, filename in selected_steps:
+            table = FRAME_STEPS.get(filename) if store is not None else None
+            if table:
+                with recorder.step(num, label) as rec:
+                    run_frame_step(label, filename, table, store, num, known, rec)
+                    if num in checkpoints or num in snapshot_steps:
+                        flush(f"after Step {num}")
+                    if num in snapshot_steps:
+                        snapshots.take(num, label, DB_PATH)
+                continue
+
+            if store is not None:
+                # Script steps read/write SQLite directly.
+                flush(f"before Step {num}")
+                released = store.release()
+                if known is not None:
+                    step_cache.forget(known, released, "frame")
+            with recorder.step(num, label) as rec:
+                run_step(label, filename, known, rec)
+                if store is not None:
+                    store.last_checkpoint = num
+                if num in snapshot_steps:
+                    snapshots.take(num, label, DB_PATH)
+
+        if store is not None:
+            flush("end of run")
+    except Exception:
+        if store is not None and store.dirty:
+            # A failing transform may have mutated the frame in place, so it is not saved.
+            saved = f"Step {store.last_checkpoint}" if store.last_checkpoint else "the previous run"
+            print(f"⚠️ Unsaved in-memory work discarded — SQLite holds the output of {saved}.")
+        recorder.finish("failed")
+        raise
+
+    recorder.finish("ok")
     print("\n🏁 Escapement pipeline finished.\n")
 
 
@@ -210,9 +473,53 @@ def parse_args():
     parser.add_argument("--end", type=int, help="Last step number to run (default: latest available).")
     parser.add_argument("--skip-discovery", action="store_true", help="Skip Step 1 URL discovery.")
     parser.add_argument("--force-run", action="store_true", help="Run requested steps even if no new PDFs are found.")
+    parser.add_argument("--no-frames", action="store_true", help="Run every step as a script (no in-memory hand-off).")
+    parser.add_argument(
+        "--checkpoint",
+        type=int,
+        action="append",
+        default=[],
+        help="Extra step number after which the in-memory frame is written to SQLite (repeatable).",
+    )
+    parser.add_argument(
+        "--resume-from",
+        type=int,
+        metavar="N",
+        help="Restore the latest snapshot taken before step N and run from there (skips discovery).",
+    )
+    parser.add_argument(
+        "--snapshot",
+        type=int,
+        action="append",
+        default=[],
+        help="Extra step number after which the working tables are snapshotted (repeatable).",
+    )
+    parser.add_argument("--list-snapshots", action="store_true", help="List the stored snapshots and exit.")
+    parser.add_argument("--report", action="store_true", help="Show the slowest steps of the last run vs the run before and exit.")
+    parser.add_argument("--no-cache", action="store_true", help="Run every step even if its inputs and code are unchanged.")
+    parser.add_argument("--clear-cache", action="store_true", help="Delete all stored step outputs before running.")
     return parser.parse_args()
 
 
 if __name__ == "__main__":
     args = parse_args()
-    run_pipeline(start=args.start, end=args.end, skip_discovery=args.skip_discovery, force_run=args.force_run)
+    if args.report:
+        sys.exit(telemetry.report("escapement", db_path=DB_PATH))
+    if args.list_snapshots:
+        for step in snapshots.available():
+            print(f"📸 {snapshots.describe(step)}")
+        sys.exit(0)
+    if args.clear_cache:
+        step_cache.clear()
+        print(f"🧹 Cleared step cache → {step_cache.CACHE_DIR}")
+    run_pipeline(
+        start=args.start,
+        end=args.end,
+        skip_discovery=args.skip_discovery,
+        force_run=args.force_run,
+        use_frames=False if args.no_frames else None,
+        checkpoints=set(args.checkpoint),
+        use_cache=False if args.no_cache else None,
+        resume_from=args.resume_from,
+        snapshot_steps=set(args.snapshot),
+    )
@@ -9,8 +9,15 @@ Equivalent logic to CSV script:
 """
 
 import sqlite3
+import sys
 from pathlib import Path
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
+
 # ------------------------------------------------------------
 # Paths
 # ------------------------------------------------------------
@@ -26,9 +33,8 @@ print(f"🗄️ Using DB → {DB_PATH}")
 # DB Helpers
 # ------------------------------------------------------------
 def get_conn():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """One unit of work: commits on success and always closes."""
+    return connection(DB_PATH, row_factory=sqlite3.Row)
 
 # ------------------------------------------------------------
 # Ensure column exists
@@ -8,13 +8,25 @@ This version does NOT create Escapement_Final.
 """
 
 import sqlite3
+import sys
 from pathlib import Path
 import pandas as pd
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
+
+CURRENT_DIR = Path(__file__).resolve().parent
+if str(CURRENT_DIR) not in sys.path:
+    sys.path.append(str(CURRENT_DIR))
+
+import pipeline_schema
+
 # ------------------------------------------------------------
 # Paths
 # ------------------------------------------------------------
-CURRENT_DIR = Path(__file__).resolve().parent
 BACKEND_ROOT = CURRENT_DIR.parent
 DB_DIR = BACKEND_ROOT / "0_db"
 DB_PATH = DB_DIR / "local.db"
@@ -26,20 +38,13 @@ print(f"🗄️ Using DB → {DB_PATH}")
 # DB Helper
 # ------------------------------------------------------------
 def get_conn():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """One unit of work: commits on success and always closes."""
+    return connection(DB_PATH, row_factory=sqlite3.Row)
 
 # ------------------------------------------------------------
-# Main
+# Transform
 # ------------------------------------------------------------
-def main():
-    # Load data
-    with get_conn() as conn:
-        df = pd.read_sql_query("SELECT * FROM Escapement_PlotPipeline;", conn)
-
-    print(f"✅ Loaded {len(df):,} rows from Escapement_PlotPipeline")
-
+def transform(df: pd.DataFrame) -> pd.DataFrame:
     ordered_columns = [
         "index",
         "pdf_name",
@@ -68,20 +73,6 @@ def main():
         "Biological_Year_Length",
     ]
 
-    # Normalize any space-delimited names back to underscore schema
-    rename_map = {
-        "Adult Total": "Adult_Total",
-        "Jack Total": "Jack_Total",
-        "Total Eggtake": "Total_Eggtake",
-        "On Hand Adults": "On_Hand_Adults",
-        "On Hand Jacks": "On_Hand_Jacks",
-        "Lethal Spawned": "Lethal_Spawned",
-        "Live Spawned": "Live_Spawned",
-        "Live Shipped": "Live_Shipped",
-    }
-
-    df = df.rename(columns=rename_map)
-
     drop_columns = [
         "id",
         "report_id",
@@ -106,9 +97,23 @@ def main():
     df_final = df[existing_cols]
 
     print(f"📊 Final cleaned dataset shape: {df_final.shape[0]:,} rows × {df_final.shape[1]} columns")
+    return df_final
+
+
+# ------------------------------------------------------------
+# Main
+# ------------------------------------------------------------
+def main():
+    # Load data (typed, legacy count names renamed — pipeline_schema.py)
+    with get_conn() as conn:
+        df = pipeline_schema.load(conn)
+
+    print(f"✅ Loaded {len(df):,} rows from Escapement_PlotPipeline")
+
+    df_final = transform(df)
 
     with get_conn() as conn:
-        df_final.to_sql("Escapement_PlotPipeline", conn, if_exists="replace", index=False)
+        pipeline_schema.save(df_final, conn)
 
     print("💾 Updated table → Escapement_PlotPipeline (in place)")
     print("✅ Step 27 complete — table cleaned and reorganized.")
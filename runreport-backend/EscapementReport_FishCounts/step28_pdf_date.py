@@ -5,17 +5,29 @@ Extract pdf_date (ISO format) from pdf_name.
 
 Example:
     pdf_name = "WA_EscapementReport_01-02-2014.pdf"
-    pdf_date = "2014-01-02"
+    pdf_date = 2014-01-02 (DATE, see pipeline_schema.py)
 
 Updates table: Escapement_PlotPipeline
 Adds/overwrites column: pdf_date
 """
 
-import sqlite3
+import sys
 import pandas as pd
 import re
 from pathlib import Path
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
+
+CURRENT_DIR = Path(__file__).resolve().parent
+if str(CURRENT_DIR) not in sys.path:
+    sys.path.append(str(CURRENT_DIR))
+
+import pipeline_schema
+
 print("🏗️ Step 28: Extracting pdf_date (ISO) from pdf_name...")
 
 # ------------------------------------------------------------
@@ -23,7 +35,6 @@ print("🏗️ Step 28: Extracting pdf_date (ISO) from pdf_name...")
 # ------------------------------------------------------------
 # File location:
 #   runreport-backend/EscapementReport_FishCounts/step28_pdf_date.py
-CURRENT_DIR = Path(__file__).resolve().parent
 BACKEND_ROOT = CURRENT_DIR.parent              # runreport-backend/
 DB_DIR = BACKEND_ROOT / "0_db"
 DB_PATH = DB_DIR / "local.db"
@@ -43,23 +54,27 @@ def extract_pdf_date(pdf_name):
     mm, dd, yyyy = match.groups()
     return f"{yyyy}-{mm}-{dd}"
 
+def transform(df: pd.DataFrame) -> pd.DataFrame:
+    df["pdf_date"] = pd.to_datetime(df["pdf_name"].apply(extract_pdf_date), errors="coerce", format="%Y-%m-%d")
+
+    nonblank = df["pdf_date"].notna().sum()
+    print(f"✅ pdf_date extraction complete")
+    print(f"📊 {nonblank} of {len(df):,} rows populated with valid pdf_date values")
+    print("🎯 Example format: 2014-01-02")
+    return df
+
+
 def main():
-    conn = sqlite3.connect(DB_PATH)
-    df = pd.read_sql_query("SELECT * FROM Escapement_PlotPipeline", conn)
+    with connection(DB_PATH) as conn:
+        df = pipeline_schema.load(conn)
 
     print(f"✅ Loaded {len(df):,} rows from Escapement_PlotPipeline")
 
-    df["pdf_date"] = df["pdf_name"].apply(extract_pdf_date)
-    parsed_dates = pd.to_datetime(df["pdf_date"], errors="coerce").dt.date
-    df["pdf_date"] = parsed_dates.astype(str).where(parsed_dates.notna(), "")
+    df = transform(df)
 
-    df.to_sql("Escapement_PlotPipeline", conn, if_exists="replace", index=False)
-    conn.close()
+    with connection(DB_PATH) as conn:
+        pipeline_schema.save(df, conn)
 
-    nonblank = df["pdf_date"].astype(str).str.strip().ne("").sum()
-    print(f"✅ pdf_date extraction complete")
-    print(f"📊 {nonblank} of {len(df):,} rows populated with valid pdf_date values")
-    print("🎯 Example format: 2014-01-02")
     print("🔄 Escapement_PlotPipeline updated in local.db")
 
 
@@ -9,118 +9,152 @@ Rules:
     • If date_iso within 365 days → keep earliest
     • If > 365 days apart → keep both
 
-IMPORTANT:
-    • date_iso is canonical (YYYY-MM-DD string)
-    • date_dt is a temporary working column only
+The 365-day rule is measured from the last KEPT row of each group.
+keep_mask() applies it with a sorted sweep over NumPy arrays:
+
+    • rows more than 365 days after the previous row start a new
+      chain and are always kept (the last kept row is at or before
+      the previous row)
+    • a chain spanning ≤ 365 days keeps only its first row
+    • only chains spanning > 365 days (rows every few months for
+      years on end) are walked, jumping from kept row to kept row
+      with searchsorted
+
+bench_duplicates.py checks it against the old per-row loop.
+
+date_iso and the count columns arrive typed (pipeline_schema.py);
+blank counts are set to 0 here so they match as part of the key.
 """
 
-import sqlite3
+import sys
+import numpy as np
 import pandas as pd
 from pathlib import Path
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
+
+CURRENT_DIR = Path(__file__).resolve().parent
+if str(CURRENT_DIR) not in sys.path:
+    sys.path.append(str(CURRENT_DIR))
+
+import pipeline_schema
+
 print("🏗️ Step 29: Collapsing duplicate biological count events (DB)...")
 
 # ------------------------------------------------------------
 # Paths
 # ------------------------------------------------------------
-CURRENT_DIR = Path(__file__).resolve().parent
 BACKEND_ROOT = CURRENT_DIR.parent
 DB_PATH = BACKEND_ROOT / "0_db" / "local.db"
 
 print(f"🗄️ Using DB → {DB_PATH}")
 
-# ------------------------------------------------------------
-# Load table
-# ------------------------------------------------------------
-with sqlite3.connect(DB_PATH) as conn:
-    df = pd.read_sql_query("SELECT * FROM Escapement_PlotPipeline;", conn)
+COUNT_COLS = pipeline_schema.COUNT_COLS
+
+KEY_COLS = ["facility", "species", "Stock_BO"] + COUNT_COLS
+
+WINDOW_DAYS = 365
 
-initial_count = len(df)
-print(f"📥 Loaded {initial_count:,} rows")
 
 # ------------------------------------------------------------
-# Canonical date handling (Option A)
+# 365-day sweep
 # ------------------------------------------------------------
+def keep_mask(group_ids: np.ndarray, dates: np.ndarray, window_days: int = WINDOW_DAYS) -> np.ndarray:
+    """
+    Rows to keep, for rows sorted by group then date (NaT last).
 
-# Ensure date_iso is string-only YYYY-MM-DD
-df["date_iso"] = df["date_iso"].astype(str).str.slice(0, 10)
+    A row is kept if it is the first dated row of its group or falls
+    more than window_days after the group's last kept row. Rows
+    without a date are always kept and do not move the last kept date.
+    """
+    keep = np.isnat(dates)
+    valid = np.flatnonzero(~keep)
+    if len(valid) == 0:
+        return keep
 
-# Temporary working datetime column
-df["date_dt"] = pd.to_datetime(df["date_iso"], errors="coerce")
+    gid = group_ids[valid]
+    day = dates[valid].astype("datetime64[D]").astype(np.int64)
 
-# ------------------------------------------------------------
-# Normalize count columns
-# ------------------------------------------------------------
-COUNT_COLS = [
-    "Adult_Total", "Jack_Total", "Total_Eggtake",
-    "On_Hand_Adults", "On_Hand_Jacks",
-    "Lethal_Spawned", "Live_Spawned", "Released",
-    "Live_Shipped", "Mortality", "Surplus"
-]
+    # Chains: runs of rows with no gap > window_days inside a group
+    starts = np.ones(len(valid), dtype=bool)
+    starts[1:] = (gid[1:] != gid[:-1]) | (np.diff(day) > window_days)
+    start_pos = np.flatnonzero(starts)
+    end_pos = np.append(start_pos[1:], len(valid))
 
-for c in COUNT_COLS:
-    if c in df.columns:
-        df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0)
+    kept = starts.copy()
 
-KEY_COLS = ["facility", "species", "Stock_BO"] + COUNT_COLS
+    # Chains longer than the window: jump from kept row to kept row
+    long_chain = day[end_pos - 1] - day[start_pos] > window_days
+    for s, e in zip(start_pos[long_chain], end_pos[long_chain]):
+        i = s
+        while True:
+            i = s + np.searchsorted(day[s:e], day[i] + window_days, side="right")
+            if i >= e:
+                break
+            kept[i] = True
 
-# ------------------------------------------------------------
-# Deterministic ordering
-# ------------------------------------------------------------
-df = (
-    df.sort_values(KEY_COLS + ["date_dt"], kind="mergesort")
-      .reset_index(drop=True)
-)
+    keep[valid[kept]] = True
+    return keep
 
-# ------------------------------------------------------------
-# Collapse duplicate events (365-day rule)
-# ------------------------------------------------------------
-keep_mask = [False] * len(df)
 
-for _, g in df.groupby(KEY_COLS, dropna=False):
-    last_kept_date = None
 
-    for idx in g.index:
-        curr_date = df.loc[idx, "date_dt"]
+def transform(df: pd.DataFrame) -> pd.DataFrame:
+    initial_count = len(df)
 
-        if pd.isna(curr_date):
-            # Defensive: keep rows with invalid dates
-            keep_mask[idx] = True
-            continue
+    # ------------------------------------------------------------
+    # Blank counts → 0 (counts are INTEGER from here on)
+    # ------------------------------------------------------------
+    counts = [c for c in COUNT_COLS if c in df.columns]
+    df[counts] = df[counts].fillna(0).astype("int64")
 
-        if last_kept_date is None:
-            keep_mask[idx] = True
-            last_kept_date = curr_date
-        else:
-            if (curr_date - last_kept_date).days > 365:
-                keep_mask[idx] = True
-                last_kept_date = curr_date
+    # ------------------------------------------------------------
+    # Deterministic ordering
+    # ------------------------------------------------------------
+    df = (
+        df.sort_values(KEY_COLS + ["date_iso"], kind="mergesort")
+          .reset_index(drop=True)
+    )
 
-df_final = df[keep_mask].reset_index(drop=True)
+    # ------------------------------------------------------------
+    # Collapse duplicate events (365-day rule)
+    # ------------------------------------------------------------
+    group_ids = df.groupby(KEY_COLS, dropna=False, sort=False, observed=True).ngroup().to_numpy()
+    keep = keep_mask(group_ids, df["date_iso"].to_numpy())
 
-removed = initial_count - len(df_final)
+    df_final = df[keep].reset_index(drop=True)
 
-print(f"🧹 Removed {removed:,} duplicate event rows")
-print(f"📊 Final row count: {len(df_final):,}")
+    removed = initial_count - len(df_final)
 
-# ------------------------------------------------------------
-# Cleanup working columns before persistence
-# ------------------------------------------------------------
-df_final = df_final.drop(columns=["date_dt"])
+    print(f"🧹 Removed {removed:,} duplicate event rows")
+    print(f"📊 Final row count: {len(df_final):,}")
 
-# Enforce canonical string date again (belt & suspenders)
-df_final["date_iso"] = df_final["date_iso"].astype(str).str.slice(0, 10)
+    return df_final
+
+
+def main():
+    # ------------------------------------------------------------
+    # Load table
+    # ------------------------------------------------------------
+    with connection(DB_PATH) as conn:
+        df = pipeline_schema.load(conn)
+
+    print(f"📥 Loaded {len(df):,} rows")
+
+    df_final = transform(df)
+
+    # ------------------------------------------------------------
+    # Write back to DB
+    # ------------------------------------------------------------
+    with connection(DB_PATH) as conn:
+        pipeline_schema.save(df_final, conn)
+
+    print("💾 Updated Escapement_PlotPipeline in place")
+    print("✅ Step 29 complete!")
 
-# ------------------------------------------------------------
-# Write back to DB
-# ------------------------------------------------------------
-with sqlite3.connect(DB_PATH) as conn:
-    df_final.to_sql(
-        "Escapement_PlotPipeline",
-        conn,
-        if_exists="replace",
-        index=False
-    )
 
-print("💾 Updated Escapement_PlotPipeline in place")
-print("✅ Step 28 complete!")
+if __name__ == "__main__":
+    main()
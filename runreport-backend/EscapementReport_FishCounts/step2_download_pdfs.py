@@ -7,13 +7,32 @@ and store them temporarily.
 Updates:
     • Writes SHA256 hash into EscapementReports.hash (Supabase)
     • Leaves processed = 0 (parsing happens in Step 3)
+
+Downloads:
+    • MAX_WORKERS PDFs at a time over one pooled requests.Session
+    • Streamed to temp_pdfs/<name>.part while hashing, then renamed
+    • Connection errors / 429 / 5xx are retried with exponential backoff
+    • If a PDF is still in temp_pdfs from an earlier run, the request
+      carries its ETag / Last-Modified (If-None-Match /
+      If-Modified-Since) and a 304 keeps the local copy
+    • All hashes go to Supabase in one batched upsert at the end
+
+`download_all()` only needs URLs, so it can be pointed at a local
+HTTP server for testing: `python bench_download.py --selftest`.
 """
 
 import hashlib
-import requests
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
 from pathlib import Path
 import sys
 
+import requests
+from requests.adapters import HTTPAdapter
+
 # ------------------------------------------------------------
 # Resolve backend paths
 # ------------------------------------------------------------
@@ -24,12 +43,28 @@ CURRENT_DIR = Path(__file__).resolve().parent
 BACKEND_ROOT = CURRENT_DIR.parent          # runreport-backend/
 sys.path.append(str(BACKEND_ROOT))
 
+from common.sqlite_manager import connect
+
 # Temp folder NEXT TO this script:
 TMP_DIR = CURRENT_DIR / "temp_pdfs"
 TMP_DIR.mkdir(exist_ok=True)
 
+DB_PATH = BACKEND_ROOT / "0_db" / "local.db"
+VALIDATOR_TABLE = "Escapement_DownloadValidators"
+
 print(f"📁 temp_pdfs folder: {TMP_DIR}")
 
+# ------------------------------------------------------------
+# Download settings
+# ------------------------------------------------------------
+MAX_WORKERS = int(os.environ.get("ESCAPEMENT_DOWNLOAD_WORKERS", 6))
+TIMEOUT = (10, 30)            # (connect, read) seconds
+MAX_ATTEMPTS = 4
+BACKOFF_SECONDS = 1.0         # 1s, 2s, 4s between attempts
+CHUNK_BYTES = 64 * 1024
+RETRY_STATUS = {429, 500, 502, 503, 504}
+UPSERT_BATCH = 500
+
 # ------------------------------------------------------------
 # Supabase helpers
 # ------------------------------------------------------------
@@ -80,39 +115,179 @@ def get_urls_to_download(client) -> list[str]:
     return [row["report_url"] for row in rows if row.get("report_url")]
 
 
-def update_hash(client, url: str, hash_value: str) -> None:
-    """Store the file hash in EscapementReports."""
-    response = (
-        client.table("EscapementReports")
-        .update({"hash": hash_value})
-        .eq("report_url", url)
-        .execute()
-    )
-    if getattr(response, "error", None):
-        raise RuntimeError(f"Supabase update failed: {response.error}")
+def update_hashes(client, hashes: dict[str, str]) -> None:
+    """Store file hashes in EscapementReports (batched upsert on report_url)."""
+    payload = [{"report_url": url, "hash": value} for url, value in hashes.items()]
+
+    for i in range(0, len(payload), UPSERT_BATCH):
+        response = (
+            client.table("EscapementReports")
+            .upsert(
+                payload[i:i + UPSERT_BATCH],
+                on_conflict="report_url",
+                default_to_null=False,
+            )
+            .execute()
+        )
+        if getattr(response, "error", None):
+            raise RuntimeError(f"Supabase update failed: {response.error}")
+
+
+# ------------------------------------------------------------
+# Conditional-GET validators (local.db)
+# ------------------------------------------------------------
+
+def ensure_validator_table(conn):
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {VALIDATOR_TABLE} (
+            report_url TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            hash TEXT,
+            saved_at TEXT
+        );
+    """)
+
+
+def load_validators() -> dict[str, dict]:
+    conn = connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    try:
+        ensure_validator_table(conn)
+        conn.commit()
+        return {row["report_url"]: dict(row) for row in conn.execute(f"SELECT * FROM {VALIDATOR_TABLE}")}
+    finally:
+        conn.close()
+
+
+def save_validators(results: list[dict]) -> None:
+    now = datetime.now(timezone.utc).isoformat()
+    conn = connect(DB_PATH)
+    try:
+        with conn:
+            ensure_validator_table(conn)
+            conn.executemany(
+                f"""
+                INSERT OR REPLACE INTO {VALIDATOR_TABLE}
+                    (report_url, etag, last_modified, hash, saved_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                [(r["url"], r["etag"], r["last_modified"], r["hash"], now) for r in results],
+            )
+    finally:
+        conn.close()
 
 
 # ------------------------------------------------------------
 # Utility functions
 # ------------------------------------------------------------
 
-def sha256_bytes(data: bytes) -> str:
-    return hashlib.sha256(data).hexdigest()
+def sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 
+def make_session(workers: int = MAX_WORKERS) -> requests.Session:
+    """One Session for every worker; the pool keeps a connection per worker."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
 
-def download_pdf(url: str) -> tuple[Path, bytes]:
-    """Download a PDF into temp_pdfs and return (filepath, raw_bytes)."""
 
+def download_pdf(session: requests.Session, url: str, validator: dict | None = None) -> dict:
+    """
+    Stream one PDF into temp_pdfs, hashing as it arrives.
+
+    Returns {url, path, hash, etag, last_modified, status} where status
+    is "downloaded" or "not_modified".
+    """
     filename = url.split("/")[-1]
     out_path = TMP_DIR / filename
+    part_path = out_path.with_name(out_path.name + ".part")
 
-    print(f"⬇️  Downloading: {filename}")
-
-    resp = requests.get(url, timeout=20)
-    resp.raise_for_status()
+    headers = {}
+    if validator and out_path.exists():
+        if validator.get("etag"):
+            headers["If-None-Match"] = validator["etag"]
+        if validator.get("last_modified"):
+            headers["If-Modified-Since"] = validator["last_modified"]
 
-    out_path.write_bytes(resp.content)
-    return out_path, resp.content
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            with session.get(url, headers=headers, stream=True, timeout=TIMEOUT) as resp:
+                if resp.status_code == 304:
+                    return {
+                        "url": url,
+                        "path": out_path,
+                        "hash": validator.get("hash") or sha256_file(out_path),
+                        "etag": validator.get("etag"),
+                        "last_modified": validator.get("last_modified"),
+                        "status": "not_modified",
+                    }
+                if resp.status_code in RETRY_STATUS and attempt < MAX_ATTEMPTS:
+                    raise requests.HTTPError(f"{resp.status_code} {resp.reason}", response=resp)
+                resp.raise_for_status()
+
+                digest = hashlib.sha256()
+                with open(part_path, "wb") as fh:
+                    for chunk in resp.iter_content(CHUNK_BYTES):
+                        digest.update(chunk)
+                        fh.write(chunk)
+                os.replace(part_path, out_path)
+
+                return {
+                    "url": url,
+                    "path": out_path,
+                    "hash": digest.hexdigest(),
+                    "etag": resp.headers.get("ETag"),
+                    "last_modified": resp.headers.get("Last-Modified"),
+                    "status": "downloaded",
+                }
+
+        except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+            part_path.unlink(missing_ok=True)
+            status = getattr(getattr(e, "response", None), "status_code", None)
+            retryable = status is None or status in RETRY_STATUS
+            if not retryable or attempt == MAX_ATTEMPTS:
+                raise
+            delay = BACKOFF_SECONDS * 2 ** (attempt - 1)
+            print(f"   ↻ {filename}: {e} — retry {attempt}/{MAX_ATTEMPTS - 1} in {delay:.0f}s")
+            time.sleep(delay)
+
+
+def download_all(urls: list[str], workers: int = MAX_WORKERS, validators: dict[str, dict] | None = None):
+    """
+    Download `urls` on a bounded thread pool.
+    Returns (results, errors): result dicts and {url: exception}.
+    """
+    validators = validators or {}
+    results: list[dict] = []
+    errors: dict[str, Exception] = {}
+
+    with make_session(workers) as session, ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(download_pdf, session, url, validators.get(url)): url
+            for url in urls
+        }
+        for future in as_completed(futures):
+            url = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                errors[url] = e
+                print(f"⚠️ ERROR downloading {url}: {e}")
+                continue
+
+            results.append(result)
+            mark = "✔ Saved" if result["status"] == "downloaded" else "✔ Unchanged (304)"
+            print(f"   {mark}: {result['path'].name}  🔑 {result['hash'][:12]}...")
+
+    return results, errors
 
 
 # ------------------------------------------------------------
@@ -133,20 +308,20 @@ def main():
         print("✔ No PDFs need downloading. Step 2 complete.")
         return
 
-    for url in urls:
-        try:
-            pdf_path, data = download_pdf(url)
-            file_hash = sha256_bytes(data)
+    started = time.perf_counter()
+    results, errors = download_all(urls, validators=load_validators())
+    elapsed = time.perf_counter() - started
 
-            print(f"   ✔ Saved: {pdf_path.name}")
-            print(f"   🔑 Hash: {file_hash[:12]}...")
+    if results:
+        save_validators(results)
+        update_hashes(client, {r["url"]: r["hash"] for r in results})
 
-            update_hash(client, url, file_hash)
-
-        except Exception as e:
-            print(f"⚠️ ERROR downloading {url}: {e}")
-
-    print("\n✅ Step 2 complete — PDFs downloaded & registry updated.")
+    fresh = sum(r["status"] == "downloaded" for r in results)
+    print(
+        f"\n📊 {fresh} downloaded, {len(results) - fresh} unchanged, "
+        f"{len(errors)} failed in {elapsed:.1f}s ({MAX_WORKERS} workers)"
+    )
+    print("✅ Step 2 complete — PDFs downloaded & registry updated.")
 
 
 if __name__ == "__main__":
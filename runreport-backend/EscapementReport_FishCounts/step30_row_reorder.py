@@ -13,36 +13,38 @@ Reorder rows in Escapement_PlotPipeline using the following hierarchy:
 Writes table back to SQLite (local.db) in sorted order.
 """
 
-import sqlite3
+import sys
 import pandas as pd
 from pathlib import Path
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
+
+CURRENT_DIR = Path(__file__).resolve().parent
+if str(CURRENT_DIR) not in sys.path:
+    sys.path.append(str(CURRENT_DIR))
+
+import pipeline_schema
+
 print("🏗️ Step 30: Reordering Escapement_PlotPipeline...")
 
 # ------------------------------------------------------------
 # Paths
 # ------------------------------------------------------------
-CURRENT_DIR = Path(__file__).resolve().parent
 BACKEND_ROOT = CURRENT_DIR.parent              # runreport-backend/
 DB_DIR = BACKEND_ROOT / "0_db"
 DB_PATH = DB_DIR / "local.db"
 
 print(f"🗄️ Using DB: {DB_PATH}")
 
-def main():
-    conn = sqlite3.connect(DB_PATH)
-    df = pd.read_sql_query("SELECT * FROM Escapement_PlotPipeline", conn)
-
-    print(f"✅ Loaded {len(df):,} rows from Escapement_PlotPipeline")
-
+def transform(df: pd.DataFrame) -> pd.DataFrame:
     if "date_iso" not in df.columns:
         raise ValueError("❌ Missing required column 'date_iso'. Run step28_pdf_date.py first.")
 
-    df["date_iso"] = pd.to_datetime(df["date_iso"], errors="coerce")
-
-    if "Adult_Total" in df.columns:
-        df["Adult_Total"] = pd.to_numeric(df["Adult_Total"], errors="coerce").fillna(0)
-    else:
+    if "Adult_Total" not in df.columns:
         print("⚠️ No 'Adult_Total' column found — sorting by adult count will be skipped.")
 
     sort_columns = ["facility", "species", "Stock", "Stock_BO", "date_iso", "Adult_Total"]
@@ -61,12 +63,23 @@ def main():
     for col, asc in zip(existing_sort_columns, existing_ascending):
         print(f"   • {col} ({'ASC' if asc else 'DESC'})")
 
-    df_sorted.to_sql("Escapement_PlotPipeline", conn, if_exists="replace", index=False)
-    conn.close()
-
     print("✅ Reordering complete")
     print(f"📊 Final row count: {len(df_sorted):,}")
     print("🎯 Rows grouped + ordered by facility → species → Stock → Stock_BO → date_iso → Adult_Total (desc)")
+    return df_sorted
+
+
+def main():
+    with connection(DB_PATH) as conn:
+        df = pipeline_schema.load(conn)
+
+    print(f"✅ Loaded {len(df):,} rows from Escapement_PlotPipeline")
+
+    df_sorted = transform(df)
+
+    with connection(DB_PATH) as conn:
+        pipeline_schema.save(df_sorted, conn)
+
     print("🔄 Escapement_PlotPipeline updated in local.db")
 
 
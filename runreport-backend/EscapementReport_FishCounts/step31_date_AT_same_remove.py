@@ -8,26 +8,34 @@ the row with the earliest pdf_date.
 Writes the deduped result back into Escapement_PlotPipeline.
 """
 
-import sqlite3
+import sys
 import pandas as pd
 from pathlib import Path
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
+
+CURRENT_DIR = Path(__file__).resolve().parent
+if str(CURRENT_DIR) not in sys.path:
+    sys.path.append(str(CURRENT_DIR))
+
+import pipeline_schema
+
 print("🏗️ Step 31: Removing same date_iso + Adult_Total duplicates using earliest pdf_date...")
 
 # ------------------------------------------------------------
 # Paths
 # ------------------------------------------------------------
-CURRENT_DIR = Path(__file__).resolve().parent
 BACKEND_ROOT = CURRENT_DIR.parent
 DB_PATH = BACKEND_ROOT / "0_db" / "local.db"
 
 print(f"🗄️ Using DB → {DB_PATH}")
 
 
-def main():
-    with sqlite3.connect(DB_PATH) as conn:
-        df = pd.read_sql_query("SELECT * FROM Escapement_PlotPipeline;", conn)
-
+def transform(df: pd.DataFrame) -> pd.DataFrame:
     if "date_iso" not in df.columns:
         raise ValueError("❌ Missing required column 'date_iso'. Run date normalization first.")
     if "pdf_date" not in df.columns:
@@ -40,14 +48,10 @@ def main():
         if col not in df.columns:
             df[col] = ""
 
-    # Parse dates for ordering (keep originals in place)
-    df["_date_iso_dt"] = pd.to_datetime(df["date_iso"], errors="coerce")
-    df["_pdf_date_dt"] = pd.to_datetime(df["pdf_date"], errors="coerce")
-
     # Stable sort so earliest pdf_date within each key group is first; tie-break by original order
     df["_orig_order"] = range(len(df))
     df_sorted = df.sort_values(
-        by=key_cols + ["_pdf_date_dt", "_orig_order"],
+        by=key_cols + ["pdf_date", "_orig_order"],
         ascending=[True, True, True, True, True, True, True, True],
         na_position="last",
         kind="mergesort",
@@ -57,14 +61,22 @@ def main():
     df_deduped = df_sorted.drop_duplicates(subset=key_cols, keep="first")
 
     # Clean helper columns
-    df_deduped = df_deduped.drop(columns=["_date_iso_dt", "_pdf_date_dt", "_orig_order"])
+    df_deduped = df_deduped.drop(columns=["_orig_order"])
 
     removed = len(df) - len(df_deduped)
     print(f"🧹 Removed {removed:,} duplicate rows based on (facility, species, Stock, Stock_BO, date_iso, Adult_Total) keeping earliest pdf_date.")
     print(f"📊 Final row count: {len(df_deduped):,}")
+    return df_deduped
+
+
+def main():
+    with connection(DB_PATH) as conn:
+        df = pipeline_schema.load(conn)
+
+    df_deduped = transform(df)
 
-    with sqlite3.connect(DB_PATH) as conn:
-        df_deduped.to_sql("Escapement_PlotPipeline", conn, if_exists="replace", index=False)
+    with connection(DB_PATH) as conn:
+        pipeline_schema.save(df_deduped, conn)
 
     print("✅ Step 31 complete — Escapement_PlotPipeline updated.")
 
@@ -0,0 +1,238 @@
+# step33_iterate_cleanup.py
+# ------------------------------------------------------------
+# Step 33: Iterate segmentation + cleanup until stable
+#
+# Replaces the old steps 33–40 (Iteration 1 → Cleanup 4). Those
+# alternated a segmentation pass (segmentation.py) with a cleanup
+# rule four times, each one reloading and rewriting the table.
+#
+# Here the same four rules run in memory, in the same order:
+#
+#   1  drop singleton spillover rows           (x_count == 1)
+#   2  within each biological year, keep the earliest row of
+#      every repeated Adult_Total
+#   3  condense spillover clusters (x_count >= 3) using max/2:
+#      keep all rows ≤ max/2 and only the earliest row above it
+#   4  drop spillover rows (by_short == "X") before the current
+#      year
+#
+# Rules 3 and 4 segment with skip_last_run, as old steps 37/39 did.
+# Every rule is a whole-frame operation (sort + drop_duplicates,
+# run-length cluster ids + groupby-transform); none runs Python code
+# per identity.
+#
+# Each pass re-segments the current rows and applies one rule.
+# The schedule keeps cycling 1 → 4 until a full cycle removes
+# nothing (fixed point) or MAX_PASSES is reached
+# (ESCAPEMENT_SEGMENT_MAX_PASSES). The segmentation columns are
+# dropped from the result — step 51 recomputes its own.
+#
+# Reads + rewrites Escapement_PlotPipeline once.
+# ------------------------------------------------------------
+
+import os
+import sys
+import time
+import pandas as pd
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
+
+CURRENT_DIR = Path(__file__).resolve().parent
+if str(CURRENT_DIR) not in sys.path:
+    sys.path.append(str(CURRENT_DIR))
+
+import pipeline_schema
+from segmentation import GROUP_COLS, column_names, segment
+
+MAX_PASSES = int(os.environ.get("ESCAPEMENT_SEGMENT_MAX_PASSES", 20))
+
+SEGMENT_COLS = list(column_names("").values())
+
+
+# ------------------------------------------------------------
+# Reorder helper
+# ------------------------------------------------------------
+
+def reorder_for_output(df):
+    sort_cols = ["facility", "species", "Stock", "Stock_BO", "date_iso", "Adult_Total"]
+    missing = [c for c in sort_cols if c not in df.columns]
+    if missing:
+        return df
+    return df.sort_values(
+        by=sort_cols,
+        ascending=[True, True, True, True, True, False],
+        na_position="last",
+        kind="mergesort",
+    )
+
+
+print("🏗️ Step 33: Iterating segmentation + cleanup until stable...")
+
+# ------------------------------------------------------------
+# DB PATH
+# ------------------------------------------------------------
+project_root = Path(__file__).resolve().parents[1]
+db_path = project_root / "0_db" / "local.db"
+
+print(f"🗄️ Using DB → {db_path}")
+
+
+# ------------------------------------------------------------
+# Cleanup rules (input: a freshly segmented frame)
+# ------------------------------------------------------------
+
+def drop_singletons(df):
+    """Rule 1: remove rows where x_count == 1."""
+    return reorder_for_output(df[df["x_count"] != 1].reset_index(drop=True))
+
+
+def dedupe_years(df):
+    """
+    Rule 2: within each identity + biological year, keep the earliest
+    row (date_iso, then pdf_date) of every repeated Adult_Total.
+    """
+    keys = GROUP_COLS + ["by_adult"]
+    out = (
+        df.sort_values(keys + ["Adult_Total", "date_iso", "pdf_date"], kind="mergesort", na_position="last")
+          .drop_duplicates(subset=keys + ["Adult_Total"], keep="first")
+          .reset_index(drop=True)
+    )
+    return reorder_for_output(out)
+
+
+def condense_clusters(df):
+    """
+    Rule 3: condense contiguous x_count clusters (x_count >= 3) using
+    max/2 logic — keep every row ≤ max/2 and the earliest row above it.
+    Full rows are selected/dropped — no mutation.
+
+    Clusters are runs of equal x_count within an identity in date
+    order (run-length encoding over x_count).
+    """
+    df = df.sort_values(GROUP_COLS + ["date_iso"], kind="mergesort", na_position="last").reset_index(drop=True)
+
+    gid = df.groupby(GROUP_COLS, sort=False, observed=True).ngroup()
+    x_count = df["x_count"]
+    cluster = (gid.ne(gid.shift()) | x_count.ne(x_count.shift())).cumsum()
+
+    threshold = df.groupby(cluster)["Adult_Total"].transform("max") / 2.0
+    large = (x_count >= 3) & (df["Adult_Total"] > threshold)
+
+    # Earliest large row per cluster (undated rows sort last)
+    dates = df.loc[large, "date_iso"].fillna(pd.Timestamp.max)
+    earliest = dates.groupby(cluster[large]).idxmin()
+
+    keep = ~large
+    keep[earliest.to_numpy()] = True
+    return df[keep].reset_index(drop=True)
+
+
+def drop_prior_spillover(df):
+    """Rule 4: remove by_short == "X" rows, except in the current year."""
+    is_current_year = df["date_iso"].dt.year == datetime.now().year
+    return reorder_for_output(df[is_current_year | (df["by_short"] != "X")].reset_index(drop=True))
+
+
+# (label, segment() options, rule) — applied in this order, cyclically
+PASSES = [
+    ("drop x_count == 1", {}, drop_singletons),
+    ("dedupe Adult_Total per year", {}, dedupe_years),
+    ("condense x_count >= 3 clusters", {"skip_last_run": True}, condense_clusters),
+    ("drop prior-year spillover", {"skip_last_run": True}, drop_prior_spillover),
+]
+
+
+def iterate_to_fixed_point(df, max_passes=MAX_PASSES):
+    """
+    Apply PASSES cyclically until len(PASSES) passes in a row remove
+    nothing, or max_passes have run. Returns (df, passes, converged).
+    """
+    passes = 0
+    quiet = 0
+    while passes < max_passes:
+        label, options, rule = PASSES[passes % len(PASSES)]
+        passes += 1
+
+        started = time.perf_counter()
+        before = len(df)
+        df = rule(segment(df, **options))
+        removed = before - len(df)
+        quiet = quiet + 1 if removed == 0 else 0
+
+        print(
+            f"   Pass {passes:>2} ({label}): −{removed:,} rows → {len(df):,} "
+            f"[{time.perf_counter() - started:.2f}s]"
+        )
+        if quiet == len(PASSES):
+            return df, passes, True
+    return df, passes, False
+
+
+def transform(df: pd.DataFrame) -> pd.DataFrame:
+    # REQUIRED COLUMN CHECK (underscore schema)
+    required_cols = [
+        "facility",
+        "species",
+        "Stock",
+        "Stock_BO",
+        "date_iso",
+        "Adult_Total",
+        "pdf_date",
+    ]
+
+    missing = [c for c in required_cols if c not in df.columns]
+    if missing:
+        raise ValueError(f"❌ Missing required columns: {missing}")
+
+    before = len(df)
+
+    # ============================================================
+    # ITERATE
+    # ============================================================
+    df, passes, converged = iterate_to_fixed_point(df)
+
+    # Segmentation columns are only needed inside the loop
+    df = df.drop(columns=[c for c in SEGMENT_COLS if c in df.columns])
+
+    # ============================================================
+    # ORDER FOR OUTPUT
+    # ============================================================
+
+    df = reorder_for_output(df)
+
+    # ------------------------------------------------------------
+    # SUMMARY
+    # ------------------------------------------------------------
+    if converged:
+        print(f"✅ Stable after {passes} passes (last {len(PASSES)} removed nothing).")
+    else:
+        print(f"⚠️ Still changing after {passes} passes (ESCAPEMENT_SEGMENT_MAX_PASSES) — keeping the last result.")
+    print(f"🧹 Removed {before - len(df):,} rows.")
+    print(f"📊 Rows remaining: {len(df):,}")
+    print("🏁 Escapement biological cleanup successfully updated.")
+    return df
+
+
+def main():
+    # ------------------------------------------------------------
+    # Load DB table
+    # ------------------------------------------------------------
+    with connection(db_path) as conn:
+        df = pipeline_schema.load(conn)
+    print(f"✅ Loaded {len(df):,} rows from Escapement_PlotPipeline")
+
+    df = transform(df)
+
+    print("💾 Writing cleaned rows back to Escapement_PlotPipeline...")
+    with connection(db_path) as conn:
+        pipeline_schema.save(df, conn)
+
+
+if __name__ == "__main__":
+    main()
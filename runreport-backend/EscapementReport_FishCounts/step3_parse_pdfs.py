@@ -12,10 +12,31 @@ EscapementReports
 
 EscapementRawLines
     id, report_id, line_order, pdf_name, page_num, text_line
+
+Text extraction (see pdf_text.py):
+    • Backend chosen with ESCAPEMENT_PDF_BACKEND (pdfplumber | pypdfium2)
+    • PDFs are split into page ranges and extracted on a process pool
+      (ESCAPEMENT_PARSE_WORKERS, default = CPU count); each report's
+      lines are reassembled in page / line_order before upload
+
+Upload (see upload_reports):
+    • Parsed reports feed a bounded queue of line chunks; uploader
+      threads insert them concurrently while parsing continues
+    • processed = 1 is set in batches, only once all of a report's
+      chunks are acknowledged
+
+Duplicates:
+    • A PDF whose hash matches a report already parsed (or parsed
+      earlier in the same run) is not parsed or uploaded; it is marked
+      processed with duplicate_of = that report's id
+      (supabase/escapement_duplicate_of.sql adds the column)
 """
 
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-import pdfplumber
 from datetime import datetime
 import sys
 
@@ -28,8 +49,17 @@ import sys
 CURRENT_DIR = Path(__file__).resolve().parent
 BACKEND_ROOT = CURRENT_DIR.parent                   # runreport-backend/
 sys.path.append(str(BACKEND_ROOT))
+sys.path.append(str(CURRENT_DIR))
+
+import pdf_text
 
 PDF_DIR = CURRENT_DIR / "temp_pdfs"                 # same folder Step 2 uses
+WORKERS = int(os.environ.get("ESCAPEMENT_PARSE_WORKERS", os.cpu_count() or 1))
+
+UPLOAD_WORKERS = int(os.environ.get("ESCAPEMENT_UPLOAD_WORKERS", 4))
+UPLOAD_CHUNK = 1000              # lines per EscapementRawLines insert
+QUEUE_CHUNKS = UPLOAD_WORKERS * 2
+MARK_BATCH = 25                  # reports per processed = 1 update
 
 print(f"📁 Reading PDFs from: {PDF_DIR}")
 
@@ -83,24 +113,60 @@ def get_unprocessed_reports(client):
     return [row for row in rows if row.get("hash")]
 
 
-def mark_processed(client, report_id):
+def get_hash_registry(client) -> dict[str, int]:
+    """
+    SHA-256 → report_id whose lines are in EscapementRawLines.
+    Only reports parsed in their own right (duplicate_of IS NULL) count;
+    the lowest id wins if an older run stored the same file twice.
+    """
+    rows = _fetch_rows(client, "id,hash,duplicate_of", filters={"processed": 1})
+    registry: dict[str, int] = {}
+    for row in sorted(rows, key=lambda r: r["id"]):
+        if row.get("hash") and row.get("duplicate_of") is None:
+            registry.setdefault(row["hash"], row["id"])
+    return registry
+
+
+def mark_duplicates(client, duplicates: dict[int, int]):
+    """
+    Link byte-identical reports to the report that already holds their
+    lines: processed = 1, duplicate_of = canonical id, no lines uploaded.
+    """
+    by_canonical: dict[int, list[int]] = {}
+    for report_id, canonical_id in duplicates.items():
+        by_canonical.setdefault(canonical_id, []).append(report_id)
+
+    now = datetime.utcnow().isoformat()
+    for canonical_id, report_ids in by_canonical.items():
+        response = (
+            client.table("EscapementReports")
+            .update({"processed": 1, "processed_at": now, "duplicate_of": canonical_id})
+            .in_("id", report_ids)
+            .execute()
+        )
+        if getattr(response, "error", None):
+            raise RuntimeError(f"Supabase update failed: {response.error}")
+
+
+def mark_processed(client, report_ids: list[int]):
+    """Flag a batch of fully uploaded reports as processed (one UPDATE)."""
+    if not report_ids:
+        return
     response = (
         client.table("EscapementReports")
         .update({"processed": 1, "processed_at": datetime.utcnow().isoformat()})
-        .eq("id", report_id)
+        .in_("id", report_ids)
         .execute()
     )
     if getattr(response, "error", None):
         raise RuntimeError(f"Supabase update failed: {response.error}")
 
-def insert_lines_bulk(client, lines, chunk_size: int = 1000):
+
+def insert_lines_chunk(client, lines):
     """
     lines = list of (report_id, line_order, pdf_name, page_num, text_line)
-    Append to EscapementRawLines in Supabase.
+    Append one chunk to EscapementRawLines in Supabase.
     """
-    if not lines:
-        return
-
     rows = [
         {
             "report_id": report_id,
@@ -111,49 +177,225 @@ def insert_lines_bulk(client, lines, chunk_size: int = 1000):
         }
         for report_id, line_order, pdf_name, page_num, text_line in lines
     ]
+    response = client.table("EscapementRawLines").insert(
+        rows,
+        default_to_null=False,
+    ).execute()
+    if getattr(response, "error", None):
+        raise RuntimeError(f"Supabase insert failed: {response.error}")
 
-    for i in range(0, len(rows), chunk_size):
-        chunk = rows[i : i + chunk_size]
-        response = client.table("EscapementRawLines").insert(
-            chunk,
-            default_to_null=False,
-        ).execute()
-        if getattr(response, "error", None):
-            raise RuntimeError(f"Supabase insert failed: {response.error}")
+
+def delete_report_lines(client, report_id: int):
+    """Remove a partly uploaded report so a rerun does not duplicate lines."""
+    response = client.table("EscapementRawLines").delete().eq("report_id", report_id).execute()
+    if getattr(response, "error", None):
+        raise RuntimeError(f"Supabase delete failed: {response.error}")
+
+
+# ------------------------------------------------------------
+# Upload pipeline
+# ------------------------------------------------------------
+
+def _uploader(client, work: queue.Queue, acks: queue.Queue):
+    """Worker thread: insert chunks until the None sentinel arrives."""
+    while True:
+        item = work.get()
+        if item is None:
+            return
+        report_id, chunk = item
+        try:
+            insert_lines_chunk(client, chunk)
+            acks.put((report_id, None))
+        except Exception as e:
+            acks.put((report_id, e))
+
+
+def upload_reports(client, parsed) -> dict:
+    """
+    Overlap parsing and uploading.
+
+    `parsed` yields (report, rows, error) as PDFs finish extracting
+    (parse_pdfs). Each report's rows are cut into UPLOAD_CHUNK-line
+    chunks and put on a bounded queue, which UPLOAD_WORKERS threads
+    insert concurrently. A report is marked processed (in batches of
+    MARK_BATCH) only after every one of its chunks is acknowledged;
+    a report with a failed chunk has its lines removed again and
+    stays processed = 0. If anything raises (a failed mark_processed,
+    a broken parse pool, Ctrl-C), every report not yet marked has its
+    lines removed before the error propagates, so a rerun never
+    inserts them twice.
+    """
+    work: queue.Queue = queue.Queue(maxsize=QUEUE_CHUNKS)
+    acks: queue.Queue = queue.Queue()
+    threads = [
+        threading.Thread(target=_uploader, args=(client, work, acks), daemon=True)
+        for _ in range(UPLOAD_WORKERS)
+    ]
+    for t in threads:
+        t.start()
+
+    reports: dict[int, dict] = {}
+    line_counts: dict[int, int] = {}
+    outstanding: dict[int, int] = {}
+    failed: dict[int, Exception] = {}
+    ready: list[int] = []
+    stats = {"processed": 0, "lines": 0, "parse_errors": 0, "upload_errors": 0, "processed_ids": []}
+
+    def flush():
+        if not ready:
+            return
+        batch = list(ready)
+        mark_processed(client, batch)   # on failure the batch stays in `ready` for rollback
+        ready.clear()
+        for report_id in batch:
+            filename = reports[report_id]["report_url"].split("/")[-1]
+            (PDF_DIR / filename).unlink(missing_ok=True)
+            print(f"   ✔ {filename}: {line_counts[report_id]} lines uploaded, marked processed")
+            stats["processed"] += 1
+            stats["processed_ids"].append(report_id)
+            stats["lines"] += line_counts[report_id]
+        print(f"   🗑️ Deleted {len(batch)} local PDF(s)")
+
+    def finish(report_id):
+        del outstanding[report_id]
+        if report_id in failed:
+            filename = reports[report_id]["report_url"].split("/")[-1]
+            print(f"⚠️ ERROR uploading {filename}: {failed[report_id]}")
+            stats["upload_errors"] += 1
+            try:
+                delete_report_lines(client, report_id)
+            except Exception as e:
+                print(f"⚠️ Could not remove partial lines for report {report_id}: {e}")
+            return
+        ready.append(report_id)
+        if len(ready) >= MARK_BATCH:
+            flush()
+
+    def rollback(report_ids: list[int]):
+        if not report_ids:
+            return
+        print(f"🛑 Upload interrupted — removing lines of {len(report_ids)} unmarked report(s)")
+        for report_id in report_ids:
+            try:
+                delete_report_lines(client, report_id)
+            except Exception as e:
+                print(f"⚠️ Could not remove partial lines for report {report_id}: {e}")
+
+    def drain(block: bool):
+        while outstanding:
+            try:
+                report_id, error = acks.get(block=block)
+            except queue.Empty:
+                return
+            if error is not None:
+                failed.setdefault(report_id, error)
+            outstanding[report_id] -= 1
+            if outstanding[report_id] == 0:
+                finish(report_id)
+
+    try:
+        try:
+            for report, rows, error in parsed:
+                report_id = report["id"]
+                filename = report["report_url"].split("/")[-1]
+                if error is not None:
+                    print(f"⚠️ ERROR parsing {filename}: {error}")
+                    stats["parse_errors"] += 1
+                    continue
+
+                print(f"📘 Parsed: {filename} ({len(rows)} lines)")
+                reports[report_id] = report
+                line_counts[report_id] = len(rows)
+                chunks = [rows[i:i + UPLOAD_CHUNK] for i in range(0, len(rows), UPLOAD_CHUNK)]
+                outstanding[report_id] = len(chunks)
+                if not chunks:
+                    finish(report_id)
+                    continue
+
+                for chunk in chunks:
+                    work.put((report_id, chunk))   # blocks while the uploaders catch up
+                    drain(block=False)
+        finally:
+            for _ in threads:
+                work.put(None)
+            for t in threads:
+                t.join()
+
+        drain(block=False)
+        flush()
+    except BaseException:
+        # Uploaders are joined, so nothing else lands after the cleanup.
+        rollback(list(ready) + list(outstanding))
+        raise
+
+    return stats
 
 
 # ------------------------------------------------------------
 # PDF parsing
 # ------------------------------------------------------------
 
-def parse_pdf(client, pdf_path: Path, report_id: int) -> int:
+def parse_pdf(pdf_path: Path, report_id: int) -> list[tuple]:
     """
-    Extract all text lines from a PDF.
-    Returns the number of text lines extracted.
+    Extract all text lines from one PDF (in this process).
+    Returns rows in line_order.
     """
+    return pdf_text.pdf_lines(pdf_text.extract_pages(pdf_path), report_id, pdf_path.name)
 
-    total_lines = 0
-    batch = []  # collect lines before bulk insertion
-    line_order = 0
 
-    with pdfplumber.open(pdf_path) as pdf:
-        for page_num, page in enumerate(pdf.pages, start=1):
-            text = page.extract_text()
-            if not text:
-                continue
+def parse_pdfs(jobs: list[tuple[dict, Path]], workers: int = WORKERS):
+    """
+    Extract many PDFs on a process pool, fanned out by page range.
 
-            lines = text.splitlines()
-            for line in lines:
-                cleaned = line.strip()
-                line_order += 1
-                batch.append((report_id, line_order, pdf_path.name, page_num, cleaned))
-            total_lines += len(lines)
+    Yields (report, rows, error) as each PDF completes; rows are in
+    line_order. Runs in-process when workers <= 1.
+    """
+    if workers <= 1:
+        for report, pdf_path in jobs:
+            try:
+                yield report, parse_pdf(pdf_path, report["id"]), None
+            except Exception as e:
+                yield report, None, e
+        return
 
-    # Bulk insert
-    if batch:
-        insert_lines_bulk(client, batch)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {}
+        remaining: dict[int, int] = {}
+        pages: dict[int, list] = {}
+        failed: dict[int, Exception] = {}
+        by_id = {report["id"]: (report, pdf_path) for report, pdf_path in jobs}
+
+        for report, pdf_path in jobs:
+            try:
+                ranges = pdf_text.page_tasks(pdf_path)
+            except Exception as e:
+                yield report, None, e
+                continue
+            if not ranges:
+                yield report, [], None
+                continue
+            remaining[report["id"]] = len(ranges)
+            pages[report["id"]] = []
+            for first, last in ranges:
+                future = pool.submit(pdf_text.extract_pages, pdf_path, first, last, pdf_text.BACKEND)
+                futures[future] = report["id"]
+
+        for future in as_completed(futures):
+            report_id = futures[future]
+            try:
+                pages[report_id].extend(future.result())
+            except Exception as e:
+                failed.setdefault(report_id, e)
+
+            remaining[report_id] -= 1
+            if remaining[report_id]:
+                continue
 
-    return total_lines
+            report, pdf_path = by_id[report_id]
+            if report_id in failed:
+                yield report, None, failed[report_id]
+            else:
+                yield report, pdf_text.pdf_lines(pages.pop(report_id), report_id, pdf_path.name), None
 
 
 # ------------------------------------------------------------
@@ -174,32 +416,51 @@ def main():
         print("✔ No PDFs to process. Step 3 complete.")
         return
 
+    # Byte-identical PDFs (same SHA-256 from step 2) are parsed once.
+    registry = get_hash_registry(client)
+    first_in_run: dict[str, int] = {}
+    known_dupes: dict[int, int] = {}     # report_id → canonical (already stored)
+    run_dupes: dict[int, int] = {}       # report_id → canonical (parsed this run)
+
+    jobs = []
     for report in reports:
-        report_id = report["id"]
-        pdf_url = report["report_url"]
-        filename = pdf_url.split("/")[-1]
+        filename = report["report_url"].split("/")[-1]
         pdf_path = PDF_DIR / filename
+        file_hash = report["hash"]
+
+        if file_hash in registry:
+            known_dupes[report["id"]] = registry[file_hash]
+            continue
+        if file_hash in first_in_run:
+            run_dupes[report["id"]] = first_in_run[file_hash]
+            continue
 
         if not pdf_path.exists():
             print(f"⚠️ Missing PDF — expected: {filename}")
             continue
-
-        print(f"📘 Parsing: {filename}")
-
-        try:
-            count = parse_pdf(client, pdf_path, report_id)
-            print(f"   ✔ Extracted {count} lines")
-
-            # Mark DB entry as processed
-            mark_processed(client, report_id)
-
-            # Delete parsed PDF
-            pdf_path.unlink(missing_ok=True)
-            print(f"   🗑️ Deleted local copy: {filename}")
-
-        except Exception as e:
-            print(f"⚠️ ERROR parsing {filename}: {e}")
-
+        first_in_run[file_hash] = report["id"]
+        jobs.append((report, pdf_path))
+
+    print(f"🔁 Identical to an already parsed PDF: {len(known_dupes) + len(run_dupes)}")
+    print(f"⚙️ Extracting {len(jobs)} PDFs with {pdf_text.BACKEND} on {WORKERS} worker(s)")
+
+    stats = upload_reports(client, parse_pdfs(jobs))
+
+    # In-run duplicates only count once their canonical copy made it in.
+    done = set(stats["processed_ids"])
+    linked = {**known_dupes, **{rid: cid for rid, cid in run_dupes.items() if cid in done}}
+    if linked:
+        mark_duplicates(client, linked)
+        by_id = {report["id"]: report for report in reports}
+        for report_id in linked:
+            filename = by_id[report_id]["report_url"].split("/")[-1]
+            (PDF_DIR / filename).unlink(missing_ok=True)
+
+    print(
+        f"\n📊 {stats['processed']} PDFs processed ({stats['lines']:,} lines), "
+        f"{len(linked)} linked as duplicates, "
+        f"{stats['parse_errors']} parse errors, {stats['upload_errors']} upload errors"
+    )
     print("\n✅ Step 3 complete — all available PDFs parsed and removed.")
 
 
@@ -5,6 +5,10 @@ Make a full copy of EscapementRawLines into a new table:
 
     Escapement_PlotPipeline
 
+Raw lines come from the local raw-line cache (see raw_cache.py);
+only reports that are missing from it, or whose PDF hash changed,
+are downloaded from Supabase.
+
 We do this because:
     • EscapementRawLines = RAW immutable text lines from PDFs
     • Escapement_PlotPipeline = working copy used for parsing,
@@ -12,6 +16,12 @@ We do this because:
 
 This ensures we NEVER lose raw PDF lines, while downstream
 transformations can freely modify the working table.
+
+Incremental runs (see report_store.py):
+    • Only reports that are new, or whose PDF hash changed, are copied.
+    • Their lines get ids after everything already in the parsed-line
+      store, so step 8 can merge them back in archive order.
+    • The first run (or ESCAPEMENT_FULL_REBUILD=1) copies everything.
 """
 
 import sqlite3
@@ -27,6 +37,11 @@ BACKEND_ROOT = CURRENT_DIR.parent
 DB_DIR = BACKEND_ROOT / "0_db"
 DB_PATH = DB_DIR / "local.db"
 sys.path.append(str(BACKEND_ROOT))
+sys.path.append(str(CURRENT_DIR))
+
+from common.sqlite_manager import connect
+import raw_cache
+import report_store
 
 print(f"🗄️ Using DB: {DB_PATH}")
 
@@ -35,7 +50,8 @@ print(f"🗄️ Using DB: {DB_PATH}")
 # ------------------------------------------------------------
 
 def get_conn():
-    conn = sqlite3.connect(DB_PATH)
+    """The one connection main() passes down; closed by main()."""
+    conn = connect(DB_PATH)
     conn.row_factory = sqlite3.Row
     return conn
 
@@ -61,7 +77,7 @@ def get_supabase():
 # Main duplication logic
 # ------------------------------------------------------------
 
-def ensure_plotpipeline_table(recreate=False):
+def ensure_plotpipeline_table(conn, recreate=False):
     """
     Create the destination table. If recreate=True, drop any existing
     version first so we always start with a clean duplicate target.
@@ -76,85 +92,129 @@ def ensure_plotpipeline_table(recreate=False):
         text_line TEXT
     );
     """
-    with get_conn() as conn:
-        if recreate:
-            print("♻️ Recreating Escapement_PlotPipeline table...")
-            conn.execute("DROP TABLE IF EXISTS Escapement_PlotPipeline;")
-
-        conn.execute(sql)
-        conn.commit()
+    if recreate:
+        print("♻️ Recreating Escapement_PlotPipeline table...")
+        conn.execute("DROP TABLE IF EXISTS Escapement_PlotPipeline;")
 
+    conn.execute(sql)
+    conn.commit()
 
-def _fetch_rawlines_page(client, start: int, page_size: int) -> list[dict]:
-    response = (
-        client.table("EscapementRawLines")
-        .select("id,report_id,line_order,pdf_name,page_num,text_line")
-        .order("report_id")
-        .order("line_order")
-        .order("id")
-        .range(start, start + page_size - 1)
-        .execute()
-    )
-    if getattr(response, "error", None):
-        raise RuntimeError(f"Supabase query failed: {response.error}")
-    return response.data or []
 
+def _fetch_report_hashes(client) -> dict[int, str | None]:
+    """report_id → PDF hash for every processed EscapementReports row."""
+    hashes: dict[int, str | None] = {}
+    page_size = 1000
+    start = 0
 
-def _insert_pipeline_rows(rows: list[dict]) -> None:
-    if not rows:
-        return
-    payload = [
-        (
-            row.get("report_id"),
-            row.get("line_order"),
-            row["pdf_name"],
-            row["page_num"],
-            row["text_line"],
-        )
-        for row in rows
-    ]
-    with get_conn() as conn:
-        conn.executemany(
-            """
-            INSERT INTO Escapement_PlotPipeline
-                (report_id, line_order, pdf_name, page_num, text_line)
-            VALUES (?, ?, ?, ?, ?);
-            """,
-            payload,
+    while True:
+        response = (
+            client.table("EscapementReports")
+            .select("id,hash")
+            .eq("processed", 1)
+            .order("id")
+            .range(start, start + page_size - 1)
+            .execute()
         )
-        conn.commit()
+        if getattr(response, "error", None):
+            raise RuntimeError(f"Supabase query failed: {response.error}")
+        data = response.data or []
+        for row in data:
+            hashes[row["id"]] = row.get("hash")
+        if len(data) < page_size:
+            break
+        start += page_size
+
+    return hashes
+
+
+def copy_raw_to_pipeline(conn):
+    """
+    Clears Escapement_PlotPipeline and copies ALL cached rows
+    of EscapementRawLines.
+    """
+    print("🧽 Clearing Escapement_PlotPipeline table...")
+    conn.execute("DELETE FROM Escapement_PlotPipeline;")
+
+    print("📋 Copying rows from the raw-line cache → Escapement_PlotPipeline...")
+    count = raw_cache.copy_to_table(conn, "Escapement_PlotPipeline")
+    conn.commit()
+
+    print(f"✅ Copy complete — {count:,} rows copied.")
 
 
-def copy_raw_to_pipeline(client):
+def copy_reports_to_pipeline(conn, report_ids: list[int], first_id: int) -> int:
     """
-    Clears Escapement_PlotPipeline and copies ALL rows
-    from EscapementRawLines.
+    Copy cached raw lines for the given reports only, in the same
+    (report_id, line_order, id) order a full copy uses.
     """
+    copied = raw_cache.copy_to_table(
+        conn, "Escapement_PlotPipeline", report_ids=report_ids, first_id=first_id
+    )
+    conn.commit()
+    return copied
+
+
+def sync_cache(conn, client, hashes: dict[int, str | None]):
+    """Download only the reports missing from (or stale in) the raw-line cache."""
+    stats = raw_cache.sync_raw_cache(conn, client, hashes)
+
+    print(f"💾 Raw-line cache: {stats['up_to_date']:,} reports up to date")
+    if stats["downloaded_reports"]:
+        print(
+            f"⬇️ Downloaded {stats['downloaded_lines']:,} lines "
+            f"for {stats['downloaded_reports']:,} new/changed reports"
+        )
+    if stats["removed"]:
+        print(f"🗑️ Dropped {stats['removed']:,} reports no longer in EscapementReports")
+
 
-    with get_conn() as conn:
-        print("🧽 Clearing Escapement_PlotPipeline table...")
-        conn.execute("DELETE FROM Escapement_PlotPipeline;")
+def sync_pipeline(conn, hashes: dict[int, str | None]):
+    """Full copy on the first run, otherwise only new / changed reports."""
+    incremental = report_store.is_incremental(conn)
+    if not incremental:
+        report_store.reset_store(conn)
         conn.commit()
 
-    print("📋 Copying rows from Supabase EscapementRawLines → Escapement_PlotPipeline...")
-    page_size = 1000
-    start = 0
-    total = 0
+    if not incremental:
+        if report_store.FULL_REBUILD:
+            print("♻️ ESCAPEMENT_FULL_REBUILD set — reparsing the full archive")
+        copy_raw_to_pipeline(conn)
+        present = [
+            r[0] for r in conn.execute(
+                "SELECT DISTINCT report_id FROM Escapement_PlotPipeline"
+            ).fetchall()
+        ]
+        report_store.register_pending(conn, {rid: hashes.get(rid) for rid in present})
+        conn.commit()
+        return
 
-    while True:
-        rows = _fetch_rawlines_page(client, start, page_size)
-        if not rows:
-            break
-        _insert_pipeline_rows(rows)
-        total += len(rows)
-        start += page_size
+    stored = report_store.stored_hashes(conn)
+    first_id = report_store.next_line_id(conn)
 
-    with get_conn() as conn:
-        count = conn.execute(
-            "SELECT COUNT(*) AS c FROM Escapement_PlotPipeline;"
-        ).fetchone()["c"]
+    pending = {
+        rid: file_hash
+        for rid, file_hash in hashes.items()
+        if rid not in stored or stored[rid] != file_hash
+    }
+    removed = sorted(set(stored) - set(hashes))
 
-    print(f"✅ Copy complete — {count:,} rows copied.")
+    print(f"📚 Parsed-line store: {len(stored):,} reports")
+    print(f"🆕 Reports to parse (new or changed hash): {len(pending):,}")
+
+    if removed:
+        report_store.forget_reports(conn, removed)
+        conn.commit()
+        print(f"🗑️ Dropped {len(removed):,} reports no longer in EscapementReports")
+
+    if not pending:
+        print("✔ Nothing new to parse — step 8 will rebuild the working table from the store.")
+        return
+
+    copied = copy_reports_to_pipeline(conn, list(pending), first_id)
+    report_store.register_pending(conn, pending)
+    conn.commit()
+
+    print(f"✅ Copied {copied:,} rows for {len(pending):,} reports (ids from {first_id:,}).")
 
 
 # ------------------------------------------------------------
@@ -164,11 +224,18 @@ def copy_raw_to_pipeline(client):
 def main():
     print("🔄 Step 4: Duplicating raw PDF table into working table...")
 
-    ensure_plotpipeline_table(recreate=True)
-    client = get_supabase()
-    if client is None:
-        return
-    copy_raw_to_pipeline(client)
+    conn = get_conn()
+    try:
+        ensure_plotpipeline_table(conn, recreate=True)
+        client = get_supabase()
+        if client is None:
+            return
+
+        hashes = _fetch_report_hashes(client)
+        sync_cache(conn, client, hashes)
+        sync_pipeline(conn, hashes)
+    finally:
+        conn.close()
 
     print("\n🎉 Step 4 complete — working copy is ready for transformations.")
 
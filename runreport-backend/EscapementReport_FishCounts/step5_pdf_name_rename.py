@@ -21,9 +21,16 @@ Patterns matched:
 
 import re
 import sqlite3
+import sys
 from datetime import datetime
 from pathlib import Path
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
+
 # ------------------------------------------------------------
 # Paths
 # ------------------------------------------------------------
@@ -40,9 +47,8 @@ print(f"🗄️ Using DB: {DB_PATH}")
 # ------------------------------------------------------------
 
 def get_conn():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """One unit of work: commits on success and always closes."""
+    return connection(DB_PATH, row_factory=sqlite3.Row)
 
 # ------------------------------------------------------------
 # Regex patterns (copied from your filesystem version)
@@ -6,9 +6,23 @@
 # column contains "Columbia River" (case-insensitive).
 # ------------------------------------------------------------
 
-import sqlite3
+import sys
 from pathlib import Path
 
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
+
+CURRENT_DIR = Path(__file__).resolve().parent
+if str(CURRENT_DIR) not in sys.path:
+    sys.path.append(str(CURRENT_DIR))
+
+import pipeline_schema
+
 print("🧹 Step 60: Removing Columbia River rows from Escapement_PlotPipeline...")
 
 # ------------------------------------------------------------
@@ -18,40 +32,36 @@ project_root = Path(__file__).resolve().parents[1]
 db_path = project_root / "0_db" / "local.db"
 print(f"🗄️ Using DB → {db_path}")
 
-# ------------------------------------------------------------
-# DELETE ROWS VIA SQL
-# ------------------------------------------------------------
-conn = sqlite3.connect(db_path)
-cursor = conn.cursor()
 
-cursor.execute("PRAGMA table_info(Escapement_PlotPipeline);")
-columns = {row[1] for row in cursor.fetchall()}
-if "basin" not in columns:
-    raise ValueError("❌ Missing required column 'basin' in Escapement_PlotPipeline.")
+def transform(df: pd.DataFrame) -> pd.DataFrame:
+    if "basin" not in df.columns:
+        raise ValueError("❌ Missing required column 'basin' in Escapement_PlotPipeline.")
+
+    mask = df["basin"].astype("string").str.lower().str.contains("columbia river", regex=False, na=False)
+    removed = int(mask.sum())
+
+    df_filtered = df.loc[~mask].reset_index(drop=True)
+
+    print(f"🗑️ Rows removed (basin contains 'Columbia River'): {removed:,}")
+    print(f"📊 Remaining rows: {len(df_filtered):,}")
 
-cursor.execute(
-    "CREATE INDEX IF NOT EXISTS idx_plotpipeline_basin "
-    "ON Escapement_PlotPipeline(basin);"
-)
+    print("✅ Step 60 complete — Columbia River rows removed.")
+    return df_filtered
 
-cursor.execute(
-    "SELECT COUNT(*) FROM Escapement_PlotPipeline "
-    "WHERE lower(basin) LIKE '%columbia river%';"
-)
-removed = cursor.fetchone()[0]
 
-cursor.execute(
-    "DELETE FROM Escapement_PlotPipeline "
-    "WHERE lower(basin) LIKE '%columbia river%';"
-)
+def main():
+    # ------------------------------------------------------------
+    # LOAD TABLE
+    # ------------------------------------------------------------
+    with connection(db_path) as conn:
+        df = pipeline_schema.load(conn)
+    print(f"✅ Loaded {len(df):,} rows from Escapement_PlotPipeline")
 
-cursor.execute("SELECT COUNT(*) FROM Escapement_PlotPipeline;")
-remaining = cursor.fetchone()[0]
+    df_filtered = transform(df)
 
-conn.commit()
-conn.close()
+    with connection(db_path) as conn:
+        pipeline_schema.save(df_filtered, conn)
 
-print(f"🗑️ Rows removed (basin contains 'Columbia River'): {removed:,}")
-print(f"📊 Remaining rows: {remaining:,}")
 
-print("✅ Step 60 complete — Columbia River rows removed.")
+if __name__ == "__main__":
+    main()
@@ -9,10 +9,22 @@
 #
 # ------------------------------------------------------------
 
-import sqlite3
+import sys
 import pandas as pd
 from pathlib import Path
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
+
+CURRENT_DIR = Path(__file__).resolve().parent
+if str(CURRENT_DIR) not in sys.path:
+    sys.path.append(str(CURRENT_DIR))
+
+import pipeline_schema
+
 print("🧹 Step 62: Removing Stock 'M' and 'C' rows from Escapement_PlotPipeline...")
 
 # ------------------------------------------------------------
@@ -22,31 +34,39 @@ project_root = Path(__file__).resolve().parents[1]
 db_path = project_root / "0_db" / "local.db"
 print(f"🗄️ Using DB → {db_path}")
 
-# ------------------------------------------------------------
-# LOAD TABLE
-# ------------------------------------------------------------
-conn = sqlite3.connect(db_path)
-df = pd.read_sql_query("SELECT * FROM Escapement_PlotPipeline;", conn)
-print(f"✅ Loaded {len(df):,} rows from Escapement_PlotPipeline")
 
-# ------------------------------------------------------------
-# FILTER OUT M/C STOCK ROWS
-# ------------------------------------------------------------
-if "Stock" not in df.columns:
-    raise ValueError("❌ Missing required column 'Stock' in Escapement_PlotPipeline.")
+def transform(df: pd.DataFrame) -> pd.DataFrame:
+    # ------------------------------------------------------------
+    # FILTER OUT M/C STOCK ROWS
+    # ------------------------------------------------------------
+    if "Stock" not in df.columns:
+        raise ValueError("❌ Missing required column 'Stock' in Escapement_PlotPipeline.")
 
-mask_mc = df["Stock"].isin(["M", "C"])
-removed = int(mask_mc.sum())
+    mask_mc = df["Stock"].isin(["M", "C"])
+    removed = int(mask_mc.sum())
 
-df_filtered = df.loc[~mask_mc].reset_index(drop=True)
+    df_filtered = df.loc[~mask_mc].reset_index(drop=True)
 
-print(f"🗑️ Rows removed (Stock == 'M' or 'C'): {removed:,}")
-print(f"📊 Remaining rows: {len(df_filtered):,}")
+    print(f"🗑️ Rows removed (Stock == 'M' or 'C'): {removed:,}")
+    print(f"📊 Remaining rows: {len(df_filtered):,}")
+
+    print("✅ Step 62 complete — Stock 'M' and 'C' rows removed.")
+    return df_filtered
+
+
+def main():
+    # ------------------------------------------------------------
+    # LOAD TABLE
+    # ------------------------------------------------------------
+    with connection(db_path) as conn:
+        df = pipeline_schema.load(conn)
+    print(f"✅ Loaded {len(df):,} rows from Escapement_PlotPipeline")
+
+    df_filtered = transform(df)
+
+    with connection(db_path) as conn:
+        pipeline_schema.save(df_filtered, conn)
 
-# ------------------------------------------------------------
-# WRITE BACK TO DATABASE
-# ------------------------------------------------------------
-df_filtered.to_sql("Escapement_PlotPipeline", conn, if_exists="replace", index=False)
-conn.close()
 
-print("✅ Step 62 complete — Stock 'M' and 'C' rows removed.")
+if __name__ == "__main__":
+    main()
@@ -6,10 +6,22 @@
 # adult_diff_plot equals zero.
 # ------------------------------------------------------------
 
-import sqlite3
+import sys
 import pandas as pd
 from pathlib import Path
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
+
+CURRENT_DIR = Path(__file__).resolve().parent
+if str(CURRENT_DIR) not in sys.path:
+    sys.path.append(str(CURRENT_DIR))
+
+import pipeline_schema
+
 print("🧹 Step 63: Removing rows with adult_diff_plot == 0...")
 
 # ------------------------------------------------------------
@@ -19,41 +31,48 @@ project_root = Path(__file__).resolve().parents[1]
 db_path = project_root / "0_db" / "local.db"
 print(f"🗄️ Using DB → {db_path}")
 
-# ------------------------------------------------------------
-# LOAD TABLE
-# ------------------------------------------------------------
-conn = sqlite3.connect(db_path)
-df = pd.read_sql_query("SELECT * FROM Escapement_PlotPipeline;", conn)
-print(f"✅ Loaded {len(df):,} rows from Escapement_PlotPipeline")
 
-# ------------------------------------------------------------
-# FILTER OUT ZERO adult_diff_plot ROWS (excluding current year)
-# ------------------------------------------------------------
-if "adult_diff_plot" not in df.columns:
-    raise ValueError("❌ Missing required column 'adult_diff_plot' in Escapement_PlotPipeline.")
-if "date_iso" not in df.columns:
-    raise ValueError("❌ Missing required column 'date_iso' in Escapement_PlotPipeline.")
+def transform(df: pd.DataFrame) -> pd.DataFrame:
+    # ------------------------------------------------------------
+    # FILTER OUT ZERO adult_diff_plot ROWS (excluding current year)
+    # ------------------------------------------------------------
+    if "adult_diff_plot" not in df.columns:
+        raise ValueError("❌ Missing required column 'adult_diff_plot' in Escapement_PlotPipeline.")
+    if "date_iso" not in df.columns:
+        raise ValueError("❌ Missing required column 'date_iso' in Escapement_PlotPipeline.")
 
-# Coerce to numeric in case of string types
-df["adult_diff_plot"] = pd.to_numeric(df["adult_diff_plot"], errors="coerce")
-df["date_iso"] = pd.to_datetime(df["date_iso"], errors="coerce")
+    # Coerce to numeric in case of string types
+    df["adult_diff_plot"] = pd.to_numeric(df["adult_diff_plot"], errors="coerce")
 
-current_year = pd.Timestamp.today().year
-mask_current_year = df["date_iso"].dt.year == current_year
+    current_year = pd.Timestamp.today().year
+    mask_current_year = df["date_iso"].dt.year == current_year
 
-# Remove zero diffs only for rows NOT in the current year
-mask_zero = (df["adult_diff_plot"] == 0) & (~mask_current_year)
-removed = int(mask_zero.sum())
+    # Remove zero diffs only for rows NOT in the current year
+    mask_zero = (df["adult_diff_plot"] == 0) & (~mask_current_year)
+    removed = int(mask_zero.sum())
 
-df_filtered = df.loc[~mask_zero].reset_index(drop=True)
+    df_filtered = df.loc[~mask_zero].reset_index(drop=True)
 
-print(f"🗑️ Rows removed (adult_diff_plot == 0): {removed:,}")
-print(f"📊 Remaining rows: {len(df_filtered):,}")
+    print(f"🗑️ Rows removed (adult_diff_plot == 0): {removed:,}")
+    print(f"📊 Remaining rows: {len(df_filtered):,}")
+
+    print("✅ Step 63 complete — zero adult_diff_plot rows removed.")
+    return df_filtered
+
+
+def main():
+    # ------------------------------------------------------------
+    # LOAD TABLE
+    # ------------------------------------------------------------
+    with connection(db_path) as conn:
+        df = pipeline_schema.load(conn)
+    print(f"✅ Loaded {len(df):,} rows from Escapement_PlotPipeline")
+
+    df_filtered = transform(df)
+
+    with connection(db_path) as conn:
+        pipeline_schema.save(df_filtered, conn)
 
-# ------------------------------------------------------------
-# WRITE BACK TO DATABASE
-# ------------------------------------------------------------
-df_filtered.to_sql("Escapement_PlotPipeline", conn, if_exists="replace", index=False)
-conn.close()
 
-print("✅ Step 63 complete — zero adult_diff_plot rows removed.")
+if __name__ == "__main__":
+    main()
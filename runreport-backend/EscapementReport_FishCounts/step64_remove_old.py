@@ -7,10 +7,22 @@
 # rolling window are removed.
 # ------------------------------------------------------------
 
-import sqlite3
+import sys
 import pandas as pd
 from pathlib import Path
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
+
+CURRENT_DIR = Path(__file__).resolve().parent
+if str(CURRENT_DIR) not in sys.path:
+    sys.path.append(str(CURRENT_DIR))
+
+import pipeline_schema
+
 print("🧹 Step 64: Trimming Escapement_PlotPipeline to current year + prior 10 years...")
 
 # ------------------------------------------------------------
@@ -20,36 +32,42 @@ project_root = Path(__file__).resolve().parents[1]
 db_path = project_root / "0_db" / "local.db"
 print(f"🗄️ Using DB → {db_path}")
 
-# ------------------------------------------------------------
-# LOAD TABLE
-# ------------------------------------------------------------
-conn = sqlite3.connect(db_path)
-df = pd.read_sql_query("SELECT * FROM Escapement_PlotPipeline;", conn)
-print(f"✅ Loaded {len(df):,} rows from Escapement_PlotPipeline")
 
-# ------------------------------------------------------------
-# FILTER TO ROLLING WINDOW
-# ------------------------------------------------------------
-if "date_iso" not in df.columns:
-    raise ValueError("❌ Missing required column 'date_iso' in Escapement_PlotPipeline.")
+def transform(df: pd.DataFrame) -> pd.DataFrame:
+    # ------------------------------------------------------------
+    # FILTER TO ROLLING WINDOW
+    # ------------------------------------------------------------
+    if "date_iso" not in df.columns:
+        raise ValueError("❌ Missing required column 'date_iso' in Escapement_PlotPipeline.")
 
-df["date_iso"] = pd.to_datetime(df["date_iso"], errors="coerce")
+    current_year = pd.Timestamp.today().year
+    min_year = current_year - 10
 
-current_year = pd.Timestamp.today().year
-min_year = current_year - 10
+    keep_mask = df["date_iso"].dt.year.between(min_year, current_year, inclusive="both")
+    removed = int((~keep_mask).sum())
 
-keep_mask = df["date_iso"].dt.year.between(min_year, current_year, inclusive="both")
-removed = int((~keep_mask).sum())
+    df_filtered = df.loc[keep_mask].reset_index(drop=True)
 
-df_filtered = df.loc[keep_mask].reset_index(drop=True)
+    print(f"🗑️ Rows removed outside {min_year}–{current_year}: {removed:,}")
+    print(f"📊 Remaining rows: {len(df_filtered):,}")
 
-print(f"🗑️ Rows removed outside {min_year}–{current_year}: {removed:,}")
-print(f"📊 Remaining rows: {len(df_filtered):,}")
+    print("✅ Step 64 complete — retained current year + prior 10 years.")
+    return df_filtered
+
+
+def main():
+    # ------------------------------------------------------------
+    # LOAD TABLE
+    # ------------------------------------------------------------
+    with connection(db_path) as conn:
+        df = pipeline_schema.load(conn)
+    print(f"✅ Loaded {len(df):,} rows from Escapement_PlotPipeline")
+
+    df_filtered = transform(df)
+
+    with connection(db_path) as conn:
+        pipeline_schema.save(df_filtered, conn)
 
-# ------------------------------------------------------------
-# WRITE BACK TO DATABASE
-# ------------------------------------------------------------
-df_filtered.to_sql("Escapement_PlotPipeline", conn, if_exists="replace", index=False)
-conn.close()
 
-print("✅ Step 64 complete — retained current year + prior 10 years.")
+if __name__ == "__main__":
+    main()
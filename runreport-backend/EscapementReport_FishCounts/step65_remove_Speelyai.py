@@ -7,11 +7,23 @@
 # (case-insensitive).
 # ------------------------------------------------------------
 
-import sqlite3
+import sys
 from pathlib import Path
 
 import pandas as pd
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
+
+CURRENT_DIR = Path(__file__).resolve().parent
+if str(CURRENT_DIR) not in sys.path:
+    sys.path.append(str(CURRENT_DIR))
+
+import pipeline_schema
+
 print("🧹 Step 65: Removing Speelyai Hatchery (Chinook/Coho) rows from Escapement_PlotPipeline...")
 
 # ------------------------------------------------------------
@@ -21,49 +33,57 @@ project_root = Path(__file__).resolve().parents[1]
 db_path = project_root / "0_db" / "local.db"
 print(f"🗄️ Using DB → {db_path}")
 
-# ------------------------------------------------------------
-# LOAD TABLE
-# ------------------------------------------------------------
-conn = sqlite3.connect(db_path)
-df = pd.read_sql_query("SELECT * FROM Escapement_PlotPipeline;", conn)
-print(f"✅ Loaded {len(df):,} rows from Escapement_PlotPipeline")
 
-# ------------------------------------------------------------
-# FILTER OUT SPEELYAI HATCHERY CHINOOK/COHO ROWS
-# ------------------------------------------------------------
-if "facility" not in df.columns:
-    raise ValueError("❌ Missing required column 'facility' in Escapement_PlotPipeline.")
+def transform(df: pd.DataFrame) -> pd.DataFrame:
+    # ------------------------------------------------------------
+    # FILTER OUT SPEELYAI HATCHERY CHINOOK/COHO ROWS
+    # ------------------------------------------------------------
+    if "facility" not in df.columns:
+        raise ValueError("❌ Missing required column 'facility' in Escapement_PlotPipeline.")
 
-family_col = None
-for candidate in ("family", "Family"):
-    if candidate in df.columns:
-        family_col = candidate
-        break
+    family_col = None
+    for candidate in ("family", "Family"):
+        if candidate in df.columns:
+            family_col = candidate
+            break
 
-if family_col is None:
-    raise ValueError("❌ Missing required column 'family' in Escapement_PlotPipeline.")
+    if family_col is None:
+        raise ValueError("❌ Missing required column 'family' in Escapement_PlotPipeline.")
 
-facility_norm = df["facility"].astype("string").str.strip().str.casefold()
-family_norm = df[family_col].astype("string").str.strip().str.casefold()
+    facility_norm = df["facility"].astype("string").str.strip().str.casefold()
+    family_norm = df[family_col].astype("string").str.strip().str.casefold()
 
-mask_speelyai = facility_norm.eq("speelyai hatchery")
-mask_family = family_norm.isin({"chinook", "coho"})
+    mask_speelyai = facility_norm.eq("speelyai hatchery")
+    mask_family = family_norm.isin({"chinook", "coho"})
 
-mask_remove = mask_speelyai & mask_family
-removed = int(mask_remove.sum())
+    mask_remove = mask_speelyai & mask_family
+    removed = int(mask_remove.sum())
 
-df_filtered = df.loc[~mask_remove].reset_index(drop=True)
+    df_filtered = df.loc[~mask_remove].reset_index(drop=True)
 
-print(
-    "🗑️ Rows removed (facility='Speelyai Hatchery' AND family in {'Chinook','Coho'}): "
-    f"{removed:,}"
-)
-print(f"📊 Remaining rows: {len(df_filtered):,}")
+    print(
+        "🗑️ Rows removed (facility='Speelyai Hatchery' AND family in {'Chinook','Coho'}): "
+        f"{removed:,}"
+    )
+    print(f"📊 Remaining rows: {len(df_filtered):,}")
+
+    print("✅ Step 65 complete — Speelyai Hatchery Chinook/Coho rows removed.")
+    return df_filtered
+
+
+def main():
+    # ------------------------------------------------------------
+    # LOAD TABLE
+    # ------------------------------------------------------------
+    with connection(db_path) as conn:
+        df = pipeline_schema.load(conn)
+    print(f"✅ Loaded {len(df):,} rows from Escapement_PlotPipeline")
+
+    df_filtered = transform(df)
+
+    with connection(db_path) as conn:
+        pipeline_schema.save(df_filtered, conn)
 
-# ------------------------------------------------------------
-# WRITE BACK TO DATABASE
-# ------------------------------------------------------------
-df_filtered.to_sql("Escapement_PlotPipeline", conn, if_exists="replace", index=False)
-conn.close()
 
-print("✅ Step 65 complete — Speelyai Hatchery Chinook/Coho rows removed.")
+if __name__ == "__main__":
+    main()
@@ -13,10 +13,17 @@ This mimics the old CSV-based script but operates directly inside SQLite.
 """
 
 import sqlite3
+import sys
 import re
 from pathlib import Path
 from datetime import datetime
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
+
 # ------------------------------------------------------------
 # Paths
 # ------------------------------------------------------------
@@ -33,9 +40,8 @@ print(f"🗄️ Using DB: {DB_PATH}")
 # ------------------------------------------------------------
 
 def get_conn():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """One unit of work: commits on success and always closes."""
+    return connection(DB_PATH, row_factory=sqlite3.Row)
 
 
 # Regex for count rows (same as old script)
@@ -7,10 +7,22 @@
 # No other identifier columns are added.
 # ------------------------------------------------------------
 
-import sqlite3
+import sys
 import pandas as pd
 from pathlib import Path
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
+
+CURRENT_DIR = Path(__file__).resolve().parent
+if str(CURRENT_DIR) not in sys.path:
+    sys.path.append(str(CURRENT_DIR))
+
+import pipeline_schema
+
 print("🏗️ Step 71: Creating basinfamily identifiers for all rows...")
 
 # ------------------------------------------------------------
@@ -20,33 +32,41 @@ project_root = Path(__file__).resolve().parents[1]
 db_path = project_root / "0_db" / "local.db"
 print(f"🗄️ Using DB → {db_path}")
 
-# ------------------------------------------------------------
-# LOAD TABLE
-# ------------------------------------------------------------
-conn = sqlite3.connect(db_path)
-df = pd.read_sql_query("SELECT * FROM Escapement_PlotPipeline;", conn)
-print(f"✅ Loaded {len(df):,} rows from Escapement_PlotPipeline")
 
-# ------------------------------------------------------------
-# VALIDATE REQUIRED COLUMNS
-# ------------------------------------------------------------
-required = ["basin", "Family"]
-missing = [c for c in required if c not in df.columns]
-if missing:
-    raise ValueError(f"❌ Missing required columns: {missing}")
+def transform(df: pd.DataFrame) -> pd.DataFrame:
+    # ------------------------------------------------------------
+    # VALIDATE REQUIRED COLUMNS
+    # ------------------------------------------------------------
+    required = ["basin", "Family"]
+    missing = [c for c in required if c not in df.columns]
+    if missing:
+        raise ValueError(f"❌ Missing required columns: {missing}")
 
-# ------------------------------------------------------------
-# NORMALIZE AND BUILD basinfamily
-# ------------------------------------------------------------
-df["basin"] = df["basin"].astype(str).str.strip()
-df["Family"] = df["Family"].astype(str).str.strip()
+    # ------------------------------------------------------------
+    # NORMALIZE AND BUILD basinfamily
+    # ------------------------------------------------------------
+    df["basin"] = df["basin"].astype(str).str.strip()
+    df["Family"] = df["Family"].astype(str).str.strip()
 
-df["basinfamily"] = df["basin"] + " - " + df["Family"]
+    df["basinfamily"] = df["basin"] + " - " + df["Family"]
+
+    print("✅ Step 71 complete — basinfamily column added.")
+    return df
+
+
+def main():
+    # ------------------------------------------------------------
+    # LOAD TABLE
+    # ------------------------------------------------------------
+    with connection(db_path) as conn:
+        df = pipeline_schema.load(conn)
+    print(f"✅ Loaded {len(df):,} rows from Escapement_PlotPipeline")
+
+    df = transform(df)
+
+    with connection(db_path) as conn:
+        pipeline_schema.save(df, conn)
 
-# ------------------------------------------------------------
-# WRITE BACK TO DATABASE
-# ------------------------------------------------------------
-df.to_sql("Escapement_PlotPipeline", conn, if_exists="replace", index=False)
-conn.close()
 
-print("✅ Step 71 complete — basinfamily column added.")
+if __name__ == "__main__":
+    main()
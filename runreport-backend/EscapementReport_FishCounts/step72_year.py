@@ -6,11 +6,23 @@
 # the year from `date_iso`.
 # ------------------------------------------------------------
 
-import sqlite3
+import sys
 from pathlib import Path
 
 import pandas as pd
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
+
+CURRENT_DIR = Path(__file__).resolve().parent
+if str(CURRENT_DIR) not in sys.path:
+    sys.path.append(str(CURRENT_DIR))
+
+import pipeline_schema
+
 print("📅 Step 72: Creating `year` column from date_iso...")
 
 # ------------------------------------------------------------
@@ -20,33 +32,40 @@ project_root = Path(__file__).resolve().parents[1]
 db_path = project_root / "0_db" / "local.db"
 print(f"🗄️ Using DB → {db_path}")
 
-# ------------------------------------------------------------
-# LOAD TABLE
-# ------------------------------------------------------------
-conn = sqlite3.connect(db_path)
-df = pd.read_sql_query("SELECT * FROM Escapement_PlotPipeline;", conn)
-print(f"✅ Loaded {len(df):,} rows from Escapement_PlotPipeline")
 
-# ------------------------------------------------------------
-# VALIDATE REQUIRED COLUMNS
-# ------------------------------------------------------------
-if "date_iso" not in df.columns:
-    raise ValueError("❌ Missing required column 'date_iso' in Escapement_PlotPipeline.")
+def transform(df: pd.DataFrame) -> pd.DataFrame:
+    # ------------------------------------------------------------
+    # VALIDATE REQUIRED COLUMNS
+    # ------------------------------------------------------------
+    if "date_iso" not in df.columns:
+        raise ValueError("❌ Missing required column 'date_iso' in Escapement_PlotPipeline.")
 
-# ------------------------------------------------------------
-# BUILD YEAR COLUMN
-# ------------------------------------------------------------
-dt = pd.to_datetime(df["date_iso"], errors="coerce")
-df["year"] = dt.dt.year.astype("Int64")
+    # ------------------------------------------------------------
+    # BUILD YEAR COLUMN
+    # ------------------------------------------------------------
+    df["year"] = df["date_iso"].dt.year.astype("Int64")
 
-missing_years = int(df["year"].isna().sum())
-if missing_years:
-    print(f"⚠️ {missing_years:,} row(s) have invalid date_iso; `year` set to NULL for those.")
+    missing_years = int(df["year"].isna().sum())
+    if missing_years:
+        print(f"⚠️ {missing_years:,} row(s) have invalid date_iso; `year` set to NULL for those.")
+
+    print("✅ Step 72 complete — `year` column added.")
+    return df
+
+
+def main():
+    # ------------------------------------------------------------
+    # LOAD TABLE
+    # ------------------------------------------------------------
+    with connection(db_path) as conn:
+        df = pipeline_schema.load(conn)
+    print(f"✅ Loaded {len(df):,} rows from Escapement_PlotPipeline")
+
+    df = transform(df)
+
+    with connection(db_path) as conn:
+        pipeline_schema.save(df, conn)
 
-# ------------------------------------------------------------
-# WRITE BACK TO DATABASE
-# ------------------------------------------------------------
-df.to_sql("Escapement_PlotPipeline", conn, if_exists="replace", index=False)
-conn.close()
 
-print("✅ Step 72 complete — `year` column added.")
+if __name__ == "__main__":
+    main()
@@ -8,10 +8,22 @@
 # Each matching row is removed from the table.
 # ------------------------------------------------------------
 
-import sqlite3
+import sys
 import pandas as pd
 from pathlib import Path
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
+
+CURRENT_DIR = Path(__file__).resolve().parent
+if str(CURRENT_DIR) not in sys.path:
+    sys.path.append(str(CURRENT_DIR))
+
+import pipeline_schema
+
 print("🧹 Step 73: Removing specified basin/family combinations...")
 
 # ------------------------------------------------------------
@@ -110,46 +122,53 @@ project_root = Path(__file__).resolve().parents[1]
 db_path = project_root / "0_db" / "local.db"
 print(f"🗄️ Using DB → {db_path}")
 
-# ------------------------------------------------------------
-# LOAD DATA
-# ------------------------------------------------------------
-conn = sqlite3.connect(db_path)
-df = pd.read_sql_query("SELECT * FROM Escapement_PlotPipeline;", conn)
 
-print(f"✅ Loaded {len(df):,} rows from Escapement_PlotPipeline")
+def transform(df: pd.DataFrame) -> pd.DataFrame:
+    # ------------------------------------------------------------
+    # VALIDATE
+    # ------------------------------------------------------------
+    required = ["basinfamily"]
+    missing = [c for c in required if c not in df.columns]
+    if missing:
+        raise ValueError(f"❌ Missing required columns: {missing}")
 
-# ------------------------------------------------------------
-# VALIDATE
-# ------------------------------------------------------------
-required = ["basinfamily"]
-missing = [c for c in required if c not in df.columns]
-if missing:
-    raise ValueError(f"❌ Missing required columns: {missing}")
-
-df["basinfamily"] = df["basinfamily"].astype(str).str.strip()
-
-if not pairs_to_remove:
-    print("ℹ️ No pairs specified in pairs_to_remove; nothing to remove.")
-else:
-    removed_total = 0
-    for basin_name, family_name in pairs_to_remove:
-        basinfamily = f"{str(basin_name).strip()} - {str(family_name).strip()}"
-        mask = df["basinfamily"] == basinfamily
-        count = int(mask.sum())
-        if count:
-            df = df.loc[~mask].reset_index(drop=True)
-            removed_total += count
-            print(f"🗑️ Removed {count} rows for ({basinfamily})")
-        else:
-            print(f"ℹ️ No rows matched ({basinfamily})")
-
-    print(f"🧾 Total rows removed: {removed_total:,}")
-    print(f"📊 Remaining rows: {len(df):,}")
+    df["basinfamily"] = df["basinfamily"].astype(str).str.strip()
+
+    if not pairs_to_remove:
+        print("ℹ️ No pairs specified in pairs_to_remove; nothing to remove.")
+    else:
+        removed_total = 0
+        for basin_name, family_name in pairs_to_remove:
+            basinfamily = f"{str(basin_name).strip()} - {str(family_name).strip()}"
+            mask = df["basinfamily"] == basinfamily
+            count = int(mask.sum())
+            if count:
+                df = df.loc[~mask].reset_index(drop=True)
+                removed_total += count
+                print(f"🗑️ Removed {count} rows for ({basinfamily})")
+            else:
+                print(f"ℹ️ No rows matched ({basinfamily})")
+
+        print(f"🧾 Total rows removed: {removed_total:,}")
+        print(f"📊 Remaining rows: {len(df):,}")
+
+    print("✅ Step 73 complete — specified basin/family combinations removed.")
+    return df
+
+
+def main():
+    # ------------------------------------------------------------
+    # LOAD DATA
+    # ------------------------------------------------------------
+    with connection(db_path) as conn:
+        df = pipeline_schema.load(conn)
+    print(f"✅ Loaded {len(df):,} rows from Escapement_PlotPipeline")
+
+    df = transform(df)
+
+    with connection(db_path) as conn:
+        pipeline_schema.save(df, conn)
 
-# ------------------------------------------------------------
-# WRITE BACK
-# ------------------------------------------------------------
-df.to_sql("Escapement_PlotPipeline", conn, if_exists="replace", index=False)
-conn.close()
 
-print("✅ Step 73 complete — specified basin/family combinations removed.")
+if __name__ == "__main__":
+    main()
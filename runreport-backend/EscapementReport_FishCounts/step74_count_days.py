@@ -1,19 +1,34 @@
 # step74_count_days.py
 # ------------------------------------------------------------
-# Step 74: Expand date_iso into Day1 → DayN columns based on day_diff_plot
+# Step 74: Normalize date_iso/day_diff_plot for the day expansion
 #
-# For each row:
-#   - Treat date_iso as the end date
-#   - Count backwards by day_diff_plot days
-#   - Fill Day1, Day2, ... with the corresponding MM-DD values
+# Each row covers the day_diff_plot days ending on date_iso
+# (counting backwards). Those days used to be written out as
+# Day1 → DayN text columns; step 76 now expands them in long form
+# (daily_counts.expand_days), so this step only normalizes the two
+# columns, drops Day columns left by older runs, and reports how
+# many row-days the expansion will produce.
 # ------------------------------------------------------------
 
-import sqlite3
+import re
+import sys
 import pandas as pd
-from datetime import timedelta
 from pathlib import Path
 
-print("🏗️ Step 74: Expanding date_iso into Day1 → DayN columns using day_diff_plot...")
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
+
+CURRENT_DIR = Path(__file__).resolve().parent
+if str(CURRENT_DIR) not in sys.path:
+    sys.path.append(str(CURRENT_DIR))
+
+import pipeline_schema
+from daily_counts import expand_days
+
+print("🏗️ Step 74: Preparing date_iso/day_diff_plot for the day expansion...")
 
 # ------------------------------------------------------------
 # DB PATH
@@ -22,63 +37,58 @@ project_root = Path(__file__).resolve().parents[1]
 db_path = project_root / "0_db" / "local.db"
 print(f"🗄️ Using DB → {db_path}")
 
-# ------------------------------------------------------------
-# LOAD TABLE
-# ------------------------------------------------------------
-conn = sqlite3.connect(db_path)
-df = pd.read_sql_query("SELECT * FROM Escapement_PlotPipeline;", conn)
-print(f"✅ Loaded {len(df):,} rows from Escapement_PlotPipeline")
+DAY_COL = re.compile(r"^Day\d+$")
 
-# ------------------------------------------------------------
-# VALIDATE REQUIRED COLUMNS
-# ------------------------------------------------------------
-required_cols = ["date_iso", "day_diff_plot"]
-missing = [c for c in required_cols if c not in df.columns]
-if missing:
-    raise ValueError(f"❌ Missing required columns: {missing}")
 
-# ------------------------------------------------------------
-# NORMALIZE TYPES
-# ------------------------------------------------------------
-df["date_iso"] = pd.to_datetime(df["date_iso"], errors="coerce")
-df["day_diff_plot"] = pd.to_numeric(df["day_diff_plot"], errors="coerce").fillna(0).astype(int)
+def transform(df: pd.DataFrame) -> pd.DataFrame:
+    # ------------------------------------------------------------
+    # VALIDATE REQUIRED COLUMNS
+    # ------------------------------------------------------------
+    required_cols = ["date_iso", "day_diff_plot"]
+    missing = [c for c in required_cols if c not in df.columns]
+    if missing:
+        raise ValueError(f"❌ Missing required columns: {missing}")
 
-# ------------------------------------------------------------
-# PREPARE DAY COLUMNS
-# ------------------------------------------------------------
-max_days = int(df["day_diff_plot"].max())
-if max_days <= 0:
-    print("ℹ️ No positive day_diff_plot values found; skipping Day column creation.")
-    df.to_sql("Escapement_PlotPipeline", conn, if_exists="replace", index=False)
-    conn.close()
-    print("✅ Step 74 complete (no Day columns added).")
-    exit()
+    # ------------------------------------------------------------
+    # NORMALIZE TYPES
+    # ------------------------------------------------------------
+    df["day_diff_plot"] = pd.to_numeric(df["day_diff_plot"], errors="coerce").fillna(0).astype(int)
 
-print(f"📅 Maximum day_diff_plot = {max_days} → creating Day1 through Day{max_days}")
+    stale = [c for c in df.columns if DAY_COL.match(c)]
+    if stale:
+        df = df.drop(columns=stale)
+        print(f"🧹 Dropped {len(stale)} Day columns from an earlier run")
 
-day_cols = [f"Day{i+1}" for i in range(max_days)]
-for col in day_cols:
-    df[col] = ""
+    # ------------------------------------------------------------
+    # REPORT
+    # ------------------------------------------------------------
+    max_days = int(df["day_diff_plot"].max()) if len(df) else 0
+    if max_days <= 0:
+        print("ℹ️ No positive day_diff_plot values found; no days to expand.")
+    else:
+        days = expand_days(df)
+        print(f"📅 {len(df):,} rows cover {len(days):,} row-days (longest gap {max_days} days)")
 
-# ------------------------------------------------------------
-# FILL DAY COLUMNS
-# ------------------------------------------------------------
-for idx, row in df.iterrows():
-    end_date = row["date_iso"]
-    days_back = row["day_diff_plot"]
+    print("✅ Step 74 complete.")
+    return df
 
-    if pd.isna(end_date) or days_back <= 0:
-        continue
 
-    for i in range(days_back):
-        day_label = f"Day{i+1}"
-        if day_label in df.columns:
-            df.at[idx, day_label] = (end_date - timedelta(days=i)).strftime("%m-%d")
+def main():
+    # ------------------------------------------------------------
+    # LOAD TABLE
+    # ------------------------------------------------------------
+    with connection(db_path) as conn:
+        df = pipeline_schema.load(conn)
+    print(f"✅ Loaded {len(df):,} rows from Escapement_PlotPipeline")
+
+    df = transform(df)
+
+    # ------------------------------------------------------------
+    # WRITE BACK TO DATABASE
+    # ------------------------------------------------------------
+    with connection(db_path) as conn:
+        pipeline_schema.save(df, conn)
 
-# ------------------------------------------------------------
-# WRITE BACK TO DATABASE
-# ------------------------------------------------------------
-df.to_sql("Escapement_PlotPipeline", conn, if_exists="replace", index=False)
-conn.close()
 
-print(f"✅ Step 74 complete — created Day1 → Day{max_days} columns.")
+if __name__ == "__main__":
+    main()
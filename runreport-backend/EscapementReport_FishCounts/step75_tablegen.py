@@ -1,20 +1,35 @@
 # step75_tablegen.py
 # ------------------------------------------------------------
-# Step 75: Generate a 366-day template table for basinfamily
-# 
-# Builds an empty daily-counts template with:
-#   - Rows: Every MM-DD in a year (including 12-31)
-#   - Columns: Unique basinfamily values from Escapement_PlotPipeline
-# Saves to local.db as EscapementReports_dailycounts.
+# Step 75: Set up the long daily-counts table for basinfamily
+#
+# Saves the unique basinfamily values from Escapement_PlotPipeline
+# to EscapementReports_basinfamilies and (re)creates an empty
+# EscapementReports_dailycounts in long form:
+#   metric_type | MM-DD | basinfamily | value
+# keyed by (metric_type, MM-DD, basinfamily). Step 76 fills it.
+#
+# This used to be a dense 1,098-row zero template with one column
+# per basinfamily; a new hatchery/species combination is now a new
+# row in the basinfamily list instead of a new column.
 # ------------------------------------------------------------
 
-import sqlite3
+import sys
 import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
 from pathlib import Path
 
-print("🏗️ Step 75: Generating EscapementReports_dailycounts (basinfamily template)...")
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connect
+
+CURRENT_DIR = Path(__file__).resolve().parent
+if str(CURRENT_DIR) not in sys.path:
+    sys.path.append(str(CURRENT_DIR))
+
+from daily_counts import BASINFAMILY_TABLE, DAILY_TABLE, create_daily_table
+
+print(f"🏗️ Step 75: Setting up {DAILY_TABLE} (long basinfamily daily counts)...")
 
 # ------------------------------------------------------------
 # DB PATH
@@ -26,7 +41,7 @@ print(f"🗄️ Using DB → {db_path}")
 # ------------------------------------------------------------
 # LOAD DATA
 # ------------------------------------------------------------
-conn = sqlite3.connect(db_path)
+conn = connect(db_path)
 df = pd.read_sql_query("SELECT * FROM Escapement_PlotPipeline;", conn)
 print(f"✅ Loaded {len(df):,} rows from Escapement_PlotPipeline")
 
@@ -40,41 +55,14 @@ df["basinfamily"] = df["basinfamily"].astype(str).str.strip()
 
 uniques = sorted(df["basinfamily"].dropna().unique())
 print(f"📊 Found {len(uniques)} unique basinfamily values")
-
-# ------------------------------------------------------------
-# CREATE BASE DATE FRAME (3 years x 366 days incl 12-31) + metric_type column
-# ------------------------------------------------------------
-dates = [(datetime(2024, 1, 1) + timedelta(days=i)).strftime("%m-%d") for i in range(366)]
-
-frames = []
-metric_labels = ["current_year", "previous_year", "10_year"]
-
-for label in metric_labels:
-    frames.append(pd.DataFrame({"metric_type": label, "MM-DD": dates}))
-
-base_df = pd.concat(frames, ignore_index=True)
-
-# ------------------------------------------------------------
-# BUILD TEMPLATE TABLE
-# ------------------------------------------------------------
-if uniques:
-    zero_matrix = pd.DataFrame(np.zeros((len(base_df), len(uniques))), columns=uniques)
-    table = pd.concat([base_df, zero_matrix], axis=1)
-else:
-    table = base_df.copy()
-    print("ℹ️ No basinfamily values found; table will only contain metric_type and MM-DD.")
-
-# ------------------------------------------------------------
-# SET CURRENT_YEAR CELLS TO NULL (so lines stop at last data)
-# ------------------------------------------------------------
-if uniques:
-    value_cols = [c for c in table.columns if c not in ("metric_type", "MM-DD")]
-    table.loc[table["metric_type"] == "current_year", value_cols] = np.nan
+if not uniques:
+    print("ℹ️ No basinfamily values found; the daily table will stay empty.")
 
 # ------------------------------------------------------------
 # WRITE TO DB
 # ------------------------------------------------------------
-table.to_sql("EscapementReports_dailycounts", conn, if_exists="replace", index=False)
+pd.DataFrame({"basinfamily": uniques}).to_sql(BASINFAMILY_TABLE, conn, if_exists="replace", index=False)
+create_daily_table(conn)
 conn.close()
 
-print(f"✅ Step 75 complete — EscapementReports_dailycounts created with {len(table)} rows and {len(table.columns)} columns.")
+print(f"✅ Step 75 complete — {BASINFAMILY_TABLE} ({len(uniques)} rows) and an empty {DAILY_TABLE} created.")
@@ -1,19 +1,40 @@
 # step77_weekly.py
 # ------------------------------------------------------------
-# Step 77: Convert daily basinfamily table to weekly totals
+# Step 77: Convert daily basinfamily totals to weekly totals
 # (with 12-31 partial-week adjustment ×3.5)
 #
 # Combines Stock values as stock values are ignored in this script
 #
-# Reads EscapementReports_dailycounts and outputs a weekly
-# aggregation into EscapementReports_weeklycounts.
+# Reads the long EscapementReports_dailycounts (plus the
+# basinfamily list) and writes the weekly aggregation to
+# EscapementReports_weeklycounts, also long:
+#   metric_type | MM-DD (last day of the week) | basinfamily | value
+# with every metric_type × basinfamily × week present.
+#
+# Weeks come from the day-of-year index (common/weekly.py); all
+# metric types and basinfamilies are summed in one groupby.
 # At the end, all numeric values are rounded to 2 decimals.
 # ------------------------------------------------------------
 
-import sqlite3
+import sys
 import pandas as pd
 from pathlib import Path
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connect
+from common.weekly import N_WEEKS, WEEK_LABELS, YEAR_END_FACTOR, weekly_totals
+
+CURRENT_DIR = Path(__file__).resolve().parent
+if str(CURRENT_DIR) not in sys.path:
+    sys.path.append(str(CURRENT_DIR))
+
+from daily_counts import BASINFAMILY_TABLE, DAILY_TABLE, METRIC_TYPES
+
+WEEKLY_TABLE = "EscapementReports_weeklycounts"
+
 print("📆 Step 77: Converting daily basinfamily table to weekly totals...")
 
 # ------------------------------------------------------------
@@ -26,89 +47,49 @@ print(f"🗄️ Using DB → {db_path}")
 # ------------------------------------------------------------
 # LOAD DATA
 # ------------------------------------------------------------
-conn = sqlite3.connect(db_path)
-df = pd.read_sql_query("SELECT * FROM EscapementReports_dailycounts;", conn)
-print(f"✅ Loaded {len(df):,} rows and {len(df.columns)} columns from EscapementReports_dailycounts")
+conn = connect(db_path)
+daily = pd.read_sql_query(f"SELECT * FROM {DAILY_TABLE};", conn)
+basinfamilies = pd.read_sql_query(f"SELECT basinfamily FROM {BASINFAMILY_TABLE};", conn)["basinfamily"].tolist()
+print(f"✅ Loaded {len(daily):,} daily totals for {len(basinfamilies)} basinfamily values from {DAILY_TABLE}")
 
 # ------------------------------------------------------------
 # VALIDATE
 # ------------------------------------------------------------
-required = ["metric_type", "MM-DD"]
-missing = [c for c in required if c not in df.columns]
+required = ["metric_type", "MM-DD", "basinfamily", "value"]
+missing = [c for c in required if c not in daily.columns]
 if missing:
-    raise ValueError(f"❌ Missing required columns in EscapementReports_dailycounts: {missing}")
-
-# Identify numeric columns (all except metric_type, MM-DD)
-numeric_cols = [c for c in df.columns if c not in ("metric_type", "MM-DD")]
-if not numeric_cols:
-    raise ValueError("❌ No basinfamily value columns found to aggregate.")
-
-# Normalize columns
-df["metric_type"] = df["metric_type"].astype(str).str.strip()
-df["MM-DD"] = df["MM-DD"].astype(str).str.strip()
-df[numeric_cols] = df[numeric_cols].apply(pd.to_numeric, errors="coerce").fillna(0.0)
-
-metric_types = df["metric_type"].unique()
-weekly_frames = []
-
-
-def make_weekly(group_df: pd.DataFrame, metric_label: str) -> pd.DataFrame:
-    """Aggregate daily data into 7-day blocks and apply 12-31 adjustment."""
-    temp = group_df.copy()
-    temp["date"] = pd.to_datetime("2024-" + temp["MM-DD"], errors="coerce")
-    temp = temp.dropna(subset=["date"]).sort_values("date").reset_index(drop=True)
-
-    weekly_rows = []
-    for start in range(0, len(temp), 7):
-        chunk = temp.iloc[start : start + 7]
-        if len(chunk) == 0:
-            continue
-        summed = chunk[numeric_cols].sum(numeric_only=True)
-        last_day = chunk["date"].iloc[-1].strftime("%m-%d")
-        weekly_rows.append([metric_label, last_day] + summed.tolist())
-
-    weekly_df = pd.DataFrame(weekly_rows, columns=["metric_type", "MM-DD"] + numeric_cols)
-
-    # Apply 12-31 adjustment ×3.5 to the final week if present
-    if (weekly_df["MM-DD"] == "12-31").any():
-        idx = weekly_df.index[weekly_df["MM-DD"] == "12-31"][0]
-        adj = (weekly_df.loc[idx:idx, numeric_cols].astype(float) * 3.5)
-        weekly_df.loc[idx:idx, numeric_cols] = adj.values
-        print(f"🔧 Adjusted final week (12-31) for metric_type={metric_label} — multiplied by 3.5")
+    raise ValueError(f"❌ Missing required columns in {DAILY_TABLE}: {missing}")
 
-    return weekly_df
+if not basinfamilies:
+    raise ValueError("❌ No basinfamily values found to aggregate.")
 
+daily["metric_type"] = daily["metric_type"].astype(str).str.strip()
 
 # ------------------------------------------------------------
-# PROCESS EACH METRIC TYPE
+# WEEKLY TOTALS (one groupby across metric types and basinfamilies)
 # ------------------------------------------------------------
-for mt in metric_types:
-    subset = df[df["metric_type"] == mt]
-    if subset.empty:
-        continue
-    weekly_frames.append(make_weekly(subset, mt))
+# Every basinfamily × metric_type, basinfamily-major
+keys = pd.MultiIndex.from_product(
+    [basinfamilies, METRIC_TYPES], names=["basinfamily", "metric_type"]
+).to_frame(index=False)
 
-if weekly_frames:
-    weekly_df = pd.concat(weekly_frames, ignore_index=True)
-else:
-    weekly_df = pd.DataFrame(columns=["metric_type", "MM-DD"] + numeric_cols)
-    print("ℹ️ No data available to produce weekly aggregation.")
+weekly_df = weekly_totals(daily, ["metric_type", "basinfamily"], ["value"], keys=keys)
+weekly_df = weekly_df[["metric_type", "MM-DD", "basinfamily", "value"]]
+print(f"🔧 Adjusted final week ({WEEK_LABELS[-1]}) for every metric_type — multiplied by {YEAR_END_FACTOR:g}")
 
 # ------------------------------------------------------------
 # ROUND NUMERICS
 # ------------------------------------------------------------
-if not weekly_df.empty and numeric_cols:
-    weekly_df[numeric_cols] = weekly_df[numeric_cols].apply(pd.to_numeric, errors="coerce").round(2).fillna(0.0)
+weekly_df["value"] = weekly_df["value"].round(2).fillna(0.0)
 
 # ------------------------------------------------------------
 # WRITE BACK TO DB
 # ------------------------------------------------------------
-weekly_df.to_sql("EscapementReports_weeklycounts", conn, if_exists="replace", index=False)
+weekly_df.to_sql(WEEKLY_TABLE, conn, if_exists="replace", index=False)
 conn.close()
 
 # ------------------------------------------------------------
 # SUMMARY
 # ------------------------------------------------------------
 print("✅ Step 77 complete — weekly counts table generated.")
-print(f"📊 Weekly rows: {len(weekly_df):,}")
-print(f"🔢 Columns: {len(weekly_df.columns)}")
+print(f"📊 Weekly rows: {len(weekly_df):,} ({N_WEEKS} weeks × {len(keys):,} series)")
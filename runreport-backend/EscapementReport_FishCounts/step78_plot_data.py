@@ -0,0 +1,259 @@
+# step78_plot_data.py
+# ------------------------------------------------------------
+# Step 78: Build EscapementReport_PlotData from the weekly counts
+#
+# Replaces the old steps 78–88, which each reloaded and rewrote
+# EscapementReport_PlotData for one change. The same stages now run
+# in memory, in the same order, and the table is written once:
+#
+#   78  weekly counts → long plot rows (identifier = basinfamily)
+#   79  pivot metric_type → current_year / previous_year / 10_year
+#       (sum with min_count=1 so missing weeks stay NaN)
+#   80  river        = text before the first " - " in identifier
+#   81  Species_Plot = text after the last " - " in identifier
+#   82  Pink correction: 10_year × 2 for Pink rows (Pink salmon
+#       return every other year, so a calendar 10-year average
+#       underestimates a run year)
+#   85  add Snohomish River rows = Skykomish + Snoqualmie per
+#       MM-DD / Species_Plot
+#   86  drop identifier, sort river → Species_Plot → MM-DD, add id
+#   87  01-01 wraparound row per (river, Species_Plot):
+#         current_year(01-01)  = previous_year(12-31)
+#         10_year(01-01)       = 10_year(12-31)
+#         previous_year(01-01) = (10_year(12-31) + previous_year(01-07)) / 2
+#       then round current_year / previous_year to whole fish
+#   88  hang the current-year line: current_year = NaN for series
+#       with no fish this year, and after the last reported date
+#       for the others (from Escapement_PlotPipeline)
+#
+# Every stage is timed; the breakdown is printed at the end.
+# ------------------------------------------------------------
+
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
+
+WEEKLY_TABLE = "EscapementReports_weeklycounts"
+PLOT_TABLE = "EscapementReport_PlotData"
+
+METRIC_COLS = ["current_year", "previous_year", "10_year"]
+PINK_TEN_YEAR_MULTIPLIER = 2.0
+SNOHOMISH_TRIBUTARIES = ["Skykomish River", "Snoqualmie River"]
+SNOHOMISH = "Snohomish River"
+
+print("🔗 Step 78: Building EscapementReport_PlotData from weekly counts...")
+
+# ------------------------------------------------------------
+# DB PATH
+# ------------------------------------------------------------
+project_root = Path(__file__).resolve().parents[1]
+db_path = project_root / "0_db" / "local.db"
+print(f"🗄️ Using DB → {db_path}")
+
+
+def _date_obj(mmdd: pd.Series) -> pd.Series:
+    """Sortable date for MM-DD (fixed leap year)."""
+    return pd.to_datetime("2024-" + mmdd, errors="coerce")
+
+
+# ------------------------------------------------------------
+# Stages
+# ------------------------------------------------------------
+
+def weekly_to_wide(weekly: pd.DataFrame) -> pd.DataFrame:
+    """Steps 78/79: one row per (MM-DD, identifier), one column per metric_type."""
+    required = ["metric_type", "MM-DD", "basinfamily", "value"]
+    missing = [c for c in required if c not in weekly.columns]
+    if missing:
+        raise ValueError(f"❌ Missing required columns in {WEEKLY_TABLE}: {missing}")
+
+    df = weekly.rename(columns={"basinfamily": "identifier"})[["metric_type", "MM-DD", "identifier", "value"]].copy()
+    for col in ["metric_type", "MM-DD", "identifier"]:
+        df[col] = df[col].astype(str).str.strip()
+    df["value"] = pd.to_numeric(df["value"], errors="coerce")
+
+    # Preserve missing values (NaN) so "current year" lines stop where
+    # data stops instead of dropping to 0 (min_count=1)
+    grouped = (
+        df.groupby(["MM-DD", "identifier", "metric_type"], as_index=False)["value"]
+        .sum(min_count=1)
+    )
+    pivot = grouped.pivot(index=["MM-DD", "identifier"], columns="metric_type", values="value").reset_index()
+    pivot.columns.name = None
+
+    for col in METRIC_COLS:
+        if col not in pivot.columns:
+            pivot[col] = pd.NA
+    pivot = pivot[["MM-DD", "identifier"] + METRIC_COLS]
+
+    pivot["date_obj"] = _date_obj(pivot["MM-DD"])
+    return pivot.sort_values(["date_obj", "identifier"]).drop(columns=["date_obj"]).reset_index(drop=True)
+
+
+def split_identifier(df: pd.DataFrame) -> pd.DataFrame:
+    """Steps 80/81: river and Species_Plot from identifier (vectorized split)."""
+    parts = df["identifier"].astype("string").str.split(" - ")
+    df.insert(df.columns.get_loc("identifier") + 1, "river", parts.str[0].str.strip().fillna("").astype(object))
+    df.insert(df.columns.get_loc("identifier") + 1, "Species_Plot", parts.str[-1].str.strip().fillna("").astype(object))
+    return df
+
+
+def pink_correction(df: pd.DataFrame) -> pd.DataFrame:
+    """Step 82: 10_year × PINK_TEN_YEAR_MULTIPLIER for Pink rows."""
+    mask_pink = df["Species_Plot"].str.strip().str.casefold().str.contains("pink", regex=False, na=False)
+    if mask_pink.any():
+        df.loc[mask_pink, "10_year"] = pd.to_numeric(df.loc[mask_pink, "10_year"], errors="coerce") * PINK_TEN_YEAR_MULTIPLIER
+    print(f"   🐟 Pink correction: {int(mask_pink.sum()):,} rows × {PINK_TEN_YEAR_MULTIPLIER}")
+    return df
+
+
+def add_snohomish(df: pd.DataFrame) -> pd.DataFrame:
+    """Step 85: append Snohomish River rows (sum of its tributaries)."""
+    column_order = list(df.columns)
+    df[METRIC_COLS] = df[METRIC_COLS].apply(pd.to_numeric, errors="coerce")
+
+    tributaries = df[df["river"].isin(SNOHOMISH_TRIBUTARIES)]
+    agg_df = tributaries.groupby(["MM-DD", "Species_Plot"], as_index=False)[METRIC_COLS].sum(min_count=1)
+    agg_df["river"] = SNOHOMISH
+    agg_df["identifier"] = SNOHOMISH + " - " + agg_df["Species_Plot"]
+    print(f"   🌊 Snohomish: {len(tributaries):,} tributary rows → {len(agg_df):,} rows")
+
+    return pd.concat([df, agg_df[column_order]], ignore_index=True)
+
+
+def reorg(df: pd.DataFrame) -> pd.DataFrame:
+    """Step 86: drop identifier, sort river → Species_Plot → MM-DD, add id."""
+    df = df.drop(columns=["identifier"])
+    df["date_obj"] = _date_obj(df["MM-DD"])
+    df = df.sort_values(["river", "Species_Plot", "date_obj"]).drop(columns=["date_obj"]).reset_index(drop=True)
+    df.insert(0, "id", range(1, len(df) + 1))
+    return df
+
+
+def wraparound(df: pd.DataFrame) -> pd.DataFrame:
+    """Step 87: computed 01-01 row per (river, Species_Plot); re-sort, re-id, round."""
+    keys = ["river", "Species_Plot"]
+    df = df.drop(columns=["id"])
+
+    val_1231 = (
+        df[df["MM-DD"] == "12-31"][keys + ["previous_year", "10_year"]]
+        .rename(columns={"previous_year": "prev_1231", "10_year": "ten_1231"})
+    )
+    val_0107 = (
+        df[df["MM-DD"] == "01-07"][keys + ["previous_year"]]
+        .rename(columns={"previous_year": "prev_0107"})
+    )
+    wrap_rows = (
+        df[keys].drop_duplicates()
+        .merge(val_1231, on=keys, how="left")
+        .merge(val_0107, on=keys, how="left")
+    )
+    wrap_rows["MM-DD"] = "01-01"
+    wrap_rows["current_year"] = wrap_rows["prev_1231"]
+    wrap_rows["10_year"] = wrap_rows["ten_1231"]
+    wrap_rows["previous_year"] = (wrap_rows["ten_1231"] + wrap_rows["prev_0107"]) / 2
+
+    df = pd.concat([df[df["MM-DD"] != "01-01"], wrap_rows[list(df.columns)]], ignore_index=True)
+
+    df["date_obj"] = _date_obj(df["MM-DD"])
+    df = df.sort_values(["river", "Species_Plot", "date_obj"]).drop(columns=["date_obj"]).reset_index(drop=True)
+    df.insert(0, "id", range(1, len(df) + 1))
+
+    for col in ["current_year", "previous_year"]:
+        df[col] = pd.to_numeric(df[col], errors="coerce").round(0)
+    return df
+
+
+def hang_current_year(df: pd.DataFrame, source: pd.DataFrame) -> pd.DataFrame:
+    """Step 88: current_year = NaN where the current-year line should not be drawn."""
+    src_required = ["basinfamily", "date_iso", "fishperday"]
+    missing_src = [c for c in src_required if c not in source.columns]
+    if missing_src:
+        raise ValueError(f"❌ Missing required columns in Escapement_PlotPipeline: {missing_src}")
+
+    src = source[src_required].copy()
+    src["basinfamily"] = src["basinfamily"].astype(str).str.strip()
+    src["date_iso"] = pd.to_datetime(src["date_iso"], errors="coerce")
+    src["fishperday"] = pd.to_numeric(src["fishperday"], errors="coerce")
+
+    current_year = pd.Timestamp.today().year
+    src = src[src["date_iso"].dt.year == current_year]
+    src["has_fish"] = src["fishperday"] > 0
+    reported = src.groupby("basinfamily", as_index=False).agg(
+        last_reported_date=("date_iso", "max"),
+        has_fish=("has_fish", "any"),
+    )
+    reported["last_date_obj"] = _date_obj(reported["last_reported_date"].dt.strftime("%m-%d"))
+
+    series = (df["river"] + " - " + df["Species_Plot"]).to_frame("basinfamily")
+    window = series.merge(reported[["basinfamily", "last_date_obj", "has_fish"]], on="basinfamily", how="left")
+
+    has_fish = window["has_fish"].eq(True).to_numpy()
+    future = window["last_date_obj"].notna().to_numpy() & (_date_obj(df["MM-DD"]).to_numpy() > window["last_date_obj"].to_numpy())
+    df["current_year"] = df["current_year"].where(has_fish & ~future)
+    return df
+
+
+def build_plot_data(weekly: pd.DataFrame, source: pd.DataFrame) -> tuple[pd.DataFrame, list[tuple[str, float]]]:
+    """Run every stage in memory. Returns (plot data, [(stage, seconds), ...])."""
+    stages = [
+        ("78/79 weekly → wide", weekly_to_wide),
+        ("80/81 river + Species_Plot", split_identifier),
+        ("82 Pink correction", pink_correction),
+        ("85 Snohomish rows", add_snohomish),
+        ("86 reorg + id", reorg),
+        ("87 01-01 wraparound", wraparound),
+        ("88 hang current year", lambda df: hang_current_year(df, source)),
+    ]
+    timings = []
+    df = weekly
+    for label, stage in stages:
+        started = time.perf_counter()
+        df = stage(df)
+        timings.append((label, time.perf_counter() - started))
+    return df, timings
+
+
+def main():
+    # ------------------------------------------------------------
+    # LOAD DATA
+    # ------------------------------------------------------------
+    with connection(db_path) as conn:
+        weekly = pd.read_sql_query(f"SELECT * FROM {WEEKLY_TABLE};", conn)
+        source = pd.read_sql_query("SELECT basinfamily, date_iso, fishperday FROM Escapement_PlotPipeline;", conn)
+    print(f"✅ Loaded {len(weekly):,} rows from {WEEKLY_TABLE}")
+    print(f"✅ Loaded {len(source):,} rows from Escapement_PlotPipeline")
+
+    df, timings = build_plot_data(weekly, source)
+
+    # ------------------------------------------------------------
+    # WRITE OUTPUT TABLE (once)
+    # ------------------------------------------------------------
+    started = time.perf_counter()
+    with connection(db_path) as conn:
+        df.to_sql(PLOT_TABLE, conn, if_exists="replace", index=False)
+    timings.append(("write", time.perf_counter() - started))
+
+    # ------------------------------------------------------------
+    # SUMMARY
+    # ------------------------------------------------------------
+    print("⏱️ Stage timings:")
+    for label, seconds in timings:
+        print(f"   {label:<28} {seconds * 1000:8.1f} ms")
+    print(f"   {'total':<28} {sum(s for _, s in timings) * 1000:8.1f} ms")
+
+    print(f"✅ Step 78 complete — {PLOT_TABLE} written.")
+    print(f"📊 Rows: {len(df):,}")
+    print(f"🔢 Columns: {list(df.columns)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,730 @@
+"""
+step7_parse_lines.py
+------------------------------------------------------------
+Parse every raw text_line in Escapement_PlotPipeline in ONE ordered pass.
+
+Replaces the old per-column steps 7–24, which each re-read the whole
+table, applied one rule per row and wrote it back with an UPDATE sweep.
+The rules themselves are unchanged and kept below, grouped by the step
+they came from:
+
+     7  date                    16  TL6
+     8  stock_presence          17  Stock_BO
+     9  stock_presence_lower    18  facility
+    10  Hatchery_Name           19  species
+    11  TL2                     20  Family
+    12  TL3                     21  date_iso
+    13  count_data              22  Stock
+    14  TL4                     23  11 count columns
+    15  TL5                     24  basin
+
+Row context is handled while streaming (ordered by id):
+    • stock_presence_lower looks at the previous row
+    • Stock_BO receives the NEXT row's TL6, so each row is written
+      one row behind the read
+    • species is inherited from the last species header line
+
+The result is written once into a freshly declared table that replaces
+Escapement_PlotPipeline. Count columns are INTEGER and date_iso is DATE
+(pipeline_schema.py); everything else parsed here is TEXT.
+"""
+
+import re
+import sqlite3
+import sys
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+
+# ------------------------------------------------------------
+# Paths
+# ------------------------------------------------------------
+CURRENT_DIR = Path(__file__).resolve().parent
+BACKEND_ROOT = CURRENT_DIR.parent
+DB_DIR = BACKEND_ROOT / "0_db"
+DB_PATH = DB_DIR / "local.db"
+
+print(f"🗄️ Using DB → {DB_PATH}")
+
+# ------------------------------------------------------------
+# Import lookup maps
+# ------------------------------------------------------------
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.append(str(BACKEND_ROOT))
+if str(CURRENT_DIR) not in sys.path:
+    sys.path.append(str(CURRENT_DIR))
+
+from common.sqlite_manager import connect
+import report_store
+from pipeline_schema import COUNT_COLS, SQL_TYPES
+
+try:
+    from lookup_maps import (
+        basin_map,
+        family_map,
+        hatch_name_map,
+        hatchery_name_corrections as corrections,
+        species_headers,
+    )
+except Exception as e:
+    raise RuntimeError(f"❌ Could not import lookup_maps.py: {e}")
+
+# Case-insensitive lookups (steps 19, 20)
+species_lookup = {s.lower(): s for s in species_headers}
+fam_lookup = {k.lower(): v for k, v in family_map.items()}
+
+TABLE = "Escapement_PlotPipeline"
+WRITE_BATCH = 5000
+
+RAW_COLS = ["id", "report_id", "line_order", "pdf_name", "page_num", "text_line"]
+
+PARSED_COLS = [
+    "date",
+    "stock_presence",
+    "stock_presence_lower",
+    "Hatchery_Name",
+    "TL2",
+    "TL3",
+    "count_data",
+    "TL4",
+    "TL5",
+    "TL6",
+    "Stock_BO",
+    "facility",
+    "species",
+    "Family",
+    "date_iso",
+    "Stock",
+    *COUNT_COLS,
+    "basin",
+]
+
+OUTPUT_COLS = RAW_COLS + PARSED_COLS
+
+
+def create_table_sql(table: str) -> str:
+    """Declared schema, same column order the old ALTER TABLE steps produced."""
+    columns = [
+        "id INTEGER PRIMARY KEY AUTOINCREMENT",
+        "report_id INTEGER",
+        "line_order INTEGER",
+        "pdf_name TEXT",
+        "page_num INTEGER",
+        "text_line TEXT",
+    ] + [f"{col} {SQL_TYPES.get(col, 'TEXT')}" for col in PARSED_COLS]
+    return f"CREATE TABLE {table} (\n    " + ",\n    ".join(columns) + "\n);"
+
+
+# ------------------------------------------------------------
+# Step 7 — date
+# ------------------------------------------------------------
+DATE_RE = re.compile(r"(\d{1,2}/\d{1,2}/\d{2,4})")
+
+def extract_date(text: str):
+    if not isinstance(text, str):
+        return None
+    m = DATE_RE.search(text)
+    return m.group(1) if m else None
+
+
+# ------------------------------------------------------------
+# Steps 8, 9 — stock_presence / stock_presence_lower
+# ------------------------------------------------------------
+STOCK_RE = re.compile(r"\b([HWUMC])\b")
+
+def find_stock_indicator(text: str):
+    if not isinstance(text, str):
+        return None
+    m = STOCK_RE.search(text)
+    return m.group(1) if m else None
+
+
+# ------------------------------------------------------------
+# Step 10 — Hatchery_Name
+# ------------------------------------------------------------
+STOPWORD_RE = re.compile(r"^(I-|SR-|HWY|US-|STOCK-)", re.IGNORECASE)
+GLUED_HATCHERY_RE = re.compile(r"(HATCHERY)(?=[A-Z]?[a-z])")
+GLUED_HATCHERY_LETTER_RE = re.compile(r"(HATCHERYP|HATCHERYF|HATCHERYR)(?=[A-Z]?[a-z])")
+HEADER_RE = re.compile(r"^(WDFW|CAUTION)\b", re.IGNORECASE)
+SPECIES_LINE_RE = re.compile(r"^[A-Z][a-z]+\s+Chinook")
+CAPITALIZED_RE = re.compile(r"^[A-Z][a-z]")
+UPPER_TOKEN_RE = re.compile(r"^[A-Z0-9&'()./-]+$")
+
+def extract_hatchery_name(text: str):
+    """
+    Extracts ≥2 ALL-CAPS words at the start of text_line, obeying rules
+    from the original Step 5.
+    """
+    if not isinstance(text, str) or not text.strip():
+        return ""
+
+    line = text.strip()
+
+    # Fix glued forms like HATCHERYPriest
+    line = GLUED_HATCHERY_RE.sub(r"\1 ", line)
+    line = GLUED_HATCHERY_LETTER_RE.sub(
+        lambda m: m.group(1)[:-1] + " " + m.group(1)[-1],
+        line,
+    )
+
+    # Skip irrelevant headers
+    if HEADER_RE.match(line):
+        return ""
+    if SPECIES_LINE_RE.match(line):
+        return ""
+
+    words = line.split()
+    capture = []
+
+    for w in words:
+        # stop when lowercase-starting or location prefix
+        if CAPITALIZED_RE.match(w):
+            break
+        if STOPWORD_RE.match(w):
+            break
+
+        # Only uppercase tokens
+        if UPPER_TOKEN_RE.match(w):
+            capture.append(w)
+        else:
+            break
+
+    if len(capture) >= 2:
+        return " ".join(capture)
+
+    return ""
+
+def apply_corrections(name: str):
+    if not isinstance(name, str) or not name.strip():
+        return name
+    return corrections.get(name.strip(), name.strip())
+
+
+# ------------------------------------------------------------
+# Step 11 — TL2
+# ------------------------------------------------------------
+def build_tl2(text, hatchery, date):
+    if not isinstance(text, str):
+        text = ""
+    if not isinstance(hatchery, str):
+        hatchery = ""
+    if not isinstance(date, str):
+        date = ""
+
+    text = text.strip()
+    hatchery = hatchery.strip()
+    date = date.strip()
+
+    # TL2 only active if a date exists
+    if not date or date.lower() == "nan":
+        return ""
+
+    # 1 — remove hatchery name at beginning
+    # (plain string ops: a per-row regex would be recompiled for every
+    #  hatchery/date pair)
+    if hatchery and text.startswith(hatchery):
+        text = text[len(hatchery):]
+    text = text.strip()
+
+    # 2 — remove date and everything after it
+    cut = text.find(date)
+    if cut != -1 and "\n" not in text:
+        text = text[:cut]
+    elif cut != -1:
+        text = re.sub(rf"\s*{re.escape(date)}.*$", "", text)
+
+    return text.strip()
+
+
+# ------------------------------------------------------------
+# Step 12 — TL3
+# ------------------------------------------------------------
+TL3_TOKEN_RE = re.compile(r"\d[\d,]*|-")
+
+def extract_TL3(tl2: str) -> str:
+    """Return last 11 numeric/dash tokens from TL2."""
+    if not isinstance(tl2, str) or tl2.strip() == "":
+        return ""
+
+    # Grab all tokens that are:
+    #   - numbers (possibly with commas)
+    #   - dash '-'
+    tokens = TL3_TOKEN_RE.findall(tl2)
+
+    if not tokens:
+        return ""
+
+    # Take last 11 tokens
+    selected = tokens[-11:]
+    return " ".join(selected)
+
+
+# ------------------------------------------------------------
+# Step 13 — count_data
+# ------------------------------------------------------------
+def normalize_count_data(tl3: str) -> str:
+    """
+    Convert TL3 string into normalized space-separated numbers:
+      • '-' → 0
+      • remove commas in numbers
+      • keep token order
+    """
+    if not isinstance(tl3, str) or not tl3.strip():
+        return ""
+
+    tokens = re.split(r"\s+", tl3.strip())
+    normalized = []
+
+    for t in tokens:
+        if t == "-":
+            normalized.append("0")
+        else:
+            cleaned = t.replace(",", "")
+            # If cleaned string is numeric, accept it; otherwise treat as 0
+            if cleaned.isdigit():
+                normalized.append(cleaned)
+            else:
+                normalized.append("0")
+
+    return " ".join(normalized)
+
+
+# ------------------------------------------------------------
+# Step 14 — TL4
+# ------------------------------------------------------------
+def make_TL4(tl2: str, tl3: str) -> str:
+    """
+    Remove only the last 11 numeric/dash tokens from TL2.
+    Keep everything else intact.
+    """
+    if not isinstance(tl2, str) or not tl2.strip():
+        return ""
+    if not isinstance(tl3, str) or not tl3.strip():
+        return ""
+
+    # Standardize for token counting
+    t2 = tl2.strip().replace(",", "")
+    tokens = t2.split()
+
+    # Defensive: if fewer than 11 tokens, do not modify
+    if len(tokens) <= 11:
+        return tl2.strip()
+
+    # Remove numeric tail (last 11 tokens)
+    tl4_tokens = tokens[:-11]
+    result = " ".join(tl4_tokens)
+
+    # Only remove trailing whitespace, not hyphens or punctuation
+    result = re.sub(r"\s+$", "", result)
+
+    return result
+
+
+# ------------------------------------------------------------
+# Step 15 — TL5
+# ------------------------------------------------------------
+def make_tl5(text_line: str, spl: str) -> str:
+    """
+    TL5 = text_line if stock_presence_lower exists and is non-empty.
+    Otherwise TL5 = "".
+    """
+    if isinstance(spl, str) and spl.strip():
+        return str(text_line).strip()
+    return ""
+
+
+# ------------------------------------------------------------
+# Step 16 — TL6
+# ------------------------------------------------------------
+cleanup_before_stock = [
+    "WYNOOCHEE R DAM ",
+    "WEIR ",
+    "HATCHERY ",
+    "",
+    "",
+    "",
+    "",
+    "",
+]
+
+STOCK_RIVER_RE = re.compile(r"\b(Stock-|River-)")
+LEADING_JUNK_RE = re.compile(r"^.*?\b(Stock-|River-)")
+CLEANUP_BEFORE_STOCK_RE = re.compile(
+    r"^(?:" + "|".join(map(re.escape, cleanup_before_stock)) + r")+(?=(Stock-|River-))"
+)
+
+def make_TL6(tl5: str, spl: str) -> str:
+    """
+    Build TL6 using old 11_TL6.py logic.
+    """
+    if not isinstance(spl, str) or not spl.strip():
+        return ""
+    if not isinstance(tl5, str) or not tl5.strip():
+        return ""
+
+    # Step 1 — keep TL5 up to and including first stock letter
+    match = STOCK_RE.search(tl5)
+    if match:
+        tl6 = tl5[: match.end()].strip()
+    else:
+        tl6 = tl5.strip()
+
+    # Step 2 — remove known junk before Stock-/River-
+    tl6 = CLEANUP_BEFORE_STOCK_RE.sub("", tl6).strip()
+
+    # Step 3 — if leftover junk, isolate beginning at Stock-/River-
+    if STOCK_RIVER_RE.search(tl6):
+        tl6 = LEADING_JUNK_RE.sub(r"\1", tl6).strip()
+
+    return tl6
+
+
+# ------------------------------------------------------------
+# Step 17 — Stock_BO
+# ------------------------------------------------------------
+NAN_TOKEN_RE = re.compile(r"\b(?:nan|NaN|None)\b")
+
+def has_valid_date(date_val: str) -> bool:
+    if not isinstance(date_val, str):
+        return False
+    date_val = date_val.strip()
+    if not date_val or date_val.lower() in ("nan", "none"):
+        return False
+    return True
+
+def append_tl6(stock_bo: str, tl6: str) -> str:
+    """Phase 2: a wrapped stock line's TL6 joins the row above."""
+    new_val = f"{(stock_bo or '').strip()} {tl6}".strip()
+    new_val = " ".join(new_val.split())  # normalize spaces
+    # Remove standalone nan/None tokens only (preserve words like McKernan)
+    return NAN_TOKEN_RE.sub("", new_val).strip()
+
+def clean_stock_bo(stock_bo: str) -> str:
+    cleaned = NAN_TOKEN_RE.sub("", stock_bo or "")
+    return " ".join(cleaned.split()).strip()
+
+
+# ------------------------------------------------------------
+# Step 18 — facility
+# ------------------------------------------------------------
+def valid_date(val):
+    # Treat any non-empty stringified value as valid, except explicit nan/none markers.
+    val = "" if val is None else str(val)
+    val = val.strip()
+    if not val or val.lower() in ("nan", "none"):
+        return False
+    return True
+
+def lookup_facility(date_val, hatch_val) -> str:
+    date_val = (date_val or "").strip()
+    hatch_val = (hatch_val or "").strip()
+
+    # If no date → facility = ""
+    if not valid_date(date_val) or not hatch_val:
+        return ""
+    # case-insensitive lookup
+    return hatch_name_map.get(hatch_val.upper(), hatch_val.title()).strip()
+
+
+# ------------------------------------------------------------
+# Step 21 — date_iso
+# ------------------------------------------------------------
+ISO_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+def convert_to_iso(date_str):
+    """Convert MM/DD/YY, MM/DD/YYYY, or ISO-with-time → YYYY-MM-DD."""
+    if date_str is None:
+        return ""
+    if not isinstance(date_str, str):
+        date_str = str(date_str)
+    if not date_str.strip():
+        return ""
+
+    # Remove any time component (e.g., "2016-11-30 00:00:00" → "2016-11-30")
+    date_str = date_str.strip()
+    for sep in (" ", "T"):
+        if sep in date_str:
+            date_str = date_str.split(sep)[0]
+            break
+
+    # Already ISO? Keep just the date part.
+    if ISO_DATE_RE.match(date_str):
+        try:
+            return datetime.strptime(date_str, "%Y-%m-%d").strftime("%Y-%m-%d")
+        except ValueError:
+            return ""
+
+    # Try both possible formats
+    for fmt in ("%m/%d/%y", "%m/%d/%Y"):
+        try:
+            parsed = datetime.strptime(date_str, fmt)
+
+            # Fix two-digit future dates → assume 2000s
+            if parsed.year < 1950:
+                parsed = parsed.replace(year=parsed.year + 2000)
+
+            return parsed.strftime("%Y-%m-%d")
+        except ValueError:
+            pass
+
+    return ""
+
+
+# ------------------------------------------------------------
+# Step 22 — Stock
+# ------------------------------------------------------------
+STOCK_PATTERN = re.compile(r'(?:\b|[-\s])([HWUMC])\s*$', re.IGNORECASE)
+
+def extract_stock(val):
+    """Extract final stock indicator (H/W/U/M/C) from the end of Stock_BO."""
+    if not isinstance(val, str) or not val.strip():
+        return ""
+    match = STOCK_PATTERN.search(val.strip())
+    return match.group(1).upper() if match else ""
+
+
+# ------------------------------------------------------------
+# Step 23 — 11 count columns
+# ------------------------------------------------------------
+def parse_count_row(date_val, count_data_val):
+    """Return a list of 11 values (int or None)."""
+
+    # No date → all blank
+    if not date_val or str(date_val).strip() == "":
+        return [None] * 11
+
+    if not count_data_val or not str(count_data_val).strip():
+        return [None] * 11
+
+    tokens = re.split(r"\s+", str(count_data_val).strip())
+    clean_vals = []
+
+    for t in tokens:
+        t = t.replace(",", "")
+        if t in ("", "-", "--"):
+            clean_vals.append(None)
+        else:
+            try:
+                clean_vals.append(int(t))  # whole number only
+            except Exception:
+                clean_vals.append(None)
+
+    # Adjust length
+    if len(clean_vals) < 11:
+        clean_vals += [None] * (11 - len(clean_vals))
+    elif len(clean_vals) > 11:
+        return [None] * 11
+
+    return clean_vals
+
+
+# ------------------------------------------------------------
+# Step 24 — basin
+# ------------------------------------------------------------
+def lookup_basin(hatch_name: str):
+    """Case-insensitive basin lookup."""
+    if not isinstance(hatch_name, str) or not hatch_name.strip():
+        return ""
+    return basin_map.get(hatch_name.strip().upper(), "").strip()
+
+
+# ------------------------------------------------------------
+# Line engine
+# ------------------------------------------------------------
+def parse_line(raw: dict) -> dict:
+    """Row-local rules (everything that does not look at a neighbour)."""
+    text = raw["text_line"]
+
+    date = extract_date(text)
+    stock = None
+    if date is not None and date.strip() != "":
+        stock = find_stock_indicator(text)
+
+    hatchery = apply_corrections(extract_hatchery_name(text)) or None
+
+    tl2 = build_tl2(text, hatchery, date)
+    tl3 = extract_TL3(tl2)
+    tl4 = make_TL4(tl2, tl3)
+    count_data = normalize_count_data(tl3)
+
+    row = dict(raw)
+    row.update({
+        "date": date,
+        "stock_presence": stock,
+        "stock_presence_lower": None,
+        "Hatchery_Name": hatchery,
+        "TL2": tl2,
+        "TL3": tl3,
+        "count_data": count_data,
+        "TL4": tl4,
+        "TL5": "",
+        "TL6": "",
+        "Stock_BO": (tl4 or "").strip() if has_valid_date(date) else "",
+        "facility": lookup_facility(date, hatchery),
+        "date_iso": convert_to_iso(date or ""),
+        "basin": lookup_basin(hatchery),
+    })
+    row.update(zip(COUNT_COLS, parse_count_row(date, count_data)))
+    return row
+
+
+def finish_row(row: dict) -> tuple:
+    """Finalize Stock_BO/Stock once the next row has been seen."""
+    row["Stock_BO"] = clean_stock_bo(row["Stock_BO"])
+    row["Stock"] = extract_stock(row["Stock_BO"])
+    return tuple(row[col] for col in OUTPUT_COLS)
+
+
+def parse_lines(raw_rows, stats=None, context=None):
+    """
+    Stream raw rows (ordered by id) → output tuples in OUTPUT_COLS order.
+
+    Output lags the input by one row, because a wrapped stock line
+    (stock_presence_lower) completes the Stock_BO of the row above it.
+
+    `context` is the already-parsed line just before the first raw row
+    (incremental runs, see report_store.py). It seeds the species carry
+    and is only re-emitted if the first raw row appends to its Stock_BO.
+    """
+    if stats is None:
+        stats = {}
+    stats.update({"rows": 0, "appended": 0})
+
+    species = ""
+    prev = None
+    seed = None
+    if context is not None:
+        prev = seed = dict(context)
+        species = seed.get("species") or ""
+
+    for raw in raw_rows:
+        row = parse_line(raw)
+        stats["rows"] += 1
+
+        # Step 9 — date without stock letter → next line carries it
+        if prev is not None:
+            has_date = prev["date"] not in (None, "", "nan")
+            has_stock = prev["stock_presence"] not in (None, "", "nan")
+            if has_date and not has_stock:
+                row["stock_presence_lower"] = find_stock_indicator(row["text_line"])
+
+        # Steps 15, 16 — TL5/TL6 for wrapped stock lines
+        spl = row["stock_presence_lower"]
+        row["TL5"] = make_tl5(row["text_line"], spl)
+        row["TL6"] = make_TL6(row["TL5"], spl)
+
+        # Steps 19, 20 — species headers carry forward
+        key = (row["text_line"] or "").strip().lower()
+        if key in species_lookup:
+            species = species_lookup[key]
+        row["species"] = species
+        species_key = species.strip()
+        row["Family"] = fam_lookup.get(species_key.lower(), "") if species_key else ""
+
+        # Step 17 phase 2 — append this row's TL6 to the row above
+        if prev is not None:
+            spl_val = (spl or "").strip()
+            tl6 = row["TL6"].strip()
+            appended = bool(spl_val and tl6 and tl6.lower() not in ("nan", "none"))
+            if appended:
+                prev["Stock_BO"] = append_tl6(prev["Stock_BO"], tl6)
+                stats["appended"] += 1
+            if prev is not seed or appended:
+                yield finish_row(prev)
+
+        prev = row
+
+    if prev is not None and prev is not seed:
+        yield finish_row(prev)
+
+
+# ------------------------------------------------------------
+# DB helpers
+# ------------------------------------------------------------
+def get_conn():
+    conn = connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def read_raw_rows(conn):
+    cur = conn.execute(f"""
+        SELECT {", ".join(RAW_COLS)}
+        FROM {TABLE}
+        ORDER BY id
+    """)
+    for r in cur:
+        yield dict(r)
+
+
+def write_parsed(conn, rows) -> int:
+    """Write all parsed rows into a new table and swap it in (one transaction)."""
+    tmp = f"{TABLE}__parsed"
+    placeholders = ", ".join("?" for _ in OUTPUT_COLS)
+    insert_sql = f"INSERT INTO {tmp} ({', '.join(OUTPUT_COLS)}) VALUES ({placeholders})"
+
+    written = 0
+    with conn:
+        conn.execute("BEGIN")
+        conn.execute(f"DROP TABLE IF EXISTS {tmp}")
+        conn.execute(create_table_sql(tmp))
+        while True:
+            batch = list(islice(rows, WRITE_BATCH))
+            if not batch:
+                break
+            conn.executemany(insert_sql, batch)
+            written += len(batch)
+        conn.execute(f"DROP TABLE {TABLE}")
+        conn.execute(f"ALTER TABLE {tmp} RENAME TO {TABLE}")
+    return written
+
+
+# ------------------------------------------------------------
+# Main
+# ------------------------------------------------------------
+def main():
+    print("🏗️ Step 7: Parsing text lines (date → basin) in one pass...")
+
+    # Read, parse and insert stream through the same connection; the
+    # source table is only dropped once the read cursor is exhausted.
+    stats = {}
+    conn = get_conn()
+    try:
+        # Incremental run: pick up species / stock-wrap state from the
+        # stored line just before this run's first line.
+        first_id = conn.execute(f"SELECT MIN(id) FROM {TABLE}").fetchone()[0]
+        context = report_store.context_row(conn, first_id)
+        if context is not None:
+            print(f"🔗 Continuing from stored line id {context['id']:,} (report {context['report_id']})")
+
+        written = write_parsed(conn, parse_lines(read_raw_rows(conn), stats, context))
+        summary = conn.execute(f"""
+            SELECT
+                SUM(date IS NOT NULL)                          AS dated,
+                SUM(COALESCE(Hatchery_Name, '') != '')         AS hatchery,
+                SUM(stock_presence_lower IS NOT NULL)          AS wrapped,
+                SUM(facility != '')                            AS facility,
+                SUM(species != '')                             AS species,
+                SUM(Stock != '')                               AS stock,
+                SUM(Adult_Total IS NOT NULL)                   AS counts,
+                SUM(basin != '')                               AS basin
+            FROM {TABLE}
+        """).fetchone()
+    finally:
+        conn.close()
+
+    print(f"📝 Wrote {written:,} parsed rows → {TABLE}")
+    print("📊 Populated:")
+    print(f"   • date:                 {summary['dated'] or 0:,}")
+    print(f"   • Hatchery_Name:        {summary['hatchery'] or 0:,}")
+    print(f"   • stock_presence_lower: {summary['wrapped'] or 0:,}  (TL6 appended {stats['appended']:,} times)")
+    print(f"   • facility:             {summary['facility'] or 0:,}")
+    print(f"   • species:              {summary['species'] or 0:,}")
+    print(f"   • Stock:                {summary['stock'] or 0:,}")
+    print(f"   • count columns:        {summary['counts'] or 0:,}")
+    print(f"   • basin:                {summary['basin'] or 0:,}")
+    print("✅ Step 7 complete — Escapement_PlotPipeline parsed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+step8_merge_reports.py
+------------------------------------------------------------
+Merge the freshly parsed reports into the parsed-line store and
+rebuild Escapement_PlotPipeline from the whole store.
+
+Steps 4–7 only touch reports that are new or whose PDF hash
+changed (see report_store.py). Everything from step 25 on works
+across reports (duplicates, iterations, daily/weekly roll-ups),
+so it needs the full archive back in the working table.
+"""
+
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+CURRENT_DIR = Path(__file__).resolve().parent
+if str(CURRENT_DIR) not in sys.path:
+    sys.path.append(str(CURRENT_DIR))
+
+from common.sqlite_manager import connect
+import report_store
+
+# ------------------------------------------------------------
+# Paths
+# ------------------------------------------------------------
+BACKEND_ROOT = CURRENT_DIR.parent
+DB_DIR = BACKEND_ROOT / "0_db"
+DB_PATH = DB_DIR / "local.db"
+
+print("🏗️ Step 8: Merging parsed reports into the store…")
+print(f"🗄️ Using DB → {DB_PATH}")
+
+
+# ------------------------------------------------------------
+# Main
+# ------------------------------------------------------------
+def main():
+    conn = connect(DB_PATH)
+    try:
+        stats = report_store.merge_pending(conn)
+        stored = conn.execute(
+            f"SELECT COUNT(*) FROM {report_store.REPORTS_TABLE}"
+        ).fetchone()[0]
+    finally:
+        conn.close()
+
+    print(f"🧩 Merged {stats['reports']:,} reports ({stats['added']:,} parsed lines)")
+    print(f"📚 Store now holds {stored:,} reports")
+    print(f"✅ {stats['total']:,} rows in {report_store.WORK_TABLE}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,6 @@ This replaces the remote table contents (truncate + insert).
 from __future__ import annotations
 
 from pathlib import Path
-import sqlite3
 import sys
 import os
 
@@ -21,6 +20,8 @@ BACKEND_ROOT = CURRENT_DIR.parent
 DB_PATH = BACKEND_ROOT / "0_db" / "local.db"
 sys.path.append(str(BACKEND_ROOT))
 
+from common.sqlite_manager import connection
+
 PLOTDATA_TABLE = "EscapementReport_PlotData"
 PIPELINE_TABLE = "Escapement_PlotPipeline"
 PIPELINE_COLUMNS = [
@@ -59,7 +60,7 @@ def get_supabase():
 def load_plotdata() -> pd.DataFrame:
     if not DB_PATH.exists():
         raise FileNotFoundError(f"❌ local.db not found at {DB_PATH}")
-    with sqlite3.connect(DB_PATH) as conn:
+    with connection(DB_PATH) as conn:
         return pd.read_sql_query(f"SELECT * FROM {PLOTDATA_TABLE};", conn)
 
 
@@ -67,7 +68,7 @@ def load_pipeline_subset() -> pd.DataFrame:
     if not DB_PATH.exists():
         raise FileNotFoundError(f"❌ local.db not found at {DB_PATH}")
     columns_sql = ", ".join(f'"{col}"' for col in PIPELINE_COLUMNS)
-    with sqlite3.connect(DB_PATH) as conn:
+    with connection(DB_PATH) as conn:
         return pd.read_sql_query(
             f"SELECT {columns_sql} FROM {PIPELINE_TABLE};",
             conn,
@@ -91,7 +92,7 @@ def coerce_int_columns(df: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
 def get_local_max_pdf_date() -> str | None:
     if not DB_PATH.exists():
         raise FileNotFoundError(f"❌ local.db not found at {DB_PATH}")
-    with sqlite3.connect(DB_PATH) as conn:
+    with connection(DB_PATH) as conn:
         cur = conn.execute(
             """
             SELECT MAX(pdf_date)
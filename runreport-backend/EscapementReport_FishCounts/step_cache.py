@@ -0,0 +1,393 @@
+"""
+step_cache.py
+------------------------------------------------------------
+Step-level memoization for the Escapement runner.
+
+A step whose inputs and code are unchanged since an earlier run does
+not need to run again: the runner restores the output it produced
+last time instead. Each cacheable step declares the tables it reads
+and writes in STEP_IO. Its key (fingerprint) is a SHA-256 over:
+
+    - the step's source file, the shared modules next to it
+      (segmentation.py, pipeline_schema.py, ...), common/*.py and
+      lookup_maps.py
+    - every declared input table: a content hash over the declared
+      columns (all columns if none are declared), plus column names
+      and dtypes
+    - the current year (steps 33/63/64/76/78 compare against it)
+    - ESCAPEMENT_* environment overrides
+    - how the step runs ("frame" = transform(df) in memory,
+      "script" = the file against SQLite)
+
+Cache layout (0_db/step_cache/<step stem>/<fingerprint>/, next to
+local.db so RUNREPORT_DB_DIR moves it too):
+
+    record.json     step, created_at, output tables + row counts
+    <table>.pkl     frame steps: the output DataFrame
+    outputs.db      script steps: output tables copied with their
+                    CREATE TABLE / CREATE INDEX statements
+
+A hit touches record.json; after every store the least recently used
+entries are removed until the cache fits in ESCAPEMENT_STEP_CACHE_MB
+(default 512 MB).
+
+Not cached: steps 2–8 (downloads, PDF parsing and the incremental
+report store keep their own state), steps 25/26 (one DELETE each —
+cheaper than a snapshot), step 50 (ManualRuleResults must record
+every run) and step 90 (Supabase export).
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+from common.sqlite_manager import connect, resolve_db_path
+import pipeline_schema
+from daily_counts import (
+    BASINFAMILY_TABLE,
+    DAILY_TABLE,
+    FINGERPRINT_COLS,
+    YEAR_SOURCES_TABLE,
+    YEARLY_TABLE,
+)
+
+CURRENT_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = CURRENT_DIR.parent
+CACHE_DIR = resolve_db_path("local.db").parent / "step_cache"
+MAX_BYTES = int(float(os.environ.get("ESCAPEMENT_STEP_CACHE_MB", 512)) * 1024 * 1024)
+
+# Env overrides that only control the cache itself (not step output).
+CACHE_ENV = {"ESCAPEMENT_STEP_CACHE_MB"}
+
+PIPELINE = pipeline_schema.TABLE
+WEEKLY_TABLE = "EscapementReports_weeklycounts"
+PLOT_TABLE = "EscapementReport_PlotData"
+
+# filename → {"inputs": {table: columns or None (= all)}, "outputs": [tables]}
+_PIPELINE_ONLY = {"inputs": {PIPELINE: None}, "outputs": [PIPELINE]}
+
+STEP_IO = {
+    "step27_columnreorg.py": _PIPELINE_ONLY,
+    "step28_pdf_date.py": _PIPELINE_ONLY,
+    "step29_duplicates_delete.py": _PIPELINE_ONLY,
+    "step30_row_reorder.py": _PIPELINE_ONLY,
+    "step31_date_AT_same_remove.py": _PIPELINE_ONLY,
+    "step32_datesame_ATdiff_remove.py": _PIPELINE_ONLY,
+    "step33_iterate_cleanup.py": _PIPELINE_ONLY,
+    "step51_iteration_f.py": _PIPELINE_ONLY,
+    "step52_Iteration_plot.py": _PIPELINE_ONLY,
+    "step53_column_reorg.py": _PIPELINE_ONLY,
+    "step60_remove_Columbia.py": _PIPELINE_ONLY,
+    "step61_remove_Snake.py": _PIPELINE_ONLY,
+    "step62_remove_MC.py": _PIPELINE_ONLY,
+    "step63_remove_AD0.py": _PIPELINE_ONLY,
+    "step64_remove_old.py": _PIPELINE_ONLY,
+    "step65_remove_Speelyai.py": _PIPELINE_ONLY,
+    "step70_fishperday.py": _PIPELINE_ONLY,
+    "step71_locationmarking.py": _PIPELINE_ONLY,
+    "step72_year.py": _PIPELINE_ONLY,
+    "step73_remove_basinfamily.py": _PIPELINE_ONLY,
+    "step74_count_days.py": _PIPELINE_ONLY,
+    "step75_tablegen.py": {
+        "inputs": {PIPELINE: ["basinfamily"]},
+        "outputs": [BASINFAMILY_TABLE, DAILY_TABLE],
+    },
+    "step76_tablefill.py": {
+        "inputs": {
+            PIPELINE: FINGERPRINT_COLS,
+            BASINFAMILY_TABLE: None,
+            YEARLY_TABLE: None,
+            YEAR_SOURCES_TABLE: None,
+        },
+        "outputs": [DAILY_TABLE, YEARLY_TABLE, YEAR_SOURCES_TABLE],
+    },
+    "step77_weekly.py": {
+        "inputs": {DAILY_TABLE: None, BASINFAMILY_TABLE: None},
+        "outputs": [WEEKLY_TABLE],
+    },
+    "step78_plot_data.py": {
+        "inputs": {WEEKLY_TABLE: None, PIPELINE: ["basinfamily", "date_iso", "fishperday"]},
+        "outputs": [PLOT_TABLE],
+    },
+}
+
+
+def is_cacheable(filename: str) -> bool:
+    return filename in STEP_IO
+
+
+# ------------------------------------------------------------
+# Fingerprints
+# ------------------------------------------------------------
+# Input digests are kept for the whole run in `known`
+# ("<kind>:<table>:<columns>" → digest; kind is "frame" for the
+# in-memory frame, "sqlite" for the stored table). A step's record
+# carries the digests of its outputs, so after a hit the next step's
+# key is built without hashing its inputs again.
+
+def _code_files(filename: str) -> list[Path]:
+    """The step file, the shared (non-step) modules next to it, common/ and lookup_maps.py."""
+    shared = [
+        p for p in CURRENT_DIR.glob("*.py")
+        if not p.name.startswith(("step", "bench_", "tester"))
+    ]
+    common = list((BACKEND_DIR / "common").glob("*.py"))
+    return [CURRENT_DIR / filename, *sorted(shared), *sorted(common), BACKEND_DIR / "lookup_maps.py"]
+
+
+def _digest_key(kind: str, table: str, columns: list[str] | None = None) -> str:
+    return f"{kind}:{table}:{','.join(columns) if columns else '*'}"
+
+
+def _column_sets(table: str) -> list[list[str] | None]:
+    """Every column list some step declares for table (None = all columns)."""
+    sets = [None]
+    for io in STEP_IO.values():
+        columns = io["inputs"].get(table)
+        if columns and columns not in sets:
+            sets.append(columns)
+    return sets
+
+
+def frame_digest(df: pd.DataFrame | None, columns: list[str] | None = None) -> str:
+    """Content hash of a frame (row order matters), or "missing" for an absent table."""
+    if df is None:
+        return "missing"
+    if columns is not None:
+        df = df[[c for c in columns if c in df.columns]]
+    h = hashlib.sha256()
+    h.update(json.dumps([len(df), [[c, str(t)] for c, t in df.dtypes.items()]]).encode())
+    if len(df.columns):
+        h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def read_table(conn, table: str) -> pd.DataFrame | None:
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone()
+    if not exists:
+        return None
+    return pd.read_sql_query(f'SELECT * FROM "{table}" ORDER BY rowid;', conn)
+
+
+def table_digests(conn, table: str) -> dict[str, str]:
+    """Digests of a stored table for every declared column list (one read)."""
+    df = read_table(conn, table)
+    return {_digest_key("sqlite", table, cols): frame_digest(df, cols) for cols in _column_sets(table)}
+
+
+def forget(known: dict[str, str], tables, kind: str | None = None):
+    """Drop the digests of tables that were just rewritten."""
+    prefixes = tuple(f"{k}:{t}:" for t in tables for k in ([kind] if kind else ["frame", "sqlite"]))
+    for k in [k for k in known if k.startswith(prefixes)]:
+        del known[k]
+
+
+def step_key(filename: str, mode: str, input_digests: dict[str, str]) -> str:
+    h = hashlib.sha256()
+    h.update(f"{filename}|{mode}|{datetime.now().year}".encode())
+    for path in _code_files(filename):
+        h.update(path.name.encode())
+        h.update(path.read_bytes() if path.exists() else b"missing")
+    env = sorted(
+        (k, v) for k, v in os.environ.items() if k.startswith("ESCAPEMENT_") and k not in CACHE_ENV
+    )
+    h.update(json.dumps(env).encode())
+    h.update(json.dumps(sorted(input_digests.items())).encode())
+    return h.hexdigest()
+
+
+def script_key(filename: str, db_path: Path, known: dict[str, str]) -> str:
+    """Key for a step run as a script: inputs are read from SQLite."""
+    inputs = STEP_IO[filename]["inputs"]
+    wanted = {table: _digest_key("sqlite", table, cols) for table, cols in inputs.items()}
+    missing = [table for table, k in wanted.items() if k not in known]
+    if missing:
+        conn = connect(db_path)
+        try:
+            for table in missing:
+                known.update(table_digests(conn, table))
+        finally:
+            conn.close()
+    return step_key(filename, "script", {k: known[k] for k in wanted.values()})
+
+
+def frame_key(filename: str, table: str, load_frame, known: dict[str, str]) -> str:
+    """Key for a frame step: its only input is the in-memory working frame."""
+    k = _digest_key("frame", table)
+    if k not in known:
+        known[k] = frame_digest(load_frame())
+    return step_key(filename, "frame", {k: known[k]})
+
+
+# ------------------------------------------------------------
+# Entries
+# ------------------------------------------------------------
+def _entry_dir(filename: str, key: str) -> Path:
+    return CACHE_DIR / Path(filename).stem / key
+
+
+def lookup(filename: str, key: str) -> dict | None:
+    """Return the stored record for key (marking it recently used), or None."""
+    record_path = _entry_dir(filename, key) / "record.json"
+    if not record_path.exists():
+        return None
+    try:
+        record = json.loads(record_path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return None
+    os.utime(record_path)
+    return record
+
+
+def _write_record(entry: Path, filename: str, key: str, outputs: dict, digests: dict[str, str]):
+    record = {
+        "step": filename,
+        "key": key,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "outputs": outputs,
+        "digests": digests,
+    }
+    (entry / "record.json").write_text(json.dumps(record, indent=2))
+
+
+def _fresh_entry(filename: str, key: str) -> Path:
+    entry = _entry_dir(filename, key)
+    if entry.exists():
+        shutil.rmtree(entry)
+    entry.mkdir(parents=True)
+    return entry
+
+
+def store_frame(filename: str, key: str, table: str, df: pd.DataFrame, known: dict[str, str]):
+    entry = _fresh_entry(filename, key)
+    df.to_pickle(entry / f"{table}.pkl")
+    digests = {_digest_key("frame", table): frame_digest(df)}
+    _write_record(entry, filename, key, {table: len(df)}, digests)
+    forget(known, [table])
+    known.update(digests)
+    evict()
+
+
+def restore_frame(filename: str, key: str, table: str, record: dict, known: dict[str, str]) -> pd.DataFrame:
+    df = pd.read_pickle(_entry_dir(filename, key) / f"{table}.pkl")
+    forget(known, [table])
+    known.update(record["digests"])
+    return df
+
+
+def _schema_sql(conn, schema: str, table: str) -> list[str]:
+    """CREATE TABLE followed by CREATE INDEX statements for table."""
+    rows = conn.execute(
+        f"SELECT sql FROM {schema}.sqlite_master "
+        "WHERE tbl_name = ? AND sql IS NOT NULL ORDER BY type = 'index', name",
+        (table,),
+    ).fetchall()
+    return [sql for (sql,) in rows]
+
+
+def copy_table(conn, src: str, table: str):
+    """Replace main.<table> with <src>.<table> (schema, indexes and rows)."""
+    statements = _schema_sql(conn, src, table)
+    conn.execute(f'DROP TABLE IF EXISTS main."{table}"')
+    if not statements:
+        return None
+    for sql in statements:
+        conn.execute(sql)
+    conn.execute(f'INSERT INTO main."{table}" SELECT * FROM {src}."{table}"')
+    return conn.execute(f'SELECT COUNT(*) FROM main."{table}"').fetchone()[0]
+
+
+def store_tables(filename: str, key: str, db_path: Path, known: dict[str, str]):
+    """Snapshot the step's output tables from db_path."""
+    outputs_list = STEP_IO[filename]["outputs"]
+    entry = _fresh_entry(filename, key)
+    # outputs.db is this entry's private file, not the shared local.db, so
+    # it gets a plain sqlite3 connection (no WAL / shared pragmas).
+    conn = sqlite3.connect(entry / "outputs.db")
+    try:
+        conn.execute("ATTACH DATABASE ? AS src", (str(resolve_db_path(db_path)),))
+        with conn:
+            outputs = {table: copy_table(conn, "src", table) for table in outputs_list}
+        conn.execute("DETACH DATABASE src")
+        digests = {}
+        for table in outputs_list:
+            digests.update(table_digests(conn, table))
+    finally:
+        conn.close()
+    _write_record(entry, filename, key, outputs, digests)
+    forget(known, outputs_list)
+    known.update(digests)
+    evict()
+
+
+def restore_tables(filename: str, key: str, db_path: Path, record: dict, known: dict[str, str]):
+    """Write the snapshot's output tables back into db_path."""
+    outputs_list = STEP_IO[filename]["outputs"]
+    conn = connect(db_path)
+    try:
+        conn.execute("ATTACH DATABASE ? AS snap", (str(_entry_dir(filename, key) / "outputs.db"),))
+        with conn:
+            for table in outputs_list:
+                copy_table(conn, "snap", table)
+        conn.execute("DETACH DATABASE snap")
+    finally:
+        conn.close()
+    forget(known, outputs_list)
+    known.update(record["digests"])
+
+
+# ------------------------------------------------------------
+# Eviction (bounded by disk usage)
+# ------------------------------------------------------------
+def _entries() -> list[tuple[float, int, Path]]:
+    """(last used, size in bytes, dir) for every entry."""
+    entries = []
+    if not CACHE_DIR.exists():
+        return entries
+    for record_path in CACHE_DIR.glob("*/*/record.json"):
+        entry = record_path.parent
+        size = sum(p.stat().st_size for p in entry.iterdir() if p.is_file())
+        entries.append((record_path.stat().st_mtime, size, entry))
+    return entries
+
+
+def evict(max_bytes: int = MAX_BYTES) -> int:
+    """Remove least recently used entries until the cache fits max_bytes."""
+    entries = sorted(_entries())
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, entry in entries:
+        if total <= max_bytes:
+            break
+        shutil.rmtree(entry, ignore_errors=True)
+        total -= size
+        removed += 1
+    if removed:
+        print(f"🧹 Step cache: evicted {removed} entr{'y' if removed == 1 else 'ies'} "
+              f"→ {total / 1024 / 1024:.1f} MB (limit {max_bytes / 1024 / 1024:.0f} MB)")
+    return removed
+
+
+def clear():
+    """Drop every cached step output."""
+    if CACHE_DIR.exists():
+        shutil.rmtree(CACHE_DIR)
+
+
+def describe(record: dict) -> str:
+    """Short 'created …, table rows' summary for log lines."""
+    age = time.time() - datetime.fromisoformat(record["created_at"]).timestamp()
+    outputs = ", ".join(
+        f"{table} {rows:,} rows" if rows is not None else f"{table} (absent)"
+        for table, rows in record["outputs"].items()
+    )
+    return f"stored {age / 60:.0f} min ago — {outputs}"
@@ -3,10 +3,16 @@
 # Quick test script: export Escapement_PlotPipeline to CSV
 # ------------------------------------------------------------
 
-import sqlite3
+import sys
 import pandas as pd
 from pathlib import Path
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connect
+
 print("📤 Exporting Escapement_PlotPipeline → Escapement_PlotPipeline.csv")
 
 # ------------------------------------------------------------
@@ -22,7 +28,7 @@ print(f"🗄️ Reading DB → {db_path}")
 # ------------------------------------------------------------
 # LOAD FROM DB
 # ------------------------------------------------------------
-conn = sqlite3.connect(db_path)
+conn = connect(db_path)
 df = pd.read_sql_query("SELECT * FROM Escapement_PlotPipeline;", conn)
 conn.close()
 
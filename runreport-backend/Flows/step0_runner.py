@@ -7,10 +7,15 @@ Runs Step 1 through Step 17 (or a selected range) by executing each
 step script in order. Steps read/write tables in:
     runreport-backend/0_db/local.db
 
+Each run is recorded step by step in pipeline_runs /
+pipeline_run_steps (common/telemetry.py), with the row counts of the
+step's input and output tables (STEP_ROWS) before and after it runs.
+
 Usage:
     python3 step0_runner.py
     python3 step0_runner.py --start 7 --end 12
     python3 step0_runner.py --list
+    python3 step0_runner.py --report
 """
 
 from __future__ import annotations
@@ -26,6 +31,11 @@ from pathlib import Path
 # Ensure imports resolve when run from anywhere
 CURRENT_DIR = Path(__file__).resolve().parent
 sys.path.append(str(CURRENT_DIR))
+if str(CURRENT_DIR.parent) not in sys.path:
+    sys.path.insert(0, str(CURRENT_DIR.parent))
+
+from common import telemetry
+from common.sqlite_manager import connect
 
 STEP_FILES: list[tuple[str, str]] = [
     ("Step 1: Collect rivers", "step1_collectrivers.py"),
@@ -49,6 +59,33 @@ STEP_FILES: list[tuple[str, str]] = [
     ("Step 21: Manual timestamp cleanup", "step21_manualdeletions.py"),
 ]
 
+# Tables whose row counts are recorded as rows_in / rows_out (summed
+# when a step works on several). Steps 1, 2 and 7 build their table
+# from the web, so they have no input table.
+FLOWS = ("Flows",)
+FLOW_TABLES = ("NOAA_flows", "USGS_flows")
+STEP_ROWS: dict[str, tuple[tuple[str, ...], tuple[str, ...]]] = {
+    "step1_collectrivers.py": ((), FLOWS),
+    "step2_USGSsites.py": ((), ("Flows_USGSsites",)),
+    "step3_rivername.py": (("Flows_USGSsites",), ("Flows_USGSsites_rivername",)),
+    "step4_merge1.py": (FLOWS, FLOWS),
+    "step5_flowpresence.py": (FLOWS, FLOWS),
+    "step6_NOAAsites.py": (FLOWS, ("Flows_NOAAsites",)),
+    "step7_NOAA_completelist.py": ((), ("Flows_NOAA_completelist",)),
+    "step8_delete_states.py": (("Flows_NOAA_completelist",), ("Flows_NOAA_completelist",)),
+    "step9_NOAA_SiteID.py": (("Flows_NOAA_completelist",), ("Flows_NOAA_completelist",)),
+    "step10_NOAAmerge.py": (("Flows_NOAAsites",), ("Flows_NOAAsites",)),
+    "step11_merge2.py": (FLOWS, FLOWS),
+    "step12_flowpresence2.py": (FLOWS, FLOWS),
+    "step13_manualNOAA.py": (FLOWS, FLOWS),
+    "step14_delete.py": (FLOWS, FLOWS),
+    "step15_USGSflow.py": (FLOWS, ("USGS_flows",)),
+    "step16_NOAAflow.py": (FLOWS, ("NOAA_flows",)),
+    "step17_NOAAupdate.py": (("NOAA_flows",), ("NOAA_flows",)),
+    "step20_removenegatives.py": (FLOW_TABLES, FLOW_TABLES),
+    "step21_manualdeletions.py": (FLOW_TABLES, FLOW_TABLES),
+}
+
 # ------------------------------------------------------------
 # 1Y WINDOW TOGGLE
 # ------------------------------------------------------------
@@ -63,6 +100,22 @@ def extract_step_number(label: str) -> int:
     return int(match.group(1))
 
 
+def count_rows(tables: tuple[str, ...]) -> int | None:
+    """Total rows across `tables`; None when none of them exists yet."""
+    if not tables:
+        return None
+    conn = connect("local.db")
+    try:
+        total = None
+        for table in tables:
+            exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone()
+            if exists:
+                total = (total or 0) + conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+        return total
+    finally:
+        conn.close()
+
+
 def run_step(label: str, filename: str) -> None:
     path = CURRENT_DIR / filename
     if not path.exists():
@@ -89,6 +142,7 @@ def main() -> int:
     parser.add_argument("--start", type=int, default=None, help="First step number to run (inclusive).")
     parser.add_argument("--end", type=int, default=None, help="Last step number to run (inclusive).")
     parser.add_argument("--list", action="store_true", help="List available steps and exit.")
+    parser.add_argument("--report", action="store_true", help="Show the slowest steps of the last run vs the run before and exit.")
     args = parser.parse_args()
 
     if args.list:
@@ -96,6 +150,9 @@ def main() -> int:
             print(f"{label} -> {filename}")
         return 0
 
+    if args.report:
+        return telemetry.report("flows")
+
     os.environ["FLOWS_INCLUDE_1Y"] = "1" if INCLUDE_1Y else "0"
 
     steps = iter_steps(args.start, args.end)
@@ -104,15 +161,22 @@ def main() -> int:
         return 1
 
     print("🌊🚀 Starting Flows Pipeline...\n")
-    for _, label, filename in steps:
+    recorder = telemetry.RunRecorder("flows")
+    for num, label, filename in steps:
         try:
-            run_step(label, filename)
+            in_tables, out_tables = STEP_ROWS.get(filename, ((), ()))
+            with recorder.step(num, label) as rec:
+                rec.rows_in = count_rows(in_tables)
+                run_step(label, filename)
+                rec.rows_out = count_rows(out_tables)
         except Exception as exc:
             print(f"⚠️  {label} failed: {exc}")
             traceback.print_exc()
+            recorder.finish("failed")
             print("🛑 Exiting Flows pipeline with code 0 to avoid immediate restart.")
             return 0
 
+    recorder.finish("ok")
     print("🎉 Flows Pipeline finished successfully.")
     return 0
 
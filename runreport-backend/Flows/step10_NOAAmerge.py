@@ -12,11 +12,17 @@
 # ------------------------------------------------------------
 
 import re
-import sqlite3
+import sys
 from pathlib import Path
 
 import pandas as pd
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
+
 print("🌧️ Step 10 (Flows): Merging NOAA station info into Flows_NOAAsites...")
 
 TABLE_NOAA_SITES = "Flows_NOAAsites"
@@ -29,7 +35,7 @@ project_root = Path(__file__).resolve().parents[1]
 db_path = project_root / "0_db" / "local.db"
 print(f"🗄️ Using DB → {db_path}")
 
-with sqlite3.connect(db_path) as conn:
+with connection(db_path) as conn:
     try:
         sites_df = pd.read_sql_query(f"SELECT * FROM [{TABLE_NOAA_SITES}];", conn)
     except Exception as e:
@@ -144,7 +150,7 @@ for idx, pairs in pairs_per_row.items():
 
 sites_df = sites_df.drop(columns=["river_norm"], errors="ignore")
 
-with sqlite3.connect(db_path) as conn:
+with connection(db_path) as conn:
     sites_df.to_sql(TABLE_NOAA_SITES, conn, if_exists="replace", index=False)
 
 print(f"🔄 Updated [{TABLE_NOAA_SITES}] in place")
@@ -13,11 +13,17 @@
 # ------------------------------------------------------------
 
 import re
-import sqlite3
+import sys
 from pathlib import Path
 
 import pandas as pd
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
+
 print("🌧️ Step 11 (Flows): APPENDING NOAA gauge info into Flows (non-destructive)…")
 
 TABLE_FLOWS = "Flows"
@@ -30,7 +36,7 @@ project_root = Path(__file__).resolve().parents[1]
 db_path = project_root / "0_db" / "local.db"
 print(f"🗄️ Using DB → {db_path}")
 
-with sqlite3.connect(db_path) as conn:
+with connection(db_path) as conn:
     try:
         flows = pd.read_sql_query(f"SELECT * FROM [{TABLE_FLOWS}];", conn).astype("string").fillna("")
     except Exception as e:
@@ -104,7 +110,7 @@ for idx, row in flows.iterrows():
 print(f"🌧️ NOAA sites appended: {total_added}")
 print(f"📍 Rivers updated with NOAA data: {rivers_updated}")
 
-with sqlite3.connect(db_path) as conn:
+with connection(db_path) as conn:
     flows.to_sql(TABLE_FLOWS, conn, if_exists="replace", index=False)
     noaa.to_sql(TABLE_NOAA_SITES, conn, if_exists="replace", index=False)
 
@@ -10,11 +10,17 @@
 #   - Flows
 # ------------------------------------------------------------
 
-import sqlite3
+import sys
 from pathlib import Path
 
 import pandas as pd
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
+
 print("💧 Step 12 (Flows): Updating flow_presence where appropriate (NOAA only)…")
 
 TABLE_FLOWS = "Flows"
@@ -26,7 +32,7 @@ project_root = Path(__file__).resolve().parents[1]
 db_path = project_root / "0_db" / "local.db"
 print(f"🗄️ Using DB → {db_path}")
 
-with sqlite3.connect(db_path) as conn:
+with connection(db_path) as conn:
     try:
         df = pd.read_sql_query(f"SELECT * FROM [{TABLE_FLOWS}];", conn).astype("string").fillna("")
     except Exception as e:
@@ -50,7 +56,7 @@ for idx, row in df.iterrows():
 
 print(f"💧 Updated {updates} rows with flow_presence = 'NOAA'")
 
-with sqlite3.connect(db_path) as conn:
+with connection(db_path) as conn:
     df.to_sql(TABLE_FLOWS, conn, if_exists="replace", index=False)
 
 print("✅ Step 12 complete — Flows updated.")
@@ -13,11 +13,17 @@
 # ------------------------------------------------------------
 
 import re
-import sqlite3
+import sys
 from pathlib import Path
 
 import pandas as pd
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
+
 print("📝 Step 13 (Flows): Manually inserting NOAA/custom gauge data into Flows…")
 
 TABLE_FLOWS = "Flows"
@@ -29,7 +35,7 @@ project_root = Path(__file__).resolve().parents[1]
 db_path = project_root / "0_db" / "local.db"
 print(f"🗄️ Using DB → {db_path}")
 
-with sqlite3.connect(db_path) as conn:
+with connection(db_path) as conn:
     try:
         df = pd.read_sql_query(f"SELECT * FROM [{TABLE_FLOWS}];", conn).astype("string").fillna("")
     except Exception as e:
@@ -93,7 +99,7 @@ for river_name, info in manual_entries.items():
 print(f"🌊 Manual river updates applied: {rivers_found}")
 print(f"➕ Total new Site/Gage entries inserted: {applied}")
 
-with sqlite3.connect(db_path) as conn:
+with connection(db_path) as conn:
     df.to_sql(TABLE_FLOWS, conn, if_exists="replace", index=False)
 
 print("✅ Step 13 complete — Flows updated.")
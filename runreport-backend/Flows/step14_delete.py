@@ -17,95 +17,34 @@
 from __future__ import annotations
 
 import re
-import sqlite3
+import sys
 from pathlib import Path
 
 import pandas as pd
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
+from common.manual_rules import load_rules, match_rules, record_results, resolve_exactly_one, rule_fields
+
 print("🧹 Step 14 (Flows): Applying manual deletions for inactive stations…")
 
 TABLE_FLOWS = "Flows"
 
 # ============================================================
-# 🔧 MANUAL DELETION RULES (EDIT THIS LIST)
+# 🔧 MANUAL DELETION RULES (EDIT rules/station_deletions.csv)
 # ============================================================
 #
-# Provide either:
-#   - {"gage": "12345678"}                     # remove wherever uniquely found
-#   - {"river": "Cedar River", "gage": "..."}  # scoped to a river
-# Optional:
-#   - {"river": "...", "site": "...", "gage": "..."} for extra precision
+# One rule per row; gage is required, river / site are optional:
+#   ,,12345678                     → remove wherever uniquely found
+#   Cedar River,,12345678          → scoped to a river
+#   Cedar River,Some Site,12345678 → extra precision
+# Matching is case-insensitive. The note column is documentation only.
 #
-MANUAL_DELETIONS: list[dict[str, str]] = [
-    # --------------------------------------------------------
-    # Added from Step 15 output: "No data returned" for ALL of
-    # 7d / 30d / 1y windows (candidate inactive stations)
-    # --------------------------------------------------------
-    {"river": "Cedar River", "gage": "12118610"},
-    {"river": "Columbia River", "gage": "12399510"},
-    {"river": "Columbia River", "gage": "12436500"},
-    {"river": "Columbia River", "gage": "12438000"},
-    {"river": "Columbia River", "gage": "12450700"},
-    {"river": "Columbia River", "gage": "12453700"},
-    {"river": "Columbia River", "gage": "12462600"},
-    {"river": "Columbia River", "gage": "1247351910"},
-    {"river": "Columbia River", "gage": "1247351985"},
-    {"river": "Columbia River", "gage": "1251420010"},
-    {"river": "Columbia River", "gage": "12514450"},
-    {"river": "Cowlitz River", "gage": "14238800"},
-    {"river": "Cowlitz River", "gage": "14243550"},
-    {"river": "Cowlitz River", "gage": "14244100"},
-    {"river": "Cowlitz River", "gage": "14244180"},
-    {"river": "Deschutes River", "gage": "12078920"},
-    {"river": "Deschutes River", "gage": "12078930"},
-    {"river": "Deschutes River", "gage": "12079980"},
-    {"river": "Minter Creek", "gage": "12073425"},
-    {"river": "North Fork Nooksack River", "gage": "12208600"},
-    {"river": "Okanogan River", "gage": "12447302"},
-    {"river": "Stillaguamish River", "gage": "12167400"},
-    {"river": "Whatcom Creek", "gage": "12203542"},
-
-    ## Below was manually added ##
-
-    {"river": "Cedar River", "gage": "12114500"},
-    {"river": "Cedar River", "gage": "12115000"},
-    {"river": "Cedar River", "gage": "12116500"},
-    {"river": "Chambers Creek", "gage": "12091500"},
-    {"river": "Chehalis River", "gage": "12020000"},
-    {"river": "Chehalis River", "gage": "12021800"},
-    {"river": "Chehalis River", "gage": "12028060"},
-    {"river": "Columbia River", "gage": "12399500"},
-    {"river": "Cowlitz River", "gage": "14226500"},
-    {"river": "Cowlitz River", "gage": "14231000"},
-    {"river": "Cowlitz River", "gage": "14233500"},
-    {"river": "Green River", "gage": "12106700"},
-    {"river": "Green River", "gage": "12113000"},
-    {"river": "Green River", "gage": "12113310"},
-    {"river": "Green River", "gage": "12113344"},
-    {"river": "Lewis River", "gage": "14216000"},
-    {"river": "Okanogan River", "gage": "12439500"},
-    {"river": "Okanogan River", "gage": "12445000"},
-    {"river": "Puyallup River", "gage": "12092000"},
-    {"river": "Puyallup River", "gage": "12096500"},
-    {"river": "Puyallup River", "gage": "12096505"},
-    {"river": "Puyallup River", "gage": "12101470"},
-    {"river": "Skagit River", "gage": "12178600"},
-    {"river": "Skagit River", "gage": "12178900"},
-    {"river": "Skagit River", "gage": "12179000"},
-    {"river": "Skagit River", "gage": "12180300"},
-    {"river": "Skagit River", "gage": "12184800"},
-    {"river": "Skagit River", "gage": "12189700"},
-    {"river": "Skagit River", "gage": "12199000"},
-    {"river": "Skookumchuck River", "gage": "12025700"},
-#    {"river": "", "gage": ""},
-#    {"river": "", "gage": ""},
-#    {"river": "", "gage": ""},
-    
-
-    # Example skeletons:
-    # {"river": "Some River", "gage": "12123456"},
-    # {"gage": "ABCD1"},
-]
+RULES_PATH = Path(__file__).resolve().parent / "rules" / "station_deletions.csv"
+RULE_SET = "flows_station_deletions"
 
 
 def normalize_text(val) -> str:
@@ -183,7 +122,7 @@ project_root = Path(__file__).resolve().parents[1]
 db_path = project_root / "0_db" / "local.db"
 print(f"🗄️ Using DB → {db_path}")
 
-with sqlite3.connect(db_path) as conn:
+with connection(db_path) as conn:
     df = pd.read_sql_query(f"SELECT * FROM [{TABLE_FLOWS}];", conn)
 
 if df.empty:
@@ -206,57 +145,90 @@ if max_sites == 0:
     print("ℹ️ No Site/Gage columns found in Flows; nothing to delete.")
     raise SystemExit(0)
 
+# One row per (Flows row, Site/Gage pair), keyed the way rules match
+pair_frames = []
+for i in range(1, max_sites + 1):
+    site_col = f"Site {i}"
+    gage_col = f"Gage #{i}"
+    if site_col not in df.columns or gage_col not in df.columns:
+        break
+    pair_frames.append(pd.DataFrame({
+        "row_idx": df.index,
+        "slot": i,
+        "site": df[site_col].map(normalize_text),
+        "gage": df[gage_col].map(normalize_text),
+    }))
+pairs_long = pd.concat(pair_frames, ignore_index=True) if pair_frames else pd.DataFrame()
+if not pairs_long.empty:
+    pairs_long = pairs_long[(pairs_long["site"] != "") | (pairs_long["gage"] != "")]
+    pairs_long = pairs_long.sort_values(["row_idx", "slot"], kind="mergesort").reset_index(drop=True)
+    pairs_long["pair_idx"] = pairs_long.groupby("row_idx").cumcount()
+    pairs_long["river"] = df.loc[pairs_long["row_idx"], "river"].map(normalize_text).str.lower().to_numpy()
+    pairs_long["site"] = pairs_long["site"].str.lower()
+    pairs_long["gage"] = pairs_long["gage"].str.upper()
+
+rules, version = load_rules(RULES_PATH)
+print(f"📜 {len(rules):,} rules from {RULES_PATH.name} (version {version})")
+
 removed_pairs = 0
 skipped_rules = 0
 
-if not MANUAL_DELETIONS:
-    print("ℹ️ No manual deletions configured (MANUAL_DELETIONS is empty).")
+if rules.empty:
+    print(f"ℹ️ No manual deletions configured ({RULES_PATH.name} is empty).")
 else:
-    for rule in MANUAL_DELETIONS:
-        rule_river = normalize_text(rule.get("river"))
-        rule_site = normalize_text(rule.get("site"))
-        rule_gage = normalize_text(rule.get("gage"))
-
-        if not rule_gage:
-            print(f"⚠️ Skipping invalid rule (missing gage): {rule}")
+    keyed = rules.copy()
+    for col in ("river", "site", "gage"):
+        if col not in keyed.columns:
+            keyed[col] = ""
+        keyed[col] = keyed[col].map(normalize_text)
+    keyed["river"] = keyed["river"].str.lower()
+    keyed["site"] = keyed["site"].str.lower()
+    keyed["gage"] = keyed["gage"].str.upper()
+
+    invalid = keyed["gage"] == ""
+    matches = match_rules(pairs_long, keyed[~invalid], ["river", "site", "gage"])
+    # Rules run one after another: a pair removed by an earlier rule
+    # no longer counts as a match for a later one.
+    results = resolve_exactly_one(matches, sequential=True)
+
+    to_remove: dict[int, list[int]] = {}
+    for _, rule in rules.iterrows():
+        no = int(rule["rule_no"])
+        fields = rule_fields(rule, ["river", "site", "gage"])
+        if no not in results:
+            print(f"⚠️ Skipping invalid rule (missing gage): {fields}")
             skipped_rules += 1
+            results[no] = {"matches": 0, "status": "invalid"}
             continue
 
-        matches: list[tuple[int, int]] = []  # (row_index, pair_index)
-
-        for row_idx, row in df.iterrows():
-            if rule_river and normalize_text(row.get("river")).lower() != rule_river.lower():
-                continue
-
-            pairs = collect_pairs(row, max_sites=max_sites)
-            for pair_idx, (site, gage) in enumerate(pairs):
-                if normalize_text(gage).upper() != rule_gage.upper():
-                    continue
-                if rule_site and normalize_text(site).lower() != rule_site.lower():
-                    continue
-                matches.append((row_idx, pair_idx))
-
-        if len(matches) != 1:
-            print(f"⚠️ Rule did not match exactly one station (matches={len(matches)}), skipping: {rule}")
+        res = results[no]
+        if res["status"] != "deleted":
+            print(f"⚠️ Rule did not match exactly one station (matches={res['matches']}), skipping: {fields}")
             skipped_rules += 1
             continue
 
-        row_idx, pair_idx = matches[0]
-        row = df.loc[row_idx]
-        pairs = collect_pairs(row, max_sites=max_sites)
-        removed = pairs.pop(pair_idx)
+        pair = pairs_long.iloc[res["target"]]
+        row_idx = int(pair["row_idx"])
+        to_remove.setdefault(row_idx, []).append(int(pair["pair_idx"]))
         removed_pairs += 1
+        removed = collect_pairs(df.loc[row_idx], max_sites=max_sites)[int(pair["pair_idx"])]
+        print(f"🗑️ Removed station from river='{df.loc[row_idx, 'river']}': site='{removed[0]}' gage='{removed[1]}'")
+
+    # Re-pack every touched row once
+    for row_idx, pair_idxs in to_remove.items():
+        row = df.loc[row_idx]
+        pairs = [p for k, p in enumerate(collect_pairs(row, max_sites=max_sites)) if k not in set(pair_idxs)]
+        df.loc[row_idx] = write_pairs(row.copy(), pairs, max_sites=max_sites)
 
-        updated_row = write_pairs(row.copy(), pairs, max_sites=max_sites)
-        df.loc[row_idx] = updated_row
-        print(f"🗑️ Removed station from river='{row.get('river')}': site='{removed[0]}' gage='{removed[1]}'")
+    with connection(db_path) as conn:
+        record_results(conn, RULE_SET, version, rules, results)
 
 # Recompute flow_presence
 gage_cols_ordered = [f"Gage #{i}" for i in range(1, max_sites + 1) if f"Gage #{i}" in df.columns]
 if "flow_presence" in df.columns:
     df["flow_presence"] = df.apply(lambda r: recompute_flow_presence(r, gage_cols_ordered), axis=1)
 
-with sqlite3.connect(db_path) as conn:
+with connection(db_path) as conn:
     df.to_sql(TABLE_FLOWS, conn, if_exists="replace", index=False)
 
 print("✅ Step 14 complete — manual station deletions applied.")
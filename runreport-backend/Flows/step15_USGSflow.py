@@ -42,7 +42,13 @@ import requests
 from pathlib import Path
 from datetime import datetime, timedelta
 import os
-import sqlite3
+import sys
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
 
 print("🌊 Step 15 (Flows): Fetching USGS flow + stage data for all USGS sites in Flows...")
 
@@ -59,7 +65,7 @@ print(f"🗄️ Using DB → {db_path}")
 # ------------------------------------------------------------
 # Load Flows table
 # ------------------------------------------------------------
-with sqlite3.connect(db_path) as conn:
+with connection(db_path) as conn:
     try:
         flows_df = pd.read_sql_query(f"SELECT * FROM [{TABLE_FLOWS}];", conn)
     except Exception as e:
@@ -350,7 +356,7 @@ wide_df = full_long_df.pivot_table(
 wide_df.columns.name = None
 wide_df.insert(0, "id", range(1, len(wide_df) + 1))
 
-with sqlite3.connect(db_path) as conn:
+with connection(db_path) as conn:
     wide_df.to_sql(TABLE_USGS_FLOWS, conn, if_exists="replace", index=False)
 
 print("\n📋 SUMMARY")
@@ -26,7 +26,13 @@ import requests
 from pathlib import Path
 from datetime import datetime, timedelta, timezone
 import os
-import sqlite3
+import sys
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
 
 print("🌊 Step 16 (Flows): Fetching NOAA flow + stage data (NWPS API)...")
 
@@ -40,7 +46,7 @@ TABLE_NOAA_FLOWS = "NOAA_flows"
 
 print(f"🗄️ Using DB → {db_path}")
 
-with sqlite3.connect(db_path) as conn:
+with connection(db_path) as conn:
     try:
         flows_df = pd.read_sql_query(f"SELECT * FROM [{TABLE_FLOWS}];", conn)
     except Exception as e:
@@ -324,7 +330,7 @@ df_all = df_all[
     ]
 ]
 
-with sqlite3.connect(db_path) as conn:
+with connection(db_path) as conn:
     df_all.to_sql(TABLE_NOAA_FLOWS, conn, if_exists="replace", index=False)
 
 print("\n📋 SUMMARY")
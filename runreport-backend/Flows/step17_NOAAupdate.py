@@ -12,7 +12,13 @@
 
 import pandas as pd
 from pathlib import Path
-import sqlite3
+import sys
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
 
 print("🌊 Step 17: Adding ID + removing timestamp_dt from NOAA flows…")
 
@@ -27,7 +33,7 @@ TABLE_NOAA_FLOWS = "NOAA_flows"
 # Load data
 # ------------------------------------------------------------
 print(f"🗄️ Using DB → {db_path}")
-with sqlite3.connect(db_path) as conn:
+with connection(db_path) as conn:
     try:
         df = pd.read_sql_query(f"SELECT * FROM [{TABLE_NOAA_FLOWS}];", conn)
     except Exception as e:
@@ -100,7 +106,7 @@ print(f"📊 Final columns: {list(df.columns)}")
 # ------------------------------------------------------------
 # Save results
 # ------------------------------------------------------------
-with sqlite3.connect(db_path) as conn:
+with connection(db_path) as conn:
     df.to_sql(TABLE_NOAA_FLOWS, conn, if_exists="replace", index=False)
 
 print(f"🔄 Updated [{TABLE_NOAA_FLOWS}] with id + no timestamp_dt")
@@ -12,7 +12,6 @@
 # ------------------------------------------------------------
 
 import sys
-import sqlite3
 from pathlib import Path
 
 import pandas as pd
@@ -21,6 +20,7 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
+from common.sqlite_manager import connection
 from publish.supabase_client import SupabaseConfigError, get_supabase_client
 
 print("🌊 Step 1 (Flows): Collecting river names into local.db...")
@@ -95,7 +95,7 @@ rivers = (
 output_df = pd.DataFrame({"river": rivers})
 print(f"🌊 Found {len(output_df):,} unique rivers")
 
-with sqlite3.connect(db_path) as conn:
+with connection(db_path) as conn:
     output_df.to_sql(TABLE_FLOWS, conn, if_exists="replace", index=False)
 
 print(f"✅ Step 1 complete — wrote {len(output_df):,} rivers to table [{TABLE_FLOWS}].")
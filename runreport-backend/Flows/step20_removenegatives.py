@@ -8,10 +8,17 @@
 # ------------------------------------------------------------
 
 import sqlite3
+import sys
 from pathlib import Path
 
 import pandas as pd
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
+
 print("🧹 Step 20 (Flows): Converting negative flow values to NaN and trimming timestamps...")
 
 # ------------------------------------------------------------
@@ -32,7 +39,7 @@ def table_exists(conn: sqlite3.Connection, table: str) -> bool:
     return cur.fetchone() is not None
 
 
-with sqlite3.connect(db_path) as conn:
+with connection(db_path) as conn:
     for table in TABLES:
         if not table_exists(conn, table):
             print(f"⚠️ Table missing: {table} — skipping.")
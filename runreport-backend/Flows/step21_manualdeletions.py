@@ -1,23 +1,47 @@
 # step21_manualdeletions.py
 # ------------------------------------------------------------
 # Step 21 (Flows): Manual cleanup — delete bad timestamp rows.
+#
+# Rules: rules/bad_timestamps.csv — one (table, timestamp_like)
+# pattern per row; every row whose timestamp is LIKE the pattern is
+# deleted. Only the flow tables in ALLOWED_TABLES can be targeted;
+# rules naming any other table are skipped. Per-rule counts go to
+# ManualRuleResults.
 # ------------------------------------------------------------
 
-import sqlite3
+import sys
 from pathlib import Path
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
+from common.manual_rules import load_rules, record_results
+
 print("🧹 Step 21 (Flows): Deleting rows with bad timestamps...")
 
 project_root = Path(__file__).resolve().parents[1]
 db_path = project_root / "0_db" / "local.db"
 print(f"🗄️ Using DB → {db_path}")
 
-tables = ["NOAA_flows", "USGS_flows"]
-bad_timestamp_like = "12-31-2025, %"
+RULES_PATH = Path(__file__).resolve().parent / "rules" / "bad_timestamps.csv"
+RULE_SET = "flows_bad_timestamps"
+ALLOWED_TABLES = {"NOAA_flows", "USGS_flows"}
 
-with sqlite3.connect(db_path) as conn:
+rules, version = load_rules(RULES_PATH)
+print(f"📜 {len(rules):,} rules from {RULES_PATH.name} (version {version})")
+
+results = {}
+with connection(db_path) as conn:
     cursor = conn.cursor()
-    for table in tables:
+    for _, rule in rules.iterrows():
+        table = rule["table"]
+        bad_timestamp_like = rule["timestamp_like"]
+        if table not in ALLOWED_TABLES:
+            print(f"⛔ Rule {rule['rule_no']}: table '{table}' is not one of {sorted(ALLOWED_TABLES)} — skipping.")
+            results[int(rule["rule_no"])] = {"matches": 0, "status": "skipped"}
+            continue
         cursor.execute(
             f"SELECT COUNT(*) FROM {table} WHERE timestamp LIKE ?;",
             (bad_timestamp_like,),
@@ -33,5 +57,8 @@ with sqlite3.connect(db_path) as conn:
             )
         else:
             print(f"✅ {table}: no rows to delete.")
+        results[int(rule["rule_no"])] = {"matches": count, "status": "deleted" if count else "no_match"}
+
+    record_results(conn, RULE_SET, version, rules, results)
 
 print("✅ Step 21 complete.")
@@ -12,12 +12,18 @@
 #   site_number
 # ------------------------------------------------------------
 
-import sqlite3
+import sys
 from pathlib import Path
 
 import pandas as pd
 import requests
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
+
 print("🌊 Step 2 (Flows): Fetching ACTIVE Washington USGS site list (filtered)…")
 
 TABLE_USGS_SITES = "Flows_USGSsites"
@@ -90,7 +96,7 @@ print(f"🔍 Parsed {len(rows):,} ACTIVE stations (filtered to 8–10 digit site
 
 df = pd.DataFrame(rows)
 
-with sqlite3.connect(db_path) as conn:
+with connection(db_path) as conn:
     df.to_sql(TABLE_USGS_SITES, conn, if_exists="replace", index=False)
 
 print(f"💾 Saved {len(df):,} rows → table [{TABLE_USGS_SITES}]")
@@ -12,11 +12,17 @@
 # ------------------------------------------------------------
 
 import re
-import sqlite3
+import sys
 from pathlib import Path
 
 import pandas as pd
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
+
 print("🌊 Step 3 (Flows): Extracting standardized river_name from USGS sites…")
 
 TABLE_FLOWS = "Flows"
@@ -30,7 +36,7 @@ project_root = Path(__file__).resolve().parents[1]
 db_path = project_root / "0_db" / "local.db"
 print(f"🗄️ Using DB → {db_path}")
 
-with sqlite3.connect(db_path) as conn:
+with connection(db_path) as conn:
     try:
         df = pd.read_sql_query(f"SELECT * FROM [{TABLE_USGS_SITES}];", conn)
     except Exception as e:
@@ -69,12 +75,12 @@ if "site_name" not in df.columns:
 df["river_name"] = df["site_name"].apply(extract_river_name)
 print("🔍 Extracted river_name for all stations.")
 
-with sqlite3.connect(db_path) as conn:
+with connection(db_path) as conn:
     df.to_sql(TABLE_USGS_RIVERNAMES, conn, if_exists="replace", index=False)
 
 print(f"💾 Saved → table [{TABLE_USGS_RIVERNAMES}]")
 
-with sqlite3.connect(db_path) as conn:
+with connection(db_path) as conn:
     try:
         flows = pd.read_sql_query(f"SELECT * FROM [{TABLE_FLOWS}];", conn)
     except Exception as e:
@@ -100,7 +106,7 @@ if "river" not in flows.columns:
 
 flows["river_name"] = flows["river"].astype(str).apply(match_river)
 
-with sqlite3.connect(db_path) as conn:
+with connection(db_path) as conn:
     flows.to_sql(TABLE_FLOWS, conn, if_exists="replace", index=False)
 
 print(f"🔄 Updated [{TABLE_FLOWS}] with river_name column.")
@@ -19,11 +19,17 @@
 #   - Mark matched rows in the USGS table: added="Y"
 # ------------------------------------------------------------
 
-import sqlite3
+import sys
 from pathlib import Path
 
 import pandas as pd
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
+
 print("🔗 Step 4 (Flows): Merging USGS site info into Flows (clean & renumbered)...")
 print("📝 'added' flags will be stored in Flows_USGSsites_rivername only.")
 
@@ -37,7 +43,7 @@ project_root = Path(__file__).resolve().parents[1]
 db_path = project_root / "0_db" / "local.db"
 print(f"🗄️ Using DB → {db_path}")
 
-with sqlite3.connect(db_path) as conn:
+with connection(db_path) as conn:
     try:
         flows = pd.read_sql_query(f"SELECT * FROM [{TABLE_FLOWS}];", conn)
     except Exception as e:
@@ -128,7 +134,7 @@ print(f"🌊 Rivers with site matches: {rivers_with_sites:,}")
 # ------------------------------------------------------------
 # Write back
 # ------------------------------------------------------------
-with sqlite3.connect(db_path) as conn:
+with connection(db_path) as conn:
     flows_clean.to_sql(TABLE_FLOWS, conn, if_exists="replace", index=False)
     sites.to_sql(TABLE_USGS_RIVERNAMES, conn, if_exists="replace", index=False)
 
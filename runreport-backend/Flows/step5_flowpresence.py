@@ -16,11 +16,17 @@
 #   - Flows
 # ------------------------------------------------------------
 
-import sqlite3
+import sys
 from pathlib import Path
 
 import pandas as pd
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
+
 print("💧 Step 5 (Flows): Adding flow_presence column to Flows...")
 
 TABLE_FLOWS = "Flows"
@@ -32,7 +38,7 @@ project_root = Path(__file__).resolve().parents[1]
 db_path = project_root / "0_db" / "local.db"
 print(f"🗄️ Using DB → {db_path}")
 
-with sqlite3.connect(db_path) as conn:
+with connection(db_path) as conn:
     try:
         df = pd.read_sql_query(f"SELECT * FROM [{TABLE_FLOWS}];", conn)
     except Exception as e:
@@ -66,7 +72,7 @@ if "flow_presence" in cols:
 new_cols = ["river", "flow_presence", "river_name"] + [c for c in cols if c not in {"river", "river_name"}]
 df = df[new_cols]
 
-with sqlite3.connect(db_path) as conn:
+with connection(db_path) as conn:
     df.to_sql(TABLE_FLOWS, conn, if_exists="replace", index=False)
 
 print("✅ Step 5 complete — flow_presence column added to Flows.")
@@ -13,11 +13,17 @@
 #   river
 # ------------------------------------------------------------
 
-import sqlite3
+import sys
 from pathlib import Path
 
 import pandas as pd
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
+
 print("🌧️ Step 6 (Flows): Finding rivers without USGS coverage (for NOAA gauges)…")
 
 TABLE_FLOWS = "Flows"
@@ -30,7 +36,7 @@ project_root = Path(__file__).resolve().parents[1]
 db_path = project_root / "0_db" / "local.db"
 print(f"🗄️ Using DB → {db_path}")
 
-with sqlite3.connect(db_path) as conn:
+with connection(db_path) as conn:
     try:
         flows = pd.read_sql_query(f"SELECT * FROM [{TABLE_FLOWS}];", conn)
     except Exception as e:
@@ -61,7 +67,7 @@ print(f"⏭️ After skipping manual exclusions: {missing_rivers}")
 
 missing_df = pd.DataFrame({"river": sorted(set(missing_rivers))})
 
-with sqlite3.connect(db_path) as conn:
+with connection(db_path) as conn:
     missing_df.to_sql(TABLE_NOAA_SITES, conn, if_exists="replace", index=False)
 
 print(f"💾 Saved list of rivers needing NOAA sources → table [{TABLE_NOAA_SITES}]")
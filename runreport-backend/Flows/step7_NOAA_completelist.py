@@ -7,13 +7,19 @@
 #   - Flows_NOAA_completelist
 # ------------------------------------------------------------
 
-import sqlite3
+import sys
 from pathlib import Path
 
 import pandas as pd
 import requests
 from bs4 import BeautifulSoup
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
+
 print("🌧️ Step 7 (Flows): Downloading full NOAA NWRFC river gauge table…")
 
 TABLE_NOAA_CATALOG = "Flows_NOAA_completelist"
@@ -69,7 +75,7 @@ if "Description" in df.columns:
         lambda x: x.split("-")[0].strip() if isinstance(x, str) else ""
     )
 
-with sqlite3.connect(db_path) as conn:
+with connection(db_path) as conn:
     df.to_sql(TABLE_NOAA_CATALOG, conn, if_exists="replace", index=False)
 
 print(f"💾 Saved NOAA complete station list → table [{TABLE_NOAA_CATALOG}]")
@@ -4,11 +4,17 @@
 # stations and overwrite Flows_NOAA_completelist in local.db.
 # ------------------------------------------------------------
 
-import sqlite3
+import sys
 from pathlib import Path
 
 import pandas as pd
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
+
 print("🧹 Step 8 (Flows): Filtering NOAA catalog to Washington-only stations…")
 
 TABLE_NOAA_CATALOG = "Flows_NOAA_completelist"
@@ -20,7 +26,7 @@ project_root = Path(__file__).resolve().parents[1]
 db_path = project_root / "0_db" / "local.db"
 print(f"🗄️ Using DB → {db_path}")
 
-with sqlite3.connect(db_path) as conn:
+with connection(db_path) as conn:
     try:
         df = pd.read_sql_query(f"SELECT * FROM [{TABLE_NOAA_CATALOG}];", conn)
     except Exception as e:
@@ -34,7 +40,7 @@ if "State" not in df.columns:
 df_filtered = df[df["State"].astype(str).str.strip().str.upper() == "WA"].copy()
 print(f"✅ Kept {len(df_filtered):,} Washington rows")
 
-with sqlite3.connect(db_path) as conn:
+with connection(db_path) as conn:
     df_filtered.to_sql(TABLE_NOAA_CATALOG, conn, if_exists="replace", index=False)
 
 print(f"🔄 Updated [{TABLE_NOAA_CATALOG}] in place")
@@ -11,11 +11,17 @@
 #   - Flows_NOAA_completelist
 # ------------------------------------------------------------
 
-import sqlite3
+import sys
 from pathlib import Path
 
 import pandas as pd
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connection
+
 print("🔎 Step 9 (Flows): Extracting NOAA Site ID from ID column...")
 
 TABLE_NOAA_CATALOG = "Flows_NOAA_completelist"
@@ -27,7 +33,7 @@ project_root = Path(__file__).resolve().parents[1]
 db_path = project_root / "0_db" / "local.db"
 print(f"🗄️ Using DB → {db_path}")
 
-with sqlite3.connect(db_path) as conn:
+with connection(db_path) as conn:
     try:
         df = pd.read_sql_query(f"SELECT * FROM [{TABLE_NOAA_CATALOG}];", conn)
     except Exception as e:
@@ -51,7 +57,7 @@ def extract_site_id(full_id: str) -> str:
 df["Site ID"] = df["ID"].astype(str).apply(extract_site_id)
 print("🔧 Extracted Site ID column.")
 
-with sqlite3.connect(db_path) as conn:
+with connection(db_path) as conn:
     df.to_sql(TABLE_NOAA_CATALOG, conn, if_exists="replace", index=False)
 
 print(f"🔄 Updated [{TABLE_NOAA_CATALOG}] in place")
@@ -9,10 +9,20 @@ Runs the three backend pipelines in order by invoking each folder's
   2) EscapementReport_FishCounts
   3) Flows
 
+Each pipeline (and the publish) is recorded as one step of a
+"backend" run in pipeline_runs / pipeline_run_steps
+(common/telemetry.py); the pipelines' own runs point back to it via
+parent_run_id. A pipeline step that regressed badly against its
+rolling baseline (common/regression.py) is handled per --on-regression:
+warn (default), skip-publish (that pipeline) or fail (publish nothing,
+exit 1).
+
 Usage:
     python3 backend_runner.py
     python3 backend_runner.py --only columbia
     python3 backend_runner.py --skip escapement --skip flows
+    python3 backend_runner.py --report [--only escapement]
+    python3 backend_runner.py --on-regression skip-publish
 """
 
 # The tables to plot are:
@@ -21,10 +31,10 @@ Usage:
 from __future__ import annotations
 
 import argparse
-import subprocess
 import sys
 from pathlib import Path
 
+from common import regression, telemetry
 from publish.publisher import publish_all
 
 
@@ -38,16 +48,43 @@ PIPELINES: dict[str, Path] = {
 }
 
 
-def run_step0(name: str, script_path: Path) -> None:
+def run_step0(name: str, script_path: Path, recorder: telemetry.RunRecorder) -> None:
     if not script_path.exists():
         raise FileNotFoundError(f"Missing step0 runner for '{name}': {script_path}")
 
     print(f"\n==================== {name.upper()} ====================\n")
-    subprocess.run(
-        [sys.executable, str(script_path)],
-        cwd=str(script_path.parent),
-        check=True,
-    )
+    with recorder.step(None, name) as rec:
+        telemetry.run_subprocess(
+            rec,
+            [sys.executable, str(script_path)],
+            cwd=str(script_path.parent),
+            env=recorder.child_env(),
+        )
+
+
+def run_publish(flags: dict[str, bool], recorder: telemetry.RunRecorder) -> None:
+    with recorder.step(None, "publish") as rec:
+        rec.note = ",".join(name for name, on in flags.items() if on) or "nothing"
+        publish_all(flags)
+
+
+def regression_gate(name: str, recorder: telemetry.RunRecorder, policy: str, flags: dict[str, bool]) -> bool:
+    """Apply the policy to severe regressions of the pipeline run just finished; True = fail the run."""
+    bad = regression.severe(regression.child_findings(recorder.run_id, name))
+    if not bad:
+        return False
+    steps = ", ".join(sorted({f["label"] for f in bad}))
+    if policy == "fail":
+        print(f"🚨 {name}: severe regression in {steps} — nothing will be published.")
+        return True
+    if policy == "skip-publish":
+        print(f"🚨 {name}: severe regression in {steps} — publish skipped.")
+        flags[name] = False
+    elif policy == "warn":
+        print(f"🚨 {name}: severe regression in {steps} (publishing anyway, --on-regression warn).")
+    else:
+        raise ValueError(f"❌ Unknown --on-regression policy: {policy!r}")
+    return False
 
 
 def parse_args() -> argparse.Namespace:
@@ -64,6 +101,17 @@ def parse_args() -> argparse.Namespace:
         default=[],
         help="Skip a pipeline (can be provided multiple times).",
     )
+    parser.add_argument(
+        "--report",
+        action="store_true",
+        help="Show the slowest steps of the last run vs the run before (backend, or the --only pipeline) and exit.",
+    )
+    parser.add_argument(
+        "--on-regression",
+        choices=regression.POLICIES,
+        default=regression.ON_REGRESSION,
+        help="What a severe per-step regression does (default: RUNREPORT_ON_REGRESSION or warn).",
+    )
     return parser.parse_args()
 
 
@@ -92,23 +140,39 @@ def apply_escapement_publish_signal(flags: dict[str, bool]) -> None:
 
 def main() -> int:
     args = parse_args()
+    if args.report:
+        return telemetry.report(args.only or "backend")
+
     flags = build_publish_flags(args)
+    recorder = telemetry.RunRecorder("backend")
+
+    try:
+        regressed = False
+        if args.only:
+            run_step0(args.only, PIPELINES[args.only], recorder)
+            regressed = regression_gate(args.only, recorder, args.on_regression, flags)
+        else:
+            skips = set(args.skip or [])
+            for name in ("columbia", "escapement", "flows"):
+                if name in skips:
+                    print(f"\n[skip] {name}")
+                    continue
+                run_step0(name, PIPELINES[name], recorder)
+                regressed = regression_gate(name, recorder, args.on_regression, flags) or regressed
+
+        if regressed:
+            recorder.finish("regressed")
+            print("\n❌ Backend run failed on performance regressions (see above); nothing published.\n")
+            return 1
 
-    if args.only:
-        run_step0(args.only, PIPELINES[args.only])
         apply_escapement_publish_signal(flags)
-        publish_all(flags)
+        run_publish(flags, recorder)
+    except Exception:
+        recorder.finish("failed")
+        raise
+    recorder.finish("ok")
+    if args.only:
         return 0
-
-    skips = set(args.skip or [])
-    for name in ("columbia", "escapement", "flows"):
-        if name in skips:
-            print(f"\n[skip] {name}")
-            continue
-        run_step0(name, PIPELINES[name])
-
-    apply_escapement_publish_signal(flags)
-    publish_all(flags)
     print("\n✅ All selected backend pipelines finished.\n")
     return 0
 
@@ -0,0 +1,185 @@
+"""
+manual_rules.py
+------------------------------------------------------------
+Manual deletion rules kept in CSV files, matched with one join.
+
+Used by:
+    EscapementReport_FishCounts/step50_manualdeletions.py  rules/manual_deletions.csv
+    Flows/step14_delete.py                                 rules/station_deletions.csv
+    Flows/step21_manualdeletions.py                        rules/bad_timestamps.csv
+
+Rule files
+    • one rule per row, header = the columns the rule can constrain
+    • a blank cell means "any value" for that column
+    • an optional `note` column is kept for people, never matched
+    • rules are numbered by their row (rule 1 = first data row)
+    • version = first 12 hex digits of the file's SHA-256, so the
+      results table shows exactly which edit of the file was applied
+
+Matching
+    Rules are grouped by which columns they fill in. Each group is
+    inner-joined with the data on those columns, so matching costs one
+    hash join per group instead of a full-table scan per rule. Rule
+    values are converted to the data column's type first (dates →
+    datetime, numbers → numeric).
+
+Results
+    record_results() stores the last run of each rule set in local.db
+    (ManualRuleResults): rule number, rule, match count and what was
+    done, plus the file version.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RESULTS_TABLE = "ManualRuleResults"
+
+
+# ------------------------------------------------------------
+# Loading
+# ------------------------------------------------------------
+def load_rules(path: Path) -> tuple[pd.DataFrame, str]:
+    """
+    Read a rule file. Returns (rules, version); rules has a `rule_no`
+    column (1-based) and every other column as text ("" = any value).
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"❌ Rule file not found: {path}")
+    version = hashlib.sha256(path.read_bytes()).hexdigest()[:12]
+    rules = pd.read_csv(path, dtype=str, keep_default_na=False)
+    rules.insert(0, "rule_no", np.arange(1, len(rules) + 1))
+    return rules, version
+
+
+def rule_fields(rule: pd.Series | dict, columns: list[str] | None = None) -> dict:
+    """The non-blank fields of one rule, in file order."""
+    items = rule.items() if isinstance(rule, dict) else rule.to_dict().items()
+    return {
+        col: val for col, val in items
+        if col != "rule_no" and val != "" and (columns is None or col in columns)
+    }
+
+
+# ------------------------------------------------------------
+# Matching
+# ------------------------------------------------------------
+def _as_column_type(values: pd.Series, column: pd.Series) -> pd.Series:
+    if pd.api.types.is_datetime64_any_dtype(column):
+        return pd.to_datetime(values, errors="coerce")
+    if pd.api.types.is_numeric_dtype(column):
+        return pd.to_numeric(values, errors="coerce")
+    return values
+
+
+def match_rules(df: pd.DataFrame, rules: pd.DataFrame, columns: list[str]) -> dict[int, np.ndarray]:
+    """
+    rule_no → positions (0-based, into df) of the rows matching every
+    non-blank rule field in `columns`.
+
+    A rule that names a column df does not have, has a value that cannot
+    be converted to the column's type, or fills in none of `columns`
+    matches nothing.
+    """
+    matches = {int(no): np.empty(0, dtype=np.int64) for no in rules["rule_no"]}
+    if rules.empty or df.empty:
+        return matches
+
+    rule_cols = [c for c in columns if c in rules.columns]
+    filled = rules[rule_cols].ne("")
+    shapes = filled.apply(lambda row: tuple(c for c in rule_cols if row[c]), axis=1)
+
+    positions = pd.Series(np.arange(len(df)), index=df.index, name="_pos")
+
+    for shape, group in rules.groupby(shapes, sort=False):
+        if not shape or any(c not in df.columns for c in shape):
+            continue
+
+        left = group[["rule_no", *shape]].copy()
+        for col in shape:
+            left[col] = _as_column_type(left[col], df[col])
+        left = left.dropna(subset=list(shape))
+        if left.empty:
+            continue
+
+        right = df[list(shape)].join(positions)
+        joined = left.merge(right, on=list(shape), how="inner")
+        for no, pos in joined.groupby("rule_no")["_pos"]:
+            matches[int(no)] = np.sort(pos.to_numpy())
+
+    return matches
+
+
+def resolve_exactly_one(matches: dict[int, np.ndarray], sequential: bool = False) -> dict[int, dict]:
+    """
+    Apply the exactly-one-match safety rule.
+
+    rule_no → {"matches": n, "positions": matched positions,
+               "target": position or None, "status": ...}
+    status is "deleted", "no_match" or "ambiguous".
+
+    sequential=True treats rules as applied one after another: targets
+    already removed by an earlier rule no longer count as matches.
+    """
+    removed: set[int] = set()
+    results = {}
+    for no in sorted(matches):
+        pos = matches[no]
+        if sequential and removed:
+            pos = np.array([p for p in pos if p not in removed], dtype=np.int64)
+        n = len(pos)
+        if n == 1:
+            target = int(pos[0])
+            removed.add(target)
+            results[no] = {"matches": 1, "positions": pos, "target": target, "status": "deleted"}
+        else:
+            status = "no_match" if n == 0 else "ambiguous"
+            results[no] = {"matches": n, "positions": pos, "target": None, "status": status}
+    return results
+
+
+# ------------------------------------------------------------
+# Diagnostics
+# ------------------------------------------------------------
+def record_results(conn, rule_set: str, version: str, rules: pd.DataFrame, results: dict[int, dict]):
+    """Replace the stored results of `rule_set` with this run's."""
+    now = datetime.now(timezone.utc).isoformat()
+    by_no = rules.set_index("rule_no")
+    with conn:
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {RESULTS_TABLE} (
+                rule_set TEXT,
+                rule_no INTEGER,
+                version TEXT,
+                rule TEXT,
+                matches INTEGER,
+                status TEXT,
+                run_at TEXT,
+                PRIMARY KEY (rule_set, rule_no)
+            );
+        """)
+        conn.execute(f"DELETE FROM {RESULTS_TABLE} WHERE rule_set = ?", (rule_set,))
+        conn.executemany(
+            f"""
+            INSERT INTO {RESULTS_TABLE}
+                (rule_set, rule_no, version, rule, matches, status, run_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    rule_set,
+                    no,
+                    version,
+                    json.dumps(rule_fields(by_no.loc[no].to_dict())),
+                    res["matches"],
+                    res["status"],
+                    now,
+                )
+                for no, res in results.items()
+            ],
+        )
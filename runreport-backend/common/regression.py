@@ -0,0 +1,250 @@
+"""
+regression.py
+------------------------------------------------------------
+Performance regression check on the run records written by
+common/telemetry.py.
+
+Every step of a finished run is compared against a rolling baseline:
+the median wall time and peak RSS of the same step (matched by label)
+over the last REGRESSION_WINDOW successful runs of the same pipeline.
+Cached / skipped / failed steps are neither checked nor used as a
+baseline, and a step needs REGRESSION_MIN_RUNS earlier runs before it
+is judged at all.
+
+A step is flagged when
+    wall time > REGRESSION_FACTOR × baseline  (and at least
+                REGRESSION_MIN_SECONDS slower), or
+    peak RSS  > REGRESSION_RSS_FACTOR × baseline  (and at least
+                REGRESSION_MIN_MB more)
+and counts as severe above REGRESSION_SEVERE_FACTOR × baseline.
+
+Findings are stored in pipeline_run_regressions (one row per flagged
+step and metric) and printed when a run finishes. backend_runner.py
+acts on severe findings of the pipelines it started, per
+--on-regression / RUNREPORT_ON_REGRESSION:
+    warn          print only (default)
+    skip-publish  do not publish the regressed pipeline
+    fail          publish nothing and exit 1
+
+All thresholds can be overridden with RUNREPORT_<NAME> env vars.
+
+Usage:
+    python -m common.regression [--pipeline escapement] [--run RUN_ID] [--strict]
+    (--strict exits 1 when the run has severe findings)
+"""
+
+import argparse
+import os
+import statistics
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connect
+from common.telemetry import RUNS_TABLE, STEPS_TABLE, _fmt_seconds, create_tables
+
+REGRESSIONS_TABLE = "pipeline_run_regressions"
+
+REGRESSION_WINDOW = int(os.environ.get("RUNREPORT_REGRESSION_WINDOW", 10))
+REGRESSION_MIN_RUNS = int(os.environ.get("RUNREPORT_REGRESSION_MIN_RUNS", 3))
+REGRESSION_FACTOR = float(os.environ.get("RUNREPORT_REGRESSION_FACTOR", 2.0))
+REGRESSION_RSS_FACTOR = float(os.environ.get("RUNREPORT_REGRESSION_RSS_FACTOR", 1.5))
+REGRESSION_SEVERE_FACTOR = float(os.environ.get("RUNREPORT_REGRESSION_SEVERE_FACTOR", 4.0))
+REGRESSION_MIN_SECONDS = float(os.environ.get("RUNREPORT_REGRESSION_MIN_SECONDS", 10))
+REGRESSION_MIN_MB = float(os.environ.get("RUNREPORT_REGRESSION_MIN_MB", 100))
+
+POLICIES = ("warn", "skip-publish", "fail")
+ON_REGRESSION = os.environ.get("RUNREPORT_ON_REGRESSION", "warn")
+if ON_REGRESSION not in POLICIES:
+    # argparse does not check defaults against choices; a typo must not fall back to publishing.
+    raise ValueError(f"❌ RUNREPORT_ON_REGRESSION must be one of {', '.join(POLICIES)}, got {ON_REGRESSION!r}")
+
+# metric → (flag factor, minimum absolute increase, name, formatter)
+METRICS = {
+    "wall_s": (REGRESSION_FACTOR, REGRESSION_MIN_SECONDS, "wall", _fmt_seconds),
+    "peak_rss_mb": (REGRESSION_RSS_FACTOR, REGRESSION_MIN_MB, "peak RSS", lambda mb: f"{mb:,.0f} MB"),
+}
+
+
+def create_table(conn):
+    create_tables(conn)
+    with conn:
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {REGRESSIONS_TABLE} (
+                run_id      TEXT NOT NULL,
+                label       TEXT NOT NULL,
+                metric      TEXT NOT NULL,
+                value       REAL,
+                baseline    REAL,
+                ratio       REAL,
+                severity    TEXT,
+                baseline_runs INTEGER,
+                PRIMARY KEY (run_id, label, metric)
+            );
+        """)
+
+
+# ------------------------------------------------------------
+# Baseline
+# ------------------------------------------------------------
+def baseline(conn, pipeline: str, run_id: str, window: int = REGRESSION_WINDOW) -> dict[str, dict]:
+    """
+    label → {"runs": n, "wall_s": median, "peak_rss_mb": median} over the
+    last `window` ok runs of `pipeline` that started before `run_id`.
+    """
+    started_at = conn.execute(f"SELECT started_at FROM {RUNS_TABLE} WHERE run_id = ?", (run_id,)).fetchone()
+    if started_at is None:
+        raise ValueError(f"❌ Unknown run_id: {run_id}")
+    earlier = [r[0] for r in conn.execute(
+        f"SELECT run_id FROM {RUNS_TABLE} WHERE pipeline = ? AND status = 'ok' AND run_id != ? "
+        "AND started_at <= ? ORDER BY started_at DESC, run_id DESC LIMIT ?",
+        (pipeline, run_id, started_at[0], window),
+    )]
+    if not earlier:
+        return {}
+
+    samples: dict[str, dict[str, list[float]]] = {}
+    rows = conn.execute(
+        f"SELECT label, wall_s, peak_rss_mb FROM {STEPS_TABLE} "
+        f"WHERE status = 'ok' AND run_id IN ({', '.join('?' * len(earlier))})",
+        earlier,
+    )
+    for label, wall_s, rss in rows:
+        per_label = samples.setdefault(label, {"wall_s": [], "peak_rss_mb": []})
+        if wall_s is not None:
+            per_label["wall_s"].append(wall_s)
+        if rss is not None:
+            per_label["peak_rss_mb"].append(rss)
+
+    return {
+        label: {
+            "runs": len(values["wall_s"]),
+            **{m: statistics.median(v) if v else None for m, v in values.items()},
+        }
+        for label, values in samples.items()
+    }
+
+
+# ------------------------------------------------------------
+# Check
+# ------------------------------------------------------------
+def check(run_id: str, db_path="local.db", verbose: bool = True) -> list[dict]:
+    """Compare a finished run against its baseline; store and return the findings."""
+    conn = connect(db_path)
+    try:
+        create_table(conn)
+        pipeline = conn.execute(f"SELECT pipeline FROM {RUNS_TABLE} WHERE run_id = ?", (run_id,)).fetchone()
+        if pipeline is None:
+            raise ValueError(f"❌ Unknown run_id: {run_id}")
+        base = baseline(conn, pipeline[0], run_id)
+
+        findings = []
+        steps = conn.execute(
+            f"SELECT label, wall_s, peak_rss_mb FROM {STEPS_TABLE} WHERE run_id = ? AND status = 'ok' ORDER BY seq",
+            (run_id,),
+        ).fetchall()
+        for label, wall_s, rss in steps:
+            ref = base.get(label)
+            if not ref or ref["runs"] < REGRESSION_MIN_RUNS:
+                continue
+            for metric, value in (("wall_s", wall_s), ("peak_rss_mb", rss)):
+                factor, min_increase, _, _ = METRICS[metric]
+                before = ref[metric]
+                if value is None or not before or value - before < min_increase:
+                    continue
+                ratio = value / before
+                if ratio <= factor:
+                    continue
+                findings.append({
+                    "run_id": run_id,
+                    "label": label,
+                    "metric": metric,
+                    "value": value,
+                    "baseline": before,
+                    "ratio": round(ratio, 2),
+                    "severity": "severe" if ratio > REGRESSION_SEVERE_FACTOR else "warn",
+                    "baseline_runs": ref["runs"],
+                })
+
+        with conn:
+            conn.execute(f"DELETE FROM {REGRESSIONS_TABLE} WHERE run_id = ?", (run_id,))
+            conn.executemany(
+                f"INSERT INTO {REGRESSIONS_TABLE} VALUES "
+                "(:run_id, :label, :metric, :value, :baseline, :ratio, :severity, :baseline_runs)",
+                findings,
+            )
+    finally:
+        conn.close()
+
+    if verbose:
+        print_findings(findings)
+    return findings
+
+
+def print_findings(findings: list[dict]):
+    if not findings:
+        return
+    print(f"\n🐢 Performance regressions vs the rolling baseline ({len(findings)}):")
+    for f in findings:
+        _, _, name, fmt = METRICS[f["metric"]]
+        icon = "🚨" if f["severity"] == "severe" else "⚠️"
+        print(f"   {icon} {f['label']}: {name} {fmt(f['value'])} vs median {fmt(f['baseline'])} "
+              f"({f['ratio']:.1f}×, {f['baseline_runs']} runs)")
+
+
+def child_findings(parent_run_id: str, pipeline: str, db_path="local.db") -> list[dict]:
+    """Stored findings of the `pipeline` run(s) started by parent_run_id."""
+    conn = connect(db_path)
+    try:
+        create_table(conn)
+        cur = conn.execute(
+            f"SELECT g.* FROM {REGRESSIONS_TABLE} g JOIN {RUNS_TABLE} r ON r.run_id = g.run_id "
+            "WHERE r.parent_run_id = ? AND r.pipeline = ?",
+            (parent_run_id, pipeline),
+        )
+        columns = [d[0] for d in cur.description]
+        return [dict(zip(columns, row)) for row in cur.fetchall()]
+    finally:
+        conn.close()
+
+
+def severe(findings: list[dict]) -> list[dict]:
+    return [f for f in findings if f["severity"] == "severe"]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check a recorded run for per-step performance regressions.")
+    parser.add_argument("--pipeline", help="Check the latest finished run of this pipeline.")
+    parser.add_argument("--run", help="Check this run_id instead.")
+    parser.add_argument("--strict", action="store_true", help="Exit 1 on severe regressions.")
+    args = parser.parse_args()
+
+    run_id = args.run
+    if run_id is None:
+        conn = connect("local.db")
+        try:
+            create_tables(conn)
+            where = "AND pipeline = ?" if args.pipeline else ""
+            row = conn.execute(
+                f"SELECT run_id FROM {RUNS_TABLE} WHERE status != 'running' {where} "
+                "ORDER BY started_at DESC, run_id DESC LIMIT 1",
+                (args.pipeline,) if args.pipeline else (),
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            print("ℹ️ No finished runs recorded.")
+            return 1
+        run_id = row[0]
+
+    findings = check(run_id)
+    if not findings:
+        print(f"✅ {run_id}: no step slower or larger than its baseline.")
+    return 1 if args.strict and severe(findings) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,7 +1,212 @@
+"""
+sqlite_manager.py
+------------------------------------------------------------
+Single place where the backend opens runreport-backend/0_db/local.db.
+
+All three pipelines (EscapementReport_FishCounts, Columbia_FishCounts,
+Flows) and the publisher get their connections from `connect()`, so every
+connection runs with the same settings:
+
+    • journal_mode = WAL      → readers no longer block the writer (and
+                                 vice versa) while the runners and the
+                                 publisher overlap
+    • synchronous  = NORMAL   → safe with WAL; fsync only at checkpoints
+    • busy_timeout            → wait for a lock instead of failing fast
+    • mmap_size / cache_size  → large reads come from the page cache
+
+Lock waits are measured: when a statement (or commit) has to wait longer
+than LOCK_WAIT_WARN_SECONDS for another connection to let go of the
+database, the wait is printed together with the statement, so contention
+between overlapping runs shows up in the logs instead of as a slow step.
+
+Thresholds can be overridden per run with the environment variables
+RUNREPORT_SQLITE_BUSY_TIMEOUT and RUNREPORT_SQLITE_LOCK_WARN (seconds).
+
+Use `with connection(path) as conn:` for a block of work: it commits on
+success, rolls back on error and always closes. `with connect(path) as
+conn:` only commits — the connection stays open until garbage
+collection, and with WAL its pages are not checkpointed until then.
+
+RUNREPORT_DB_DIR points every database file under 0_db/ (including the
+absolute paths the step scripts build) at another directory, so a whole
+pipeline can run against a throwaway local.db
+(EscapementReport_FishCounts/bench_scale.py).
+"""
+
+import os
 import sqlite3
-import pandas as pd
+import time
+from collections.abc import Sequence
+from contextlib import contextmanager
 from pathlib import Path
 
+import pandas as pd
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]  # runreport-backend/
+DB_DIR = BACKEND_ROOT / "0_db"
+
+# ------------------------------------------------------------
+# Connection settings
+# ------------------------------------------------------------
+BUSY_TIMEOUT_SECONDS = float(os.environ.get("RUNREPORT_SQLITE_BUSY_TIMEOUT", 120))
+LOCK_WAIT_WARN_SECONDS = float(os.environ.get("RUNREPORT_SQLITE_LOCK_WARN", 1.0))
+
+# SQLite's own busy handler waits at most this long per attempt; longer
+# waits are retried (and timed) by ManagedConnection up to BUSY_TIMEOUT_SECONDS.
+LOCK_POLL_MS = 250
+
+CACHE_SIZE_KIB = 64 * 1024          # PRAGMA cache_size = -KiB  (64 MiB)
+MMAP_SIZE_BYTES = 256 * 1024 * 1024  # 256 MiB
+
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL;",
+    "PRAGMA synchronous = NORMAL;",
+    f"PRAGMA busy_timeout = {LOCK_POLL_MS};",
+    f"PRAGMA cache_size = -{CACHE_SIZE_KIB};",
+    f"PRAGMA mmap_size = {MMAP_SIZE_BYTES};",
+    "PRAGMA temp_store = MEMORY;",
+    "PRAGMA foreign_keys = ON;",
+)
+
+
+def resolve_db_path(path="local.db") -> Path:
+    """Relative paths always land in runreport-backend/0_db/ (or RUNREPORT_DB_DIR)."""
+    path = Path(path)
+    if not path.is_absolute():
+        DB_DIR.mkdir(parents=True, exist_ok=True)
+        path = DB_DIR / path
+    override = os.environ.get("RUNREPORT_DB_DIR")
+    if override and path.parent == DB_DIR:
+        path = Path(override) / path.name
+    return path
+
+
+# ------------------------------------------------------------
+# Lock-wait measurement
+# ------------------------------------------------------------
+def _is_lock_error(exc: sqlite3.OperationalError) -> bool:
+    msg = str(exc).lower()
+    return "database is locked" in msg or "database table is locked" in msg
+
+
+def _short_sql(sql) -> str:
+    text = " ".join(str(sql).split())
+    return text if len(text) <= 120 else text[:117] + "..."
+
+
+def _run_with_lock_wait(conn, sql, call):
+    """
+    Run `call()` and retry it while another connection holds the lock.
+
+    Only retried when the failed attempt changed nothing (total_changes is
+    unchanged), so a half-applied executemany is never replayed. A stale
+    WAL snapshot (SQLITE_BUSY_SNAPSHOT) cannot clear by waiting and is
+    raised straight away.
+    """
+    started = None
+    while True:
+        changes_before = conn.total_changes
+        try:
+            result = call()
+        except sqlite3.OperationalError as e:
+            if (
+                not _is_lock_error(e)
+                or getattr(e, "sqlite_errorname", "") == "SQLITE_BUSY_SNAPSHOT"
+                or conn.total_changes != changes_before
+            ):
+                raise
+            if started is None:
+                started = time.perf_counter()
+            waited = time.perf_counter() - started
+            if waited >= BUSY_TIMEOUT_SECONDS:
+                print(f"❌ Gave up after {waited:.2f}s waiting for a lock → {_short_sql(sql)}")
+                raise
+            continue
+
+        if started is not None:
+            # Each failed attempt already spent LOCK_POLL_MS inside SQLite.
+            waited = time.perf_counter() - started + LOCK_POLL_MS / 1000
+            if waited >= LOCK_WAIT_WARN_SECONDS:
+                print(f"⏳ Lock wait {waited:.2f}s → {_short_sql(sql)}")
+        return result
+
+
+class ManagedCursor(sqlite3.Cursor):
+    """Cursor whose statements go through the lock-wait retry loop."""
+
+    def execute(self, sql, parameters=()):
+        return _run_with_lock_wait(
+            self.connection, sql,
+            lambda: super(ManagedCursor, self).execute(sql, parameters),
+        )
+
+    def executemany(self, sql, seq_of_parameters):
+        # A generator cannot be replayed after a failed attempt.
+        if not isinstance(seq_of_parameters, Sequence):
+            seq_of_parameters = list(seq_of_parameters)
+        return _run_with_lock_wait(
+            self.connection, sql,
+            lambda: super(ManagedCursor, self).executemany(sql, seq_of_parameters),
+        )
+
+    def executescript(self, sql_script):
+        return _run_with_lock_wait(
+            self.connection, sql_script,
+            lambda: super(ManagedCursor, self).executescript(sql_script),
+        )
+
+
+class ManagedConnection(sqlite3.Connection):
+    """
+    sqlite3.Connection that hands out ManagedCursor objects (pandas uses
+    conn.cursor() for read_sql/to_sql) and times waits on commit.
+    """
+
+    def cursor(self, factory=ManagedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+    def commit(self):
+        return _run_with_lock_wait(self, "COMMIT", super().commit)
+
+
+def connect(path="local.db") -> ManagedConnection:
+    """
+    Open the backend SQLite database with the shared settings.
+
+    Drop-in replacement for sqlite3.connect(): the result is a regular
+    sqlite3.Connection (works with pandas, `with conn:` and row_factory).
+    """
+    conn = sqlite3.connect(
+        resolve_db_path(path),
+        timeout=LOCK_POLL_MS / 1000,
+        factory=ManagedConnection,
+    )
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+@contextmanager
+def connection(path="local.db", row_factory=None):
+    """`connect()` for a `with` block: commit on success, rollback on error, always close."""
+    conn = connect(path)
+    if row_factory is not None:
+        conn.row_factory = row_factory
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
 
 class SQLiteManager:
     """
@@ -11,21 +216,11 @@ class SQLiteManager:
     """
 
     def __init__(self, path="local.db"):
-        path = Path(path)
-
-        # If a relative path was given → force it into /0_db/
-        if not path.is_absolute():
-            backend_root = Path(__file__).resolve().parents[1]  # runreport-backend/
-            db_dir = backend_root / "0_db"
-            db_dir.mkdir(parents=True, exist_ok=True)
-            path = db_dir / path  # local.db inside the correct folder
-
-        self.path = path
+        self.path = resolve_db_path(path)
         print(f"📌 SQLite DB path → {self.path}")
 
-        # Connect to the database
-        self.conn = sqlite3.connect(self.path)
-        self.conn.execute("PRAGMA foreign_keys = ON;")
+        # Connect to the database (WAL, busy_timeout, lock-wait logging)
+        self.conn = connect(self.path)
 
     # ------------------------------------------------------------
     def write_df(self, table_name: str, df: pd.DataFrame):
@@ -45,4 +240,4 @@ class SQLiteManager:
     def close(self):
         if self.conn:
             self.conn.close()
-            print("🔌 SQLite connection closed.")
\ No newline at end of file
+            print("🔌 SQLite connection closed.")
@@ -0,0 +1,449 @@
+"""
+telemetry.py
+------------------------------------------------------------
+Per-step run records for the backend runners.
+
+Used by:
+    backend_runner.py                          one step per pipeline + publish
+    EscapementReport_FishCounts/step0_runner.py
+    Columbia_FishCounts/step0_runner.py
+    Flows/step0_runner.py
+
+Tables (local.db)
+
+pipeline_runs           one row per runner invocation
+    run_id          "<pipeline>-<UTC timestamp>-<random suffix>"
+    pipeline        escapement / columbia / flows / backend
+    parent_run_id   backend_runner's run when started from there
+    started_at, finished_at (UTC ISO), wall_s
+    status          running → ok / failed / skipped
+    argv
+
+pipeline_run_steps      one row per step, written as soon as it ends
+    run_id, seq, step (number or NULL), label
+    started_at, wall_s, cpu_s
+    peak_rss_mb     peak resident memory during the step: this process
+                    (VmHWM is reset before each step; falls back to the
+                    process peak where that is not possible) or a child
+                    process started by the step, whichever is larger.
+                    RUSAGE_CHILDREN only keeps the largest peak of all
+                    children so far, so it counts for a step only when
+                    it rose during that step; a runner that waits for
+                    its own subprocess passes the exact peak instead
+                    (run_subprocess)
+    rows_in, rows_out
+    read_bytes, write_bytes
+                    storage I/O of the process during the step
+                    (/proc/self/io) — SQLite traffic in these runners,
+                    plus downloaded files; reads served from the page
+                    cache count as 0
+    http_calls      requests / httpx requests sent during the step
+    status          ok / failed / cached / skipped, note
+
+Report
+    python -m common.telemetry --report [--pipeline escapement] [--top 10]
+    shows the slowest steps of the latest run and the change against
+    the previous run of the same pipeline. The runners accept --report
+    as well.
+
+Regressions
+    finish("ok") compares every step against the rolling baseline of
+    earlier runs and prints / stores what got slower or larger
+    (common/regression.py).
+"""
+
+import argparse
+import json
+import os
+import re
+import resource
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.sqlite_manager import connect
+
+RUNS_TABLE = "pipeline_runs"
+STEPS_TABLE = "pipeline_run_steps"
+PARENT_ENV = "RUNREPORT_PARENT_RUN_ID"
+
+STEP_FIELDS = [
+    "run_id", "seq", "step", "label", "started_at", "wall_s", "cpu_s", "peak_rss_mb",
+    "rows_in", "rows_out", "read_bytes", "write_bytes", "http_calls", "status", "note",
+]
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+# ------------------------------------------------------------
+# Process counters
+# ------------------------------------------------------------
+def _cpu_seconds() -> float:
+    """CPU time of this process plus its finished children."""
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return time.process_time() + children.ru_utime + children.ru_stime
+
+
+def _reset_peak_rss() -> bool:
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _children_peak_kb() -> int:
+    """Largest peak RSS of any child reaped so far (never resets)."""
+    kb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return kb // 1024 if sys.platform == "darwin" else kb
+
+
+def _peak_rss_mb(child_kb: int = 0) -> float:
+    """
+    Peak RSS since the last reset (Linux), else the process peak, or
+    child_kb when a child of this step used more.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            match = re.search(r"VmHWM:\s+(\d+)\s+kB", f.read())
+        own_kb = int(match.group(1))
+    except (OSError, AttributeError):
+        own_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == "darwin":
+            own_kb //= 1024
+    return round(max(own_kb, child_kb) / 1024, 1)
+
+
+def _io_bytes() -> tuple[int | None, int | None]:
+    try:
+        with open("/proc/self/io") as f:
+            fields = dict(line.split(": ") for line in f.read().splitlines())
+        return int(fields["read_bytes"]), int(fields["write_bytes"])
+    except (OSError, KeyError, ValueError):
+        return None, None
+
+
+# ------------------------------------------------------------
+# HTTP call counter
+# ------------------------------------------------------------
+_http_lock = threading.Lock()
+_http_calls = 0
+_http_hooked = False
+
+
+def _count_http():
+    global _http_calls
+    with _http_lock:
+        _http_calls += 1
+
+
+def install_http_counter():
+    """Count every request sent through requests / httpx (idempotent)."""
+    global _http_hooked
+    if _http_hooked:
+        return
+    _http_hooked = True
+    try:
+        import requests
+
+        send = requests.Session.send
+
+        def counted_send(self, request, **kwargs):
+            _count_http()
+            return send(self, request, **kwargs)
+
+        requests.Session.send = counted_send
+    except ImportError:
+        pass
+    try:
+        import httpx
+
+        client_send = httpx.Client.send
+
+        def counted_client_send(self, request, **kwargs):
+            _count_http()
+            return client_send(self, request, **kwargs)
+
+        httpx.Client.send = counted_client_send
+    except ImportError:
+        pass
+
+
+# ------------------------------------------------------------
+# Tables
+# ------------------------------------------------------------
+def create_tables(conn):
+    with conn:
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {RUNS_TABLE} (
+                run_id TEXT PRIMARY KEY,
+                pipeline TEXT NOT NULL,
+                parent_run_id TEXT,
+                started_at TEXT NOT NULL,
+                finished_at TEXT,
+                wall_s REAL,
+                status TEXT NOT NULL,
+                argv TEXT
+            );
+        """)
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {STEPS_TABLE} (
+                run_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                step INTEGER,
+                label TEXT NOT NULL,
+                started_at TEXT NOT NULL,
+                wall_s REAL,
+                cpu_s REAL,
+                peak_rss_mb REAL,
+                rows_in INTEGER,
+                rows_out INTEGER,
+                read_bytes INTEGER,
+                write_bytes INTEGER,
+                http_calls INTEGER,
+                status TEXT NOT NULL,
+                note TEXT,
+                PRIMARY KEY (run_id, seq)
+            );
+        """)
+
+
+class StepRecord:
+    """Mutable fields a runner can fill in while the step runs."""
+
+    def __init__(self, step: int | None, label: str):
+        self.step = step
+        self.label = label
+        self.rows_in: int | None = None
+        self.rows_out: int | None = None
+        self.status = "ok"
+        self.note: str | None = None
+        self.child_rss_kb = 0  # exact peak of a subprocess the step waited for
+
+
+def run_subprocess(record: StepRecord, args: list[str], **kwargs) -> int:
+    """
+    subprocess.run(args, check=True) that reaps the child with os.wait4
+    and stores its own peak RSS on the step record.
+    """
+    proc = subprocess.Popen(args, **kwargs)
+    try:
+        _, status, usage = os.wait4(proc.pid, 0)
+    except BaseException:
+        proc.kill()
+        proc.wait()
+        raise
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    kb = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+    record.child_rss_kb = max(record.child_rss_kb, kb)
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, args)
+    return proc.returncode
+
+
+class RunRecorder:
+    """
+    Records one runner invocation. Use `with recorder.step(num, label) as rec:`
+    around every step and call finish() at the end; a step that raises is
+    stored as failed before the exception propagates.
+    """
+
+    def __init__(self, pipeline: str, db_path="local.db", argv: list[str] | None = None):
+        self.pipeline = pipeline
+        self.db_path = db_path
+        self.run_id = f"{pipeline}-{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:6]}"
+        self.started = time.perf_counter()
+        self.seq = 0
+        self.finished = False
+        install_http_counter()
+
+        conn = connect(self.db_path)
+        try:
+            create_tables(conn)
+            with conn:
+                conn.execute(
+                    f"INSERT INTO {RUNS_TABLE} (run_id, pipeline, parent_run_id, started_at, status, argv) "
+                    "VALUES (?, ?, ?, ?, 'running', ?)",
+                    (self.run_id, pipeline, os.environ.get(PARENT_ENV),
+                     _utc_now(), json.dumps(argv if argv is not None else sys.argv)),
+                )
+        finally:
+            conn.close()
+
+    def child_env(self) -> dict[str, str]:
+        """Environment for subprocess runners, linking their runs to this one."""
+        return {**os.environ, PARENT_ENV: self.run_id}
+
+    @contextmanager
+    def step(self, step: int | None, label: str):
+        record = StepRecord(step, label)
+        started_at = _utc_now()
+        _reset_peak_rss()
+        child0 = _children_peak_kb()
+        read0, write0 = _io_bytes()
+        http0 = _http_calls
+        cpu0 = _cpu_seconds()
+        t0 = time.perf_counter()
+        try:
+            yield record
+        except BaseException:
+            record.status = "failed"
+            raise
+        finally:
+            read1, write1 = _io_bytes()
+            child1 = _children_peak_kb()
+            child_kb = max(child1 if child1 > child0 else 0, record.child_rss_kb)
+            row = {
+                "run_id": self.run_id,
+                "seq": self.seq,
+                "step": record.step,
+                "label": record.label,
+                "started_at": started_at,
+                "wall_s": round(time.perf_counter() - t0, 3),
+                "cpu_s": round(_cpu_seconds() - cpu0, 3),
+                "peak_rss_mb": _peak_rss_mb(child_kb),
+                "rows_in": record.rows_in,
+                "rows_out": record.rows_out,
+                "read_bytes": read1 - read0 if read0 is not None else None,
+                "write_bytes": write1 - write0 if write0 is not None else None,
+                "http_calls": _http_calls - http0,
+                "status": record.status,
+                "note": record.note,
+            }
+            self.seq += 1
+            self._write_step(row)
+
+    def _write_step(self, row: dict):
+        conn = connect(self.db_path)
+        try:
+            with conn:
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {STEPS_TABLE} ({', '.join(STEP_FIELDS)}) "
+                    f"VALUES ({', '.join('?' * len(STEP_FIELDS))})",
+                    [row[f] for f in STEP_FIELDS],
+                )
+        finally:
+            conn.close()
+
+    def finish(self, status: str = "ok") -> list[dict]:
+        """Close the run; an ok run is checked for regressions (common/regression.py)."""
+        if self.finished:
+            return []
+        self.finished = True
+        conn = connect(self.db_path)
+        try:
+            with conn:
+                conn.execute(
+                    f"UPDATE {RUNS_TABLE} SET finished_at = ?, wall_s = ?, status = ? WHERE run_id = ?",
+                    (_utc_now(), round(time.perf_counter() - self.started, 3), status, self.run_id),
+                )
+        finally:
+            conn.close()
+        print(f"📈 Run record {self.run_id} ({status}) → {RUNS_TABLE} / {STEPS_TABLE}")
+        if status == "ok":
+            from common import regression  # imports this module
+            return regression.check(self.run_id, self.db_path)
+        return []
+
+
+# ------------------------------------------------------------
+# Report
+# ------------------------------------------------------------
+def _fmt_seconds(s) -> str:
+    if s is None:
+        return "—"
+    if s >= 3600:
+        return f"{int(s // 3600)}h {int(s % 3600 // 60):02d}m {s % 60:04.1f}s"
+    if s >= 60:
+        return f"{int(s // 60)}m {s % 60:04.1f}s"
+    return f"{s:.2f}s"
+
+
+def _fmt_delta(now, before) -> str:
+    if now is None or before is None:
+        return "new"
+    delta = now - before
+    pct = f" ({delta / before:+.0%})" if before else ""
+    return f"{'+' if delta >= 0 else '-'}{_fmt_seconds(abs(delta))}{pct}"
+
+
+def _fmt_int(n) -> str:
+    return "—" if n is None else f"{int(n):,}"
+
+
+def report(pipeline: str | None = None, top: int = 10, db_path="local.db") -> int:
+    """Print the slowest steps of the latest run and the change vs the previous run."""
+    conn = connect(db_path)
+    try:
+        create_tables(conn)
+        where = "WHERE pipeline = ? AND status != 'running'" if pipeline else "WHERE status != 'running'"
+        params = (pipeline,) if pipeline else ()
+        runs = conn.execute(
+            f"SELECT run_id, pipeline, started_at, wall_s, status FROM {RUNS_TABLE} "
+            f"{where} ORDER BY started_at DESC, run_id DESC LIMIT 1",
+            params,
+        ).fetchall()
+        if not runs:
+            print(f"ℹ️ No finished runs recorded{f' for {pipeline}' if pipeline else ''}.")
+            return 1
+        run_id, pipeline, started_at, wall_s, status = runs[0]
+        previous = conn.execute(
+            f"SELECT run_id, wall_s FROM {RUNS_TABLE} WHERE pipeline = ? AND status != 'running' "
+            "AND (started_at < ? OR (started_at = ? AND run_id < ?)) ORDER BY started_at DESC, run_id DESC LIMIT 1",
+            (pipeline, started_at, started_at, run_id),
+        ).fetchone()
+
+        def steps_of(rid):
+            cur = conn.execute(f"SELECT {', '.join(STEP_FIELDS)} FROM {STEPS_TABLE} WHERE run_id = ? ORDER BY seq", (rid,))
+            return [dict(zip(STEP_FIELDS, r)) for r in cur.fetchall()]
+
+        steps = steps_of(run_id)
+        before = {s["label"]: s for s in steps_of(previous[0])} if previous else {}
+    finally:
+        conn.close()
+
+    print(f"📈 {pipeline} run {run_id} ({status}) started {started_at} — total {_fmt_seconds(wall_s)}"
+          + (f", {_fmt_delta(wall_s, previous[1])} vs {previous[0]}" if previous else ", no previous run"))
+    print()
+    print(f"{'step':<50} {'status':<7} {'wall':>10} {'Δ prev':>16} {'cpu':>9} {'rss MB':>8} "
+          f"{'rows in→out':>19} {'write MB':>9} {'http':>5}")
+    slowest = sorted(steps, key=lambda s: s["wall_s"] or 0, reverse=True)[:top]
+    for s in slowest:
+        prev = before.get(s["label"])
+        rows = f"{_fmt_int(s['rows_in'])}→{_fmt_int(s['rows_out'])}"
+        write_mb = "—" if s["write_bytes"] is None else f"{s['write_bytes'] / 1024 / 1024:.1f}"
+        print(f"{s['label'][:50]:<50} {s['status']:<7} {_fmt_seconds(s['wall_s']):>10} "
+              f"{_fmt_delta(s['wall_s'], prev['wall_s'] if prev else None):>16} "
+              f"{_fmt_seconds(s['cpu_s']):>9} {s['peak_rss_mb'] if s['peak_rss_mb'] is not None else '—':>8} "
+              f"{rows:>19} {write_mb:>9} {s['http_calls'] or 0:>5}")
+
+    if previous:
+        gone = sorted(set(before) - {s["label"] for s in steps})
+        if gone:
+            print(f"\nℹ️ Not run this time: {', '.join(gone)}")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Show recorded pipeline run telemetry.")
+    parser.add_argument("--report", action="store_true", help="Slowest steps of the latest run vs the previous run.")
+    parser.add_argument("--pipeline", help="escapement, columbia, flows or backend (default: latest of any).")
+    parser.add_argument("--top", type=int, default=10, help="Number of steps to show (default 10).")
+    args = parser.parse_args()
+    return report(args.pipeline, args.top)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
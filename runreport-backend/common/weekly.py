@@ -0,0 +1,99 @@
+"""
+weekly.py
+------------------------------------------------------------
+MM-DD calendar and weekly roll-up of daily values.
+
+Used by:
+    EscapementReport_FishCounts/daily_counts.py   calendar / day_index
+    EscapementReport_FishCounts/step77_weekly.py  weekly basinfamily totals
+
+Calendar
+    Every MM-DD of a leap year (02-29 and 12-31 included), so any
+    year's dates fit. A day's position in CALENDAR is its day index
+    (01-01 = 0 … 12-31 = 365).
+
+Weeks
+    week = day index // 7: week 0 is 01-01 … 01-07 and the last week
+    (52) only holds 12-30 and 12-31. Each week is labelled with its
+    last MM-DD, and the last week's totals are multiplied by
+    YEAR_END_FACTOR (7 / 2 days = 3.5) to be comparable with a full
+    week.
+
+weekly_totals() takes long or wide daily data — any key columns plus
+one or more value columns, e.g. (metric_type, basinfamily, value) for
+the escapement reports or (dam_name, Species_Plot,
+Daily_Count_Current_Year, …) for the Columbia daily counts. It
+scatters the rows into a zero-filled (key, value, day) array padded to
+whole weeks, reshapes the day axis to (week, 7) and sums the last
+axis, so every key and week is aggregated at once. Days missing from
+the input count as 0.
+"""
+
+import numpy as np
+import pandas as pd
+
+_LEAP_YEAR = pd.date_range("2024-01-01", "2024-12-31", freq="D")
+
+CALENDAR = _LEAP_YEAR.strftime("%m-%d").to_numpy()
+
+DAYS_PER_WEEK = 7
+N_WEEKS = -(-len(CALENDAR) // DAYS_PER_WEEK)
+WEEK_LABELS = CALENDAR[np.minimum(np.arange(N_WEEKS) * DAYS_PER_WEEK + DAYS_PER_WEEK - 1, len(CALENDAR) - 1)]
+YEAR_END_FACTOR = DAYS_PER_WEEK / (len(CALENDAR) - (N_WEEKS - 1) * DAYS_PER_WEEK)
+
+# (month, day) → day index
+_DAY_INDEX = np.full((13, 32), -1, dtype=np.int64)
+_DAY_INDEX[_LEAP_YEAR.month, _LEAP_YEAR.day] = np.arange(len(CALENDAR))
+
+# MM-DD text → day index
+_MMDD_INDEX = pd.Series(np.arange(len(CALENDAR)), index=CALENDAR)
+
+
+def day_index(dates: pd.Series | pd.DatetimeIndex) -> np.ndarray:
+    """Day index of each date's MM-DD (dates must not be NaT)."""
+    dates = pd.DatetimeIndex(dates)
+    return _DAY_INDEX[dates.month, dates.day]
+
+
+def weekly_totals(
+    df: pd.DataFrame,
+    key_cols: list[str],
+    value_cols: list[str],
+    date_col: str = "MM-DD",
+    keys: pd.DataFrame | None = None,
+) -> pd.DataFrame:
+    """
+    Weekly sums of value_cols per key (see module doc).
+
+    Returns key_cols, date_col (the week's last MM-DD), value_cols —
+    one row for every key × week, in key order then week order.
+    `keys` (a frame of key_cols) chooses the keys and their order,
+    including keys with no daily rows; by default every key in df,
+    sorted. Rows whose date_col is not an MM-DD, or whose key is not
+    in `keys`, are ignored.
+    """
+    if keys is None:
+        keys = df[key_cols].drop_duplicates().sort_values(key_cols)
+    keys = keys[key_cols].reset_index(drop=True)
+
+    day = df[date_col].astype(str).str.strip().map(_MMDD_INDEX)
+    key_pos = pd.MultiIndex.from_frame(keys).get_indexer(pd.MultiIndex.from_frame(df[key_cols]))
+    valid = (day.notna() & (key_pos >= 0)).to_numpy()
+
+    values = df.loc[valid, value_cols].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64)
+
+    # Dense (key, value column, day) cube padded to whole weeks, then
+    # reshaped so each week is one row of 7 days: week = day // 7
+    cube = np.zeros((len(keys), len(value_cols), N_WEEKS * DAYS_PER_WEEK))
+    np.add.at(
+        cube,
+        (key_pos[valid][:, None], np.arange(len(value_cols)), day[valid].astype(np.int64).to_numpy()[:, None]),
+        np.nan_to_num(values),
+    )
+    weekly = cube.reshape(len(keys), len(value_cols), N_WEEKS, DAYS_PER_WEEK).sum(axis=-1)
+    weekly[:, :, -1] *= YEAR_END_FACTOR
+
+    out = keys.loc[keys.index.repeat(N_WEEKS)].reset_index(drop=True)
+    out[date_col] = np.tile(WEEK_LABELS, len(keys))
+    out[value_cols] = weekly.transpose(0, 2, 1).reshape(-1, len(value_cols))
+    return out
@@ -14,6 +14,8 @@ import pandas as pd
 
 from datetime import datetime, timezone
 
+from common.sqlite_manager import connection
+
 from .audit import get_publish_audit, upsert_publish_audit
 from .schemas import DATASET_TABLES, METADATA_TABLES, REGISTRY_TABLES, TABLE_SCHEMAS
 from .supabase_client import SupabaseConfigError, get_supabase_client
@@ -250,7 +252,7 @@ def publish_all(
         return
 
     try:
-        with sqlite3.connect(db_path) as conn:
+        with connection(db_path) as conn:
             if flags.get("columbia"):
                 _publish_dataset(conn, client, "columbia", dry_run=dry_run)
             if flags.get("flows"):
@@ -0,0 +1,9 @@
+-- Byte-identical escapement PDFs (same SHA-256 in hash) are parsed once.
+-- Later copies are marked processed and point at the report whose lines
+-- are in EscapementRawLines.
+alter table public."EscapementReports"
+  add column if not exists duplicate_of bigint
+  references public."EscapementReports"(id) on delete set null;
+
+create index if not exists escapementreports_hash_idx
+  on public."EscapementReports"(hash);